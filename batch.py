@@ -0,0 +1,160 @@
+"""
+batch.py
+--------
+Vectorized batch evaluation of FIFO and Round Robin schedules for Mini OS Simulation.
+Computes per-process completion and waiting times for a whole batch of CPU bursts with NumPy array operations
+instead of stepping the scheduler one dispatch at a time. Requires NumPy (pip install numpy).
+
+Results match the single-core simulation exactly for integer-valued times (floats agree up to rounding).
+
+Run from the project root: python3 batch.py --jobs 1000000 --quantum 2
+"""
+import argparse
+import random
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+def require_numpy():
+    """Raise a helpful error when NumPy is not installed."""
+    if np is None:
+        raise RuntimeError("Batch evaluation requires NumPy: pip install numpy")
+
+def fifo_batch(arrivals, bursts):
+    """Completion and waiting times of non-preemptive FIFO on one core.
+
+    Jobs run in the given order, which must be sorted by arrival time. Each job starts at
+    max(previous completion, its arrival), so completion_i = S_i + max_{j<=i}(arrival_j - S_{j-1})
+    with S the running sum of the bursts.
+    """
+    require_numpy()
+    arrivals = np.asarray(arrivals)
+    bursts = np.asarray(bursts)
+    if np.any(arrivals[1:] < arrivals[:-1]):
+        raise ValueError("FIFO batch arrivals must be sorted")
+    work = np.cumsum(bursts)
+    completion = work + np.maximum.accumulate(arrivals - (work - bursts))
+    return completion, completion - arrivals - bursts
+
+def count_greater_before(ranks):
+    """For each i, count j < i with ranks[j] > ranks[i] (dense ranks; bottom-up merge counting, O(n log^2 n))."""
+    n = len(ranks)
+    counts = np.zeros(n, dtype=np.int64)
+    if n < 2:
+        return counts
+    span = int(ranks.max()) + 1
+    if span <= 2 * n.bit_length():
+        # Few distinct ranks: one running count per rank is cheaper than the merge passes
+        for rank in range(span - 1):
+            higher = ranks > rank
+            mine = ranks == rank
+            counts[mine] = (np.cumsum(higher) - higher)[mine]
+        return counts
+    index = np.arange(n, dtype=np.int64)
+    merged = ranks.astype(np.int64)  # Ranks sorted within each chunk of `size` positions
+    size = 1
+    while size < n:
+        keys = (index // size) * span + merged  # Globally sorted: chunk first, then rank
+        chunk = index // size
+        right = (chunk & 1) == 1  # Elements whose left neighbour chunk lies entirely before them
+        left = chunk[right] - 1
+        below = np.searchsorted(keys, left * span + ranks[right], side='right')
+        counts[right] += (left + 1) * size - below
+        pair = index // (2 * size)
+        merged = np.sort(pair * span + merged, kind='stable') - pair * span
+        size *= 2
+    return counts
+
+def rr_batch(arrivals, bursts, quantum):
+    """Completion and waiting times of fixed-quantum Round Robin on one core for a batch arriving together.
+
+    Job i needs k_i = ceil(burst_i / quantum) turns and finishes in round k_i. Before that round every job j has
+    run min(burst_j, (k_i - 1) * quantum); in round k_i the jobs ahead of i still running each take one more
+    quantum, or their remainder if they also finish in that round.
+    """
+    require_numpy()
+    arrivals = np.asarray(arrivals)
+    bursts = np.asarray(bursts)
+    if len(bursts) == 0:
+        return bursts.copy(), bursts.copy()
+    start = arrivals[0]
+    if np.any(arrivals != start):
+        raise ValueError("Round Robin batch mode needs a common arrival time; simulate staggered arrivals instead")
+    turns = -(-bursts // quantum)
+    done_before = (turns - 1) * quantum  # CPU time each job has had when its last round begins
+    ordered = np.sort(bursts)
+    prefix = np.concatenate(([0], np.cumsum(ordered)))
+    short = np.searchsorted(ordered, done_before, side='right')  # Jobs finished before that round
+    earlier_rounds = prefix[short] + done_before * (len(bursts) - short)
+    _, ranks = np.unique(turns, return_inverse=True)
+    longer_ahead = count_greater_before(ranks.ravel())
+    # Jobs ahead of i that finish in the same round: exclusive running sum of their bursts within each round
+    order = np.argsort(ranks.ravel(), kind='stable')
+    sorted_turns = turns[order]
+    first = np.concatenate(([True], sorted_turns[1:] != sorted_turns[:-1]))
+    group_start = np.maximum.accumulate(np.where(first, np.arange(len(order)), 0))
+    running = np.cumsum(bursts[order])
+    before_group = np.where(group_start > 0, running[group_start - 1], 0)
+    same_sum = np.empty_like(running)
+    same_count = np.empty(len(order), dtype=np.int64)
+    same_sum[order] = running - bursts[order] - before_group
+    same_count[order] = np.arange(len(order)) - group_start
+    completion = (start + earlier_rounds + quantum * longer_ahead + same_sum - same_count * done_before
+                  + bursts - done_before)
+    return completion, completion - arrivals - bursts
+
+def simulate_batch(arrivals, bursts, scheduler='FIFO', quantum=2):
+    """Step-by-step reference: run the batch through the single-core simulation and return (completion, waiting).
+
+    ProcessManager.fifo_schedule and rr_schedule only pick and print the next process; they keep no clock, so
+    completion and waiting times come from the simulation engine instead.
+    """
+    from process import PCB, ProcessManager
+    pm = ProcessManager()
+    pm.scheduler_type = scheduler
+    pm.time_quantum = quantum
+    workload = (PCB(pid, f"job{pid}", 'medium', a, b) for pid, (a, b) in enumerate(zip(arrivals, bursts), 1))
+    stats = sorted(pm.simulate(workload).process_stats(), key=lambda row: row['pid'])
+    return [row['completion'] for row in stats], [row['waiting'] for row in stats]
+
+def check_against_simulation(arrivals, bursts, scheduler='FIFO', quantum=2):
+    """Return True if the batch result equals the step-by-step simulation exactly."""
+    if scheduler == 'FIFO':
+        completion, waiting = fifo_batch(arrivals, bursts)
+    else:
+        completion, waiting = rr_batch(arrivals, bursts, quantum)
+    sim_completion, sim_waiting = simulate_batch(arrivals, bursts, scheduler, quantum)
+    return completion.tolist() == sim_completion and waiting.tolist() == sim_waiting
+
+def main():
+    parser = argparse.ArgumentParser(description="Vectorized FIFO/RR batch evaluation.")
+    parser.add_argument('--jobs', type=int, default=1000000)
+    parser.add_argument('--quantum', type=int, default=2)
+    parser.add_argument('--check-jobs', type=int, default=20000, help="batch size checked against the simulation")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    require_numpy()
+    rng = np.random.default_rng(args.seed)
+    bursts = rng.integers(1, 20, args.jobs)
+    arrivals = np.cumsum(rng.integers(0, 20, args.jobs))
+    start = time.perf_counter()
+    fifo_batch(arrivals, bursts)
+    print(f"FIFO batch, {args.jobs} jobs: {(time.perf_counter() - start) * 1000:.1f} ms")
+    start = time.perf_counter()
+    rr_batch(np.zeros(args.jobs, dtype=np.int64), bursts, args.quantum)
+    print(f"RR batch, {args.jobs} jobs: {(time.perf_counter() - start) * 1000:.1f} ms")
+    py = random.Random(args.seed)
+    n = args.check_jobs
+    check_bursts = [py.randint(1, 20) for _ in range(n)]
+    check_arrivals = [0] * n
+    for i in range(1, n):
+        check_arrivals[i] = check_arrivals[i - 1] + py.randint(0, 20)
+    for scheduler, arrivals in (('FIFO', check_arrivals), ('RR', [0] * n)):
+        same = check_against_simulation(arrivals, check_bursts, scheduler, args.quantum)
+        print(f"{scheduler} batch equals simulation on {n} jobs: {same}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+bench_kalloc.py
+---------------
+Allocation throughput of the kernel-zone allocators under churn.
+After a warm-up that fills about half the zone, every step frees a random live block and allocates a new one.
+The buddy allocator is compared with first-fit contiguous allocation from FrameAllocator.alloc_run on the same
+trace, and each slab cache size is churned the same way. Fragmentation is reported at the end of each run.
+
+Run from the project root: python3 -m benchmarks.bench_kalloc [--frames 262144] [--ops 200000]
+"""
+import argparse
+import random
+import time
+
+from buddy import BuddyAllocator
+from frames import FrameAllocator
+from slab import SlabAllocator
+
+PAGE_SIZE = 4096
+OBJECT_SIZES = [32, 128, 512, 2048]
+
+def trace(ops, max_frames, seed):
+    """Return request sizes in frames: mostly small, powers of two and odd sizes up to max_frames."""
+    rng = random.Random(seed)
+    return [max(min(1 << rng.randrange(max_frames.bit_length()), max_frames) - rng.randrange(2), 1)
+            for _ in range(ops)]
+
+def churn(requests, alloc, free, live_target, seed):
+    """Fill up to live_target blocks, then free a random block and allocate the next request, once per request.
+
+    Returns (operations per second of the steady phase, counting allocations and frees, and failed allocations).
+    Blocks stay allocated afterwards, so fragmentation can be read off the allocator.
+    """
+    rng = random.Random(seed)
+    live = []
+    failed = 0
+    for size in requests[:live_target]:
+        block = alloc(size)
+        if block is not None:
+            live.append(block)
+    start = time.perf_counter()
+    for size in requests[live_target:]:
+        if live:
+            i = rng.randrange(len(live))
+            live[i], live[-1] = live[-1], live[i]
+            free(live.pop())
+        block = alloc(size)
+        if block is None:
+            failed += 1
+        else:
+            live.append(block)
+    return 2 * (len(requests) - live_target) / (time.perf_counter() - start), failed
+
+def main():
+    parser = argparse.ArgumentParser(description="Buddy and slab allocator churn benchmark.")
+    parser.add_argument('--frames', type=int, default=262144, help="frames in the kernel zone")
+    parser.add_argument('--ops', type=int, default=200000)
+    parser.add_argument('--max-block', type=int, default=64, help="largest contiguous request, in frames")
+    parser.add_argument('--objects', type=int, default=100000, help="live objects per slab cache")
+    args = parser.parse_args()
+    live = args.frames // 2 // (args.max_block // 4 or 1)  # Live blocks, about half the zone
+    requests = trace(live + args.ops, args.max_block, 1)
+    print(f"{'allocator':<24}{'ops/s':>12}{'failed':>8}{'internal':>10}{'external':>10}")
+
+    buddy = BuddyAllocator(args.frames)
+    rate, failed = churn(requests, buddy.alloc, buddy.free, live, 2)
+    stats = buddy.fragmentation()
+    print(f"{'buddy':<24}{rate:>12.0f}{failed:>8}{stats['internal_fragmentation']:>10.1%}"
+          f"{stats['external_fragmentation']:>10.1%}")
+
+    frames = FrameAllocator(args.frames)
+    sizes = {}
+    def first_fit(size):
+        start = frames.alloc_run(size)
+        if start is not None:
+            sizes[start] = size
+        return start
+    def release(start):
+        for frame in range(start, start + sizes.pop(start)):
+            frames.free(frame)
+    rate, failed = churn(requests, first_fit, release, live, 2)
+    stats = frames.fragmentation()
+    print(f"{'first-fit runs':<24}{rate:>12.0f}{failed:>8}{0:>10.1%}{stats['external_fragmentation']:>10.1%}")
+
+    for object_size in OBJECT_SIZES:
+        slabs = SlabAllocator(BuddyAllocator(args.frames), PAGE_SIZE)
+        cache = slabs.create_cache('bench', object_size)
+        rate, failed = churn([1] * (args.objects + args.ops), lambda _: cache.alloc(), cache.free, args.objects, 3)
+        stats = cache.stats()
+        print(f"{f'slab {object_size} B':<24}{rate:>12.0f}{failed:>8}{stats['internal_fragmentation']:>10.1%}"
+              f"{slabs.buddy.fragmentation()['external_fragmentation']:>10.1%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+bench_paging.py
+---------------
+Scaling benchmark for the paging subsystem on reproducible memory traces.
+For each memory size (1k frames up to --max-frames, ten times larger each step) it times create_page_table,
+find_free_frame on fragmented memory, swap_out and swap_in of a whole process, and address translation on five
+access traces: sequential, strided, uniform random, a Zipfian hot set and phase changes. Each trace runs once on
+a process that fits in memory, and once with demand paging on an address space twice the size of memory, so
+pages fault in and evict. Traces come from a seeded generator and are identical on every run. Each page visit in a
+trace is a burst of WORDS_PER_VISIT word accesses (8 bytes apart) inside the page, so the TLB hit rates reflect
+reuse within pages as well as TLB reach. Translation goes through MemoryManager.resolve, which is translate()
+without its printed message. swap_out and swap_in run on a process of up to --swap-megabytes whose every page was
+written first, so they move real data through the swap file; the bytes moved are reported. --huge-pages backs
+processes with huge pages where they fit, to measure their effect on large footprints.
+
+Every size runs in a fresh process, so the peak RSS reported is that size's own. Results are printed as a table
+and, with --json, written as JSON with sorted keys, so runs from two releases can be diffed directly. Needs NumPy
+(pip install numpy).
+
+Run from the project root: python3 -m benchmarks.bench_paging [--max-frames 1000000] [--json out.json]
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from memory import MemoryManager
+from pagetable import np, require_numpy
+
+TRACES = ['sequential', 'strided', 'uniform', 'zipf', 'phases']
+STRIDE = 17  # Pages between strided visits; prime, so the trace visits every page of the address space
+WORDS_PER_VISIT = 8  # Consecutive 8-byte words accessed on each page visit
+ZIPF_SKEW = 1.2
+PHASES = 4  # Working-set changes in the phases trace, each over a fresh eighth of the address space
+
+def page_trace(name, pages, accesses, seed):
+    """Return a reproducible trace of page numbers below pages as a NumPy int64 array."""
+    rng = np.random.default_rng(seed)
+    steps = np.arange(accesses, dtype=np.int64)
+    if name == 'sequential':
+        return steps % pages
+    if name == 'strided':
+        return steps * STRIDE % pages
+    if name == 'uniform':
+        return rng.integers(0, pages, accesses)
+    if name == 'zipf':  # Page rank r is drawn with probability ~ 1/r**ZIPF_SKEW; hot pages are scattered
+        return rng.permutation(pages)[(rng.zipf(ZIPF_SKEW, accesses) - 1) % pages]
+    if name == 'phases':
+        window = max(pages // 8, 1)
+        phase = steps * PHASES // max(accesses, 1)
+        return (phase * window + rng.integers(0, window, accesses)) % pages
+    raise ValueError(f"Unknown trace {name!r}")
+
+def trace(name, pages, accesses, page_size, seed):
+    """Return a reproducible trace of accesses virtual addresses: word bursts inside the pages of a page trace."""
+    words = min(WORDS_PER_VISIT, page_size // 8) or 1
+    visits = page_trace(name, pages, -(-accesses // words), seed)
+    rng = np.random.default_rng(seed + 1)
+    start = rng.integers(0, page_size // 8 - words + 1, len(visits)) * 8  # First word of each burst
+    offsets = start[:, None] + np.arange(words, dtype=np.int64) * 8
+    return ((visits * page_size)[:, None] + offsets).reshape(-1)[:accesses]
+
+def rate(ops, seconds):
+    return {'ops': ops, 'seconds': round(seconds, 6), 'ops_per_sec': round(ops / seconds) if seconds else None}
+
+def quiet():
+    """Silence the memory manager's messages."""
+    return contextlib.redirect_stdout(io.StringIO())
+
+def new_memory(frames, page_size, huge_pages):
+    mm = MemoryManager(num_frames=frames, page_size=page_size)
+    mm.address_bits = 48
+    mm.use_huge_pages = huge_pages
+    return mm
+
+def bench_translate(frames, page_size, name, accesses, seed, demand, huge_pages):
+    """Translate a trace for one process: resident (pages == frames) or demand-paged (pages == 2 * frames)."""
+    mm = new_memory(frames, page_size, huge_pages)
+    mm.demand_paging = demand
+    pages = 2 * frames if demand else frames
+    with quiet():
+        mm.create_page_table(1, pages)
+    addresses = trace(name, pages, accesses, page_size, seed).tolist()
+    resolve = mm.resolve
+    start = time.perf_counter()
+    for address in addresses:
+        resolve(1, address)
+    result = rate(accesses, time.perf_counter() - start)
+    result['tlb_hit_rate'] = round(mm.tlb.hit_rate(), 6)
+    result['page_faults'] = mm.page_faults.get(1, 0)
+    return result
+
+def bench_swap(frames, page_size, huge_pages):
+    """Time swapping a process whose pages all hold data out and back in; return the two rates with bytes moved."""
+    mm = new_memory(frames, page_size, huge_pages)
+    results = {}
+    with quiet():
+        mm.create_page_table(1, frames)
+        page = bytes(range(256)) * (page_size // 256) + bytes(range(page_size % 256))
+        for number in range(frames):  # Pages that were never written would not reach the swap file
+            mm.write_memory(1, number * page_size, page)
+        for direction, swap in (('out', mm.swap_out), ('in', mm.swap_in)):
+            start = time.perf_counter()
+            swap(1)
+            results[f'swap_{direction}'] = rate(frames, time.perf_counter() - start)
+            results[f'swap_{direction}']['bytes'] = mm.swap.stats()[f'bytes_{direction}']
+    mm.swap.close()
+    return results
+
+def bench_size(frames, page_size, accesses, seed, huge_pages, swap_bytes):
+    """Run every measurement at one memory size; return the results, with the peak RSS of this process."""
+    require_numpy()
+    results = {'frames': frames}
+    mm = new_memory(frames, page_size, huge_pages)
+    with quiet():
+        start = time.perf_counter()
+        mm.create_page_table(1, frames)
+        results['create_page_table'] = rate(frames, time.perf_counter() - start)
+    table = mm.page_tables[1]
+    for page in range(0, frames, 2):  # Free every other frame, so free memory is one-frame fragments
+        mm.free_frame(table.unmap(page))
+    calls = frames // 2
+    start = time.perf_counter()
+    for page in range(calls):  # Each call finds the next fragment once the previous one is taken
+        mm.find_free_frame()
+        mm.allocate_frame(2, page)
+    results['find_free_frame'] = rate(calls, time.perf_counter() - start)
+    del mm, table
+    results.update(bench_swap(max(min(frames, swap_bytes // page_size), 1), page_size, huge_pages))
+    for mode, demand in (('resident', False), ('demand', True)):
+        results[mode] = {name: bench_translate(frames, page_size, name, accesses, seed + i, demand, huge_pages)
+                         for i, name in enumerate(TRACES)}
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    results['peak_rss_bytes'] = peak * 1024 if sys.platform.startswith('linux') else peak  # KiB on Linux, else bytes
+    return results
+
+def show(results):
+    """Print one memory size's results in ops/s, with the TLB hit rate of each trace."""
+    print(f"\n{results['frames']} frames, peak RSS {results['peak_rss_bytes'] / 2**20:.0f} MiB: "
+          + ", ".join(f"{op} {results[op]['ops_per_sec']}" for op in
+                      ('create_page_table', 'find_free_frame', 'swap_out', 'swap_in'))
+          + f" ({results['swap_out']['ops']} pages, {results['swap_out']['bytes'] / 2**20:.0f} MiB swapped each way)")
+    print(f"{'translate':<10}" + "".join(f"{name:>18}" for name in TRACES))
+    for mode in ('resident', 'demand'):
+        print(f"{mode:<10}" + "".join(f"{row['ops_per_sec']:>11} ({row['tlb_hit_rate']:4.0%})"
+                                      for row in (results[mode][name] for name in TRACES)))
+
+def main():
+    parser = argparse.ArgumentParser(description="Paging scaling benchmark on reproducible memory traces.")
+    parser.add_argument('--max-frames', type=int, default=1_000_000, help="largest memory size, in frames")
+    parser.add_argument('--accesses', type=int, default=1_000_000, help="translations per trace")
+    parser.add_argument('--page-size', type=int, default=4096)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--swap-megabytes', type=int, default=256, help="largest process swapped out and in")
+    parser.add_argument('--huge-pages', action='store_true', help="give processes huge pages where they fit")
+    parser.add_argument('--json', metavar='PATH', help="write the results as JSON ('-' for standard output)")
+    args = parser.parse_args()
+    require_numpy()
+    sizes = []
+    frames = 1000
+    while frames <= args.max_frames:
+        sizes.append(frames)
+        frames *= 10
+    out = sys.stderr if args.json == '-' else sys.stdout
+    with contextlib.redirect_stdout(out):
+        print("Operations per second (TLB hit rate); demand = demand paging with twice as many pages as frames")
+        runs = []
+        for frames in sizes:
+            with ProcessPoolExecutor(max_workers=1) as pool:  # Fresh process, so the peak RSS is this size's own
+                results = pool.submit(bench_size, frames, args.page_size, args.accesses, args.seed,
+                                      args.huge_pages, args.swap_megabytes * 2**20).result()
+            show(results)
+            runs.append(results)
+    if args.json:
+        report = {'benchmark': 'paging', 'python': platform.python_version(),
+                  'config': {'page_size': args.page_size, 'accesses': args.accesses, 'seed': args.seed,
+                             'huge_pages': args.huge_pages, 'traces': TRACES, 'stride': STRIDE,
+                             'words_per_visit': WORDS_PER_VISIT, 'swap_megabytes': args.swap_megabytes,
+                             'zipf_skew': ZIPF_SKEW, 'phases': PHASES},
+                  'runs': runs}
+        text = json.dumps(report, indent=2, sort_keys=True)
+        if args.json == '-':
+            print(text)
+        else:
+            with open(args.json, 'w') as f:
+                f.write(text + "\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+bench_proctable.py
+------------------
+Memory and speed of the process-table representations.
+Compares PCB objects with a __dict__ (the original layout), __slots__ PCBs and the compact ProcessTable.
+
+Run from the project root: python3 -m benchmarks.bench_proctable [--processes 200000]
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+from process import PCB, ProcessManager
+from proctable import ProcessTable
+from workload import synthetic
+
+class DictPCB:
+    """PCB with a per-instance __dict__, as before __slots__ were added."""
+    def __init__(self, pcb):
+        for name in PCB.__slots__:
+            setattr(self, name, getattr(pcb, name))
+
+def measure(build):
+    """Return (bytes allocated by build(), seconds taken); the time comes from an untraced second build."""
+    gc.collect()
+    tracemalloc.start()
+    table = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del table
+    gc.collect()
+    start = time.perf_counter()
+    build()
+    return size, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Process-table memory benchmark.")
+    parser.add_argument('--processes', type=int, default=200000)
+    parser.add_argument('--jobs', type=int, default=100000, help="processes in the simulation timing run")
+    args = parser.parse_args()
+    n = args.processes
+    pcbs = list(synthetic(1, jobs=n))
+    for pcb in pcbs:
+        pcb.name = "app"  # Shared name, so the figures compare the per-process layout only
+    def dict_pcbs():
+        return {p.pid: DictPCB(p) for p in pcbs}
+    def slot_pcbs():
+        return {p.pid: PCB(p.pid, p.name, p.power_profile, p.arrival_time, p.burst_time, p.io_interval, p.io_duration)
+                for p in pcbs}
+    def compact():
+        table = ProcessTable()
+        for p in pcbs:
+            table[p.pid] = p
+        return table
+    print(f"{'representation':<22}{'bytes/process':>15}{'build s':>10}")
+    for label, build in (('PCB with __dict__', dict_pcbs), ('PCB with __slots__', slot_pcbs), ('ProcessTable', compact)):
+        size, elapsed = measure(build)
+        print(f"{label:<22}{size / n:>15.0f}{elapsed:>10.2f}")
+    print(f"ProcessTable.bytes_per_process(): {ProcessTable().bytes_per_process()}")
+    print(f"\n{'simulation':<22}{'seconds':>15}")
+    for label, flag in (('dict of PCBs', False), ('ProcessTable', True)):
+        pm = ProcessManager(compact=flag)
+        pm.scheduler_type = 'RR'
+        pm.num_cores = 4
+        start = time.perf_counter()
+        pm.simulate(synthetic(2, jobs=args.jobs, rate=3.0))
+        print(f"{label:<22}{time.perf_counter() - start:>15.2f}")
+
+if __name__ == "__main__":
+    main()
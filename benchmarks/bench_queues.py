@@ -0,0 +1,101 @@
+"""
+bench_queues.py
+---------------
+Scaling benchmark for the scheduler ready queues.
+Compares ReadyQueue and the pid -> PCB table against the old list-based operations from 1k to 1M processes.
+
+Run from the project root: python3 -m benchmarks.bench_queues [--max 1000000] [--legacy-max 100000]
+"""
+import argparse
+import random
+import time
+
+from process import PCB
+from runqueue import ReadyQueue
+
+PROFILES = ['low', 'medium', 'high']
+SAMPLE = 2000  # Operations timed per size for the O(n) list operations
+
+def timed(func, ops):
+    """Run func() and return nanoseconds per operation."""
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1e9 / max(ops, 1)
+
+def bench_ready_queue(pcbs, victims, lookups):
+    """Time enqueue, terminate-by-PID, low-power dequeue, dequeue and lookup on ReadyQueue."""
+    low_ops = min(SAMPLE, len(pcbs) // 10)
+    queue = ReadyQueue()
+    table = {}
+    def enqueue():
+        for p in pcbs:
+            table[p.pid] = p
+            queue.append(p)
+    def terminate():
+        for pid in victims:
+            del table[pid]
+            queue.remove(pid)
+    def dequeue_low():
+        for _ in range(low_ops):
+            queue.popleft('low')
+    def dequeue():
+        while queue:
+            queue.popleft()
+    def lookup():
+        for pid in lookups:
+            table.get(pid)
+    return [timed(enqueue, len(pcbs)), timed(terminate, len(victims)), timed(dequeue_low, low_ops),
+            timed(dequeue, len(pcbs) - len(victims) - low_ops), timed(lookup, len(lookups))]
+
+def bench_list(pcbs, victims, lookups):
+    """Time the same operations with the original list-based ready queue and process list."""
+    victims = victims[:SAMPLE]
+    lookups = lookups[:SAMPLE]
+    low_ops = min(SAMPLE, len(pcbs) // 10)
+    by_pid = {p.pid: p for p in pcbs}
+    queue = []
+    processes = []
+    def enqueue():
+        for p in pcbs:
+            processes.append(p)
+            queue.append(p)
+    def terminate():
+        for pid in victims:
+            processes.remove(by_pid[pid])
+            queue.remove(by_pid[pid])
+    def dequeue_low():
+        for _ in range(low_ops):
+            low_power = [p for p in queue if p.power_profile == 'low']
+            if low_power:
+                queue.remove(low_power[0])
+    def dequeue():
+        for _ in range(min(SAMPLE, len(queue))):
+            queue.pop(0)
+    def lookup():
+        for pid in lookups:
+            next((p for p in processes if p.pid == pid), None)
+    return [timed(enqueue, len(pcbs)), timed(terminate, len(victims)), timed(dequeue_low, low_ops),
+            timed(dequeue, min(SAMPLE, len(pcbs) - len(victims) - low_ops)), timed(lookup, len(lookups))]
+
+def main():
+    parser = argparse.ArgumentParser(description="Ready-queue scaling benchmark.")
+    parser.add_argument('--max', type=int, default=1_000_000, help="largest number of processes")
+    parser.add_argument('--legacy-max', type=int, default=100_000, help="largest size for the list-based version")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+    print(f"{'impl':<8}{'n':>10}{'enqueue':>12}{'terminate':>12}{'deq low':>12}{'dequeue':>12}{'lookup':>12}  (ns/op)")
+    n = 1000
+    while n <= args.max:
+        pcbs = [PCB(pid, f"p{pid}", rng.choice(PROFILES)) for pid in range(1, n + 1)]
+        victims = rng.sample(range(1, n + 1), n // 4)
+        lookups = [rng.randint(1, n) for _ in range(n)]
+        rows = [('deque', bench_ready_queue(pcbs, victims, lookups))]
+        if n <= args.legacy_max:
+            rows.append(('list', bench_list(pcbs, victims, lookups)))
+        for impl, row in rows:
+            print(f"{impl:<8}{n:>10}" + "".join(f"{value:>12.0f}" for value in row))
+        n *= 10
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+bench_swap.py
+-------------
+Swap bandwidth and per-page latency across page sizes.
+Fills one process's pages with data, then swaps the process out and back in through the memory-mapped swap file.
+The same amount of memory is moved at every page size, so the figures show the per-page cost against the bytes
+copied.
+
+Run from the project root: python3 -m benchmarks.bench_swap [--megabytes 64] [--sync]
+"""
+import argparse
+import contextlib
+import io
+import time
+
+from memory import MemoryManager
+
+PAGE_SIZES = [512, 1024, 4096, 16384, 65536]
+
+def run(page_size, megabytes, rounds, sync):
+    """Swap a process holding the given memory out and in; return the swap space's statistics and wall time."""
+    pages = megabytes * 1024 * 1024 // page_size
+    mm = MemoryManager(num_frames=pages, page_size=page_size)
+    mm.memory_constraints = 1
+    mm.swap_space().sync = sync
+    with contextlib.redirect_stdout(io.StringIO()):
+        mm.create_page_table(1, pages)
+        page = bytes(range(256)) * (page_size // 256)
+        for number in range(pages):
+            mm.write_memory(1, number * page_size, page)
+        start = time.perf_counter()
+        for _ in range(rounds):
+            mm.swap_out(1)
+            mm.swap_in(1)
+        elapsed = time.perf_counter() - start
+    stats = mm.swap.stats()
+    mm.swap.close()
+    return stats, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Swap bandwidth benchmark.")
+    parser.add_argument('--megabytes', type=int, default=64, help="memory swapped out and in per round")
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--sync', action='store_true', help="flush every page written to the swap file")
+    args = parser.parse_args()
+    print(f"{'page size':>10}{'pages':>10}{'out MB/s':>10}{'in MB/s':>10}{'out us/pg':>11}{'in us/pg':>10}"
+          f"{'total s':>9}")
+    for page_size in PAGE_SIZES:
+        stats, elapsed = run(page_size, args.megabytes, args.rounds, args.sync)
+        print(f"{page_size:>10}{stats['pages_out']:>10}{stats['bandwidth_out'] / 1e6:>10.0f}"
+              f"{stats['bandwidth_in'] / 1e6:>10.0f}{stats['latency_out'] * 1e6:>11.2f}"
+              f"{stats['latency_in'] * 1e6:>10.2f}{elapsed:>9.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+buddy.py
+--------
+Binary buddy allocator for contiguous frame ranges in the Mini OS Simulation.
+Blocks are power-of-two runs of frames aligned to their size. A request is rounded up to the next power of two and
+split off a larger block if needed; a freed block merges with its buddy (the other half of the block it came from)
+as long as the buddy is free. Both take O(log n) steps, one per order.
+"""
+
+class BuddyAllocator:
+    """Buddy allocator over the frames [base, base + num_frames).
+
+    free_lists[k] holds the offsets (from base) of the free blocks of 2**k frames, as dict keys so removing a
+    buddy is O(1). A zone whose size is not a power of two starts out as several maximal aligned blocks.
+    """
+    def __init__(self, num_frames, base=0):
+        if num_frames < 1:
+            raise ValueError("A buddy allocator needs at least one frame")
+        self.base = base
+        self.num_frames = num_frames
+        self.max_order = num_frames.bit_length() - 1
+        self.free_lists = [{} for _ in range(self.max_order + 1)]
+        self.order_of = {}  # Offset of an allocated block -> its order
+        self.requested = {}  # Offset of an allocated block -> frames asked for
+        self.free_frames = num_frames
+        self.requested_frames = 0
+        offset = 0
+        while offset < num_frames:
+            order = (offset & -offset).bit_length() - 1 if offset else self.max_order
+            while offset + (1 << order) > num_frames:
+                order -= 1
+            self.free_lists[order][offset] = None
+            offset += 1 << order
+
+    @staticmethod
+    def order_for(frames):
+        """Return the smallest order whose blocks hold the given number of frames."""
+        return max(frames - 1, 0).bit_length()
+
+    def alloc(self, frames):
+        """Allocate a block of at least the given number of frames; return its first frame, or None."""
+        if frames < 1:
+            raise ValueError("Allocate at least one frame")
+        order = self.order_for(frames)
+        for k in range(order, self.max_order + 1):
+            if self.free_lists[k]:
+                break
+        else:
+            return None
+        offset, _ = self.free_lists[k].popitem()
+        while k > order:
+            k -= 1
+            self.free_lists[k][offset + (1 << k)] = None
+        self.order_of[offset] = order
+        self.requested[offset] = frames
+        self.free_frames -= 1 << order
+        self.requested_frames += frames
+        return self.base + offset
+
+    def claim(self, frame, order, frames=None):
+        """Allocate the specific free block of 2**order frames starting at a frame (to restore saved state)."""
+        offset = frame - self.base
+        for k in range(order, self.max_order + 1):
+            start = offset >> k << k
+            if start in self.free_lists[k]:
+                break
+        else:
+            raise ValueError(f"Block at frame {frame} of order {order} is not free")
+        del self.free_lists[k][start]
+        while k > order:
+            k -= 1
+            half = start + (1 << k)
+            if offset >= half:
+                self.free_lists[k][start] = None
+                start = half
+            else:
+                self.free_lists[k][half] = None
+        frames = 1 << order if frames is None else frames
+        self.order_of[offset] = order
+        self.requested[offset] = frames
+        self.free_frames -= 1 << order
+        self.requested_frames += frames
+
+    def free(self, frame):
+        """Free the block starting at a frame, merging it with free buddies."""
+        offset = frame - self.base
+        order = self.order_of.pop(offset, None)
+        if order is None:
+            raise ValueError(f"No block allocated at frame {frame}")
+        self.free_frames += 1 << order
+        self.requested_frames -= self.requested.pop(offset)
+        while order < self.max_order:
+            buddy = offset ^ (1 << order)
+            if buddy not in self.free_lists[order]:
+                break
+            del self.free_lists[order][buddy]
+            offset &= ~(1 << order)
+            order += 1
+        self.free_lists[order][offset] = None
+
+    def block_frames(self, frame):
+        """Return the size in frames of the block allocated at a frame."""
+        return 1 << self.order_of[frame - self.base]
+
+    def largest_free_block(self):
+        """Return the frames in the largest free block."""
+        for order in range(self.max_order, -1, -1):
+            if self.free_lists[order]:
+                return 1 << order
+        return 0
+
+    def blocks(self):
+        """Yield (first frame, order, frames requested) for every allocated block."""
+        for offset, order in self.order_of.items():
+            yield self.base + offset, order, self.requested[offset]
+
+    def fragmentation(self):
+        """Return free frames, free blocks per order, the largest free block, and internal and external
+        fragmentation (rounding waste inside allocated blocks, and free memory outside the largest free block).
+        """
+        allocated = self.num_frames - self.free_frames
+        largest = self.largest_free_block()
+        return {
+            'free_frames': self.free_frames,
+            'allocated_blocks': len(self.order_of),
+            'free_blocks': {1 << order: len(blocks) for order, blocks in enumerate(self.free_lists) if blocks},
+            'largest_free_block': largest,
+            'internal_fragmentation': 1 - self.requested_frames / allocated if allocated else 0.0,
+            'external_fragmentation': 1 - largest / self.free_frames if self.free_frames else 0.0,
+        }
@@ -0,0 +1,52 @@
+"""
+compaction.py
+-------------
+Incremental memory compaction for the Mini OS Simulation memory manager.
+Two fingers sweep physical memory: one up from the bottom to the next free frame, one down from the top to the
+next frame holding a page. Each move copies the highest page into the lowest free frame, so pages gather at the
+bottom of memory and free frames merge at the top. A pass runs in steps of a bounded number of moves, so it can
+interleave with the simulation, and it stays correct when frames change hands between steps. The kernel zone and
+huge pages never move.
+"""
+
+class Compactor:
+    """One compaction pass over a MemoryManager, with moved frames and fragmentation before and after."""
+    def __init__(self, mm):
+        self.mm = mm
+        self.low = 0  # Frames below are known to be in use
+        self.high = mm.num_frames - 1  # Frames above hold no page that could move further down
+        self.moved = 0
+        self.done = False
+        self.before = mm.allocator.fragmentation()
+
+    def step(self, max_moves=None):
+        """Move up to max_moves pages (None = until the pass is done); return the number moved."""
+        mm = self.mm
+        used, frames = mm.allocator.used, mm.frames
+        moves = 0
+        while not self.done and (max_moves is None or moves < max_moves):
+            target = used.find(0, self.low)
+            if target > 0 and not used[target - 1]:
+                target = used.find(0)  # Frames below were freed since the last step; start from the lowest
+            source = used.rfind(1, target + 1, self.high + 1) if target >= 0 else -1
+            if source < 0:
+                self.done = True
+                break
+            if frames[source] is None:  # Frames outside page tables (the kernel zone) never move
+                self.high = mm.kernel.base - 1 if mm.in_kernel_zone(source) else source - 1
+                continue
+            block = mm.huge_block(source)
+            if block is not None:  # Huge pages stay whole; compaction works around them
+                self.high = block - 1
+                continue
+            mm.move_frame(source, target)
+            self.moved += 1
+            moves += 1
+            self.low = target + 1
+            self.high = source - 1
+        return moves
+
+    def report(self):
+        """Return moved frames and bytes, fragmentation before and after, and whether the pass is finished."""
+        return {'moved_frames': self.moved, 'moved_bytes': self.moved * self.mm.page_size,
+                'before': self.before, 'after': self.mm.allocator.fragmentation(), 'done': self.done}
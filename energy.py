@@ -0,0 +1,59 @@
+"""
+energy.py
+---------
+Energy model for the Mini OS Simulation power-aware scheduler.
+Describes core frequency/voltage states (P-states), the power each process profile draws, idle power and the battery.
+
+Power is in watts and time in simulation time units (seconds when paced), so energy is in joules.
+A core at relative frequency f does f units of work per time unit. Dynamic power scales with f * V^2, so a slower,
+lower-voltage state spends less energy per unit of work but takes longer.
+"""
+
+class EnergyModel:
+    """Power figures for cores, process profiles and the battery, and the DVFS governor that uses them."""
+    def __init__(self):
+        # (relative frequency, voltage) per P-state, slowest first
+        self.p_states = [(0.5, 0.75), (0.75, 0.85), (1.0, 1.0), (1.25, 1.15)]
+        self.nominal_state = 2  # 1.0 = the speed burst times are measured at
+        self.dynamic_power = 2.0  # Watts of a 'medium' process at the nominal state
+        self.profile_activity = {'low': 0.5, 'medium': 1.0, 'high': 2.0}  # Dynamic power relative to 'medium'
+        self.static_power = 0.3  # Leakage of a busy core at 1 V, in watts (scales with voltage)
+        self.idle_power = 0.1  # Watts of an idle core in its sleep state
+        self.battery_capacity = 100000.0  # Joules
+        self.low_battery = 0.3  # Below this charge the power-aware scheduler saves energy first
+        self.busy_queue = 2  # Queued processes at which the governor raises a core to its fastest state
+
+    def frequency(self, state):
+        """Return the relative frequency of a P-state."""
+        return self.p_states[state][0]
+
+    def active_power(self, profile, state):
+        """Return the watts a core draws running a process of the given power profile in a P-state."""
+        frequency, voltage = self.p_states[state]
+        scale = frequency * (voltage / self.nominal_voltage()) ** 2
+        return self.dynamic_power * self.profile_activity.get(profile, 1.0) * scale + self.static_power * voltage
+
+    def nominal_voltage(self):
+        """Return the voltage of the nominal P-state."""
+        return self.p_states[self.nominal_state][1]
+
+    def energy_per_work(self, profile, state):
+        """Return the joules one unit of work costs in a P-state."""
+        return self.active_power(profile, state) / self.frequency(state)
+
+    def pick_state(self, battery_level, queued):
+        """DVFS governor: the P-state for a core's next slice, given the battery level (0-1) and its queue length.
+
+        A low battery, or nobody waiting behind the process, selects the most energy-efficient state (slowing
+        down then delays only the process itself); a long queue selects the fastest; otherwise the core runs
+        at nominal speed.
+        """
+        if battery_level < self.low_battery or not queued:
+            return self.efficient_state()
+        if queued >= self.busy_queue:
+            return len(self.p_states) - 1
+        return self.nominal_state
+
+    def efficient_state(self):
+        """Return the P-state with the lowest energy per unit of work."""
+        return min(range(len(self.p_states)), key=lambda state: self.energy_per_work('medium', state))
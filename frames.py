@@ -0,0 +1,190 @@
+"""
+frames.py
+---------
+Physical frame allocator for the Mini OS Simulation memory manager.
+Allocating and freeing a frame run in amortized O(1). The number of free runs and the largest free run are
+updated on every change, so fragmentation stats never rescan memory.
+"""
+from array import array
+
+class FrameAllocator:
+    """Free-frame map with boundary tags on every run of free frames.
+
+    used[f] is 1 while frame f is allocated. Each maximal free run [start, end] is recorded at both ends
+    (run_end[start] = end, run_start[end] = start), so a freed frame merges with its neighbours in O(1).
+    Frames come from the front of the run on top of a stack, so consecutive allocations are contiguous and
+    a fresh allocator hands out frames in order from 0.
+    """
+    def __init__(self, num_frames, used=None):
+        self.num_frames = num_frames
+        self.used = bytearray(num_frames) if used is None else bytearray(used)
+        self.run_end = array('i', [0]) * num_frames  # Start of a free run -> its last frame
+        self.run_start = array('i', [0]) * num_frames  # Last frame of a free run -> its start
+        self.runs = []  # Starts of free runs; entries go stale when their run is used up or merged
+        self.lengths = {}  # Run length -> number of free runs of that length
+        self.free_count = 0
+        self.free_runs = 0
+        self.largest_free_run = 0
+        starts = []
+        used = self.used
+        start = used.find(0)
+        while start >= 0:
+            end = used.find(1, start)
+            end = num_frames if end < 0 else end
+            self.add_run(start, end - 1)
+            self.free_count += end - start
+            starts.append(start)
+            start = used.find(0, end)
+        self.runs = starts[::-1]  # Lowest run on top
+
+    def add_run(self, start, end):
+        """Record the free run [start, end]."""
+        self.run_end[start] = end
+        self.run_start[end] = start
+        length = end - start + 1
+        self.lengths[length] = self.lengths.get(length, 0) + 1
+        self.free_runs += 1
+        if length > self.largest_free_run:
+            self.largest_free_run = length
+
+    def drop_run(self, start, end):
+        """Forget the free run [start, end] before it changes."""
+        length = end - start + 1
+        count = self.lengths[length] - 1
+        if count:
+            self.lengths[length] = count
+        else:
+            del self.lengths[length]
+            if length == self.largest_free_run:
+                while self.largest_free_run and self.largest_free_run not in self.lengths:
+                    self.largest_free_run -= 1
+        self.free_runs -= 1
+
+    def is_run_start(self, frame):
+        return not self.used[frame] and (frame == 0 or self.used[frame - 1])
+
+    def peek(self):
+        """Return the frame alloc() would hand out next, or None when memory is full."""
+        runs = self.runs
+        while runs and not self.is_run_start(runs[-1]):
+            runs.pop()
+        return runs[-1] if runs else None
+
+    def alloc(self):
+        """Allocate a free frame and return it, or None when memory is full."""
+        runs, used = self.runs, self.used
+        while runs:
+            start = runs[-1]
+            if not used[start] and (start == 0 or used[start - 1]):
+                break
+            runs.pop()
+        else:
+            return None
+        end = self.run_end[start]
+        self.used[start] = 1
+        self.free_count -= 1
+        if start < end:
+            self.add_run(start + 1, end)  # Before dropping the old run, so the largest-run search stops here
+            self.runs[-1] = start + 1
+        else:
+            self.runs.pop()
+        self.drop_run(start, end)
+        return start
+
+    def alloc_many(self, count):
+        """Allocate count frames, whole free runs at a time; return them as a list, or None if too few are free."""
+        if count > self.free_count:
+            return None
+        frames = []
+        runs, used = self.runs, self.used
+        while len(frames) < count:
+            start = runs[-1]
+            if used[start] or (start and not used[start - 1]):
+                runs.pop()
+                continue
+            end = self.run_end[start]
+            last = min(end, start + count - len(frames) - 1)
+            used[start:last + 1] = b'\x01' * (last - start + 1)
+            self.free_count -= last - start + 1
+            frames.extend(range(start, last + 1))
+            if last < end:
+                self.add_run(last + 1, end)
+                runs[-1] = last + 1
+            else:
+                runs.pop()
+            self.drop_run(start, end)
+        return frames
+
+    def alloc_run(self, count, align=1):
+        """Allocate count contiguous frames starting at a multiple of align, from the first free run that fits;
+        return the first frame, or None.
+        """
+        runs, used = self.runs, self.used
+        for i in range(len(runs) - 1, -1, -1):
+            start = runs[i]
+            if used[start] or (start and not used[start - 1]):
+                continue
+            end = self.run_end[start]
+            first = -(-start // align) * align
+            if end - first + 1 >= count:
+                break
+        else:
+            return None
+        used[first:first + count] = b'\x01' * count
+        self.free_count -= count
+        if first + count <= end:
+            self.add_run(first + count, end)
+            if first == start:
+                runs[i] = first + count
+            else:
+                runs.append(first + count)
+        if first > start:
+            self.add_run(start, first - 1)
+        self.drop_run(start, end)
+        return first
+
+    def alloc_at(self, frame):
+        """Allocate a specific frame that starts a free run (such as the target of a compaction move)."""
+        if not self.is_run_start(frame):
+            raise ValueError(f"Frame {frame} does not start a free run")
+        end = self.run_end[frame]
+        self.used[frame] = 1
+        self.free_count -= 1
+        if frame < end:
+            self.add_run(frame + 1, end)
+            self.runs.append(frame + 1)
+        self.drop_run(frame, end)
+        self.prune_runs()
+
+    def free(self, frame):
+        """Return an allocated frame, merging it with free neighbours."""
+        if not self.used[frame]:
+            raise ValueError(f"Frame {frame} is already free")
+        self.used[frame] = 0
+        self.free_count += 1
+        left = frame > 0 and not self.used[frame - 1]
+        right = frame + 1 < self.num_frames and not self.used[frame + 1]
+        start = self.run_start[frame - 1] if left else frame
+        end = self.run_end[frame + 1] if right else frame
+        self.add_run(start, end)  # Merged run first, so dropping its parts never lowers the largest run
+        if left:
+            self.drop_run(start, frame - 1)
+        if right:
+            self.drop_run(frame + 1, end)
+        if start == frame:
+            self.runs.append(frame)
+            self.prune_runs()
+
+    def prune_runs(self):
+        """Drop stale entries once the run stack is much longer than the number of free runs."""
+        if len(self.runs) > 2 * self.free_runs + 64:
+            self.runs = [s for s in dict.fromkeys(self.runs) if self.is_run_start(s)]
+
+    def fragmentation(self):
+        """Return free frames, free runs, the largest free run and external fragmentation (0 = one free run)."""
+        return {
+            'free_frames': self.free_count,
+            'free_runs': self.free_runs,
+            'largest_free_run': self.largest_free_run,
+            'external_fragmentation': 1 - self.largest_free_run / self.free_count if self.free_count else 0.0,
+        }
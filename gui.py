@@ -1,5 +1,8 @@
+import contextlib
+import io
 import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog
+from tkinter import ttk, messagebox, simpledialog, filedialog
+import snapshot
 from process import ProcessManager
 from memory import MemoryManager
 from concurrency import ConcurrencyManager
@@ -42,6 +45,7 @@ class MiniOSGUI(tk.Tk):
         self.configure(bg="#23232b")
         self.process_manager = ProcessManager()
         self.memory_manager = MemoryManager()
+        self.process_manager.memory_manager = self.memory_manager
         self.concurrency_manager = ConcurrencyManager()
         self.fs_manager = FileSystemManager()
         self.status_var = tk.StringVar(value="Welcome to Mini OS Simulation!")
@@ -82,6 +86,17 @@ class MiniOSGUI(tk.Tk):
         self.init_concurrency_tab()
         self.init_fs_tab()
 
+        # Snapshot buttons
+        snap_frame = ttk.Frame(self)
+        snap_frame.pack(pady=(0, 6))
+        for text, cmd, tip in [
+            ("Save Snapshot", self.gui_save_snapshot, "Save processes, memory, buffer and files to a snapshot file."),
+            ("Load Snapshot", self.gui_load_snapshot, "Restore the whole simulation from a snapshot file."),
+        ]:
+            btn = ttk.Button(snap_frame, text=text, command=cmd)
+            btn.pack(side=tk.LEFT, padx=8)
+            ToolTip(btn, tip)
+
         # Status bar
         status_bar = tk.Label(self, textvariable=self.status_var, anchor="w", bg="#2d2d39", fg="#fff", font=("Segoe UI", 11), relief="flat", padx=10)
         status_bar.pack(side=tk.BOTTOM, fill=tk.X)
@@ -89,6 +104,29 @@ class MiniOSGUI(tk.Tk):
     def set_status(self, msg):
         self.status_var.set(msg)
 
+    def gui_save_snapshot(self):
+        path = filedialog.asksaveasfilename(defaultextension=".snap", filetypes=[("Snapshots", "*.snap")])
+        if not path:
+            return
+        try:
+            size = snapshot.save(path, self.process_manager, self.memory_manager, self.concurrency_manager, self.fs_manager)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Snapshot", str(e))
+            return
+        self.set_status(f"Saved {size} bytes to {path}")
+
+    def gui_load_snapshot(self):
+        path = filedialog.askopenfilename(filetypes=[("Snapshots", "*.snap"), ("All files", "*")])
+        if not path:
+            return
+        try:
+            snapshot.load(path, self.process_manager, self.memory_manager, self.concurrency_manager, self.fs_manager)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Snapshot", str(e))
+            return
+        self.scheduler_label.config(text=f"Scheduler: {self.process_manager.scheduler_type}")
+        self.set_status(f"Restored {path}")
+
     def init_process_tab(self):
         label = ttk.Label(self.process_tab, text="Process Management", font=("Arial", 16))
         label.pack(pady=10)
@@ -111,6 +149,7 @@ class MiniOSGUI(tk.Tk):
             ("Start Cores", self.gui_start_cores, "Start all CPU core threads."),
             ("Stop Cores", self.gui_stop_cores, "Stop all CPU core threads."),
             ("Show Core Status", self.gui_show_cores, "Show the status of each CPU core."),
+            ("Scheduler Report", self.gui_show_report, "Show turnaround, waiting and response times and core utilization."),
         ]
         for i, (text, cmd, tip) in enumerate(btns):
             btn = ttk.Button(btn_frame, text=text, command=cmd)
@@ -162,8 +201,8 @@ class MiniOSGUI(tk.Tk):
         self.scheduler_label.config(text=f"Scheduler: {self.process_manager.scheduler_type}")
 
     def gui_set_scheduler(self):
-        scheds = ["FIFO", "RR", "MLFQ", "POWER"]
-        sched = simpledialog.askstring("Set Scheduler", "Enter scheduler (FIFO/RR/MLFQ/POWER):")
+        scheds = ["FIFO", "RR", "MLFQ", "POWER", "CFS"]
+        sched = simpledialog.askstring("Set Scheduler", "Enter scheduler (FIFO/RR/MLFQ/POWER/CFS):")
         if sched and sched.upper() in scheds:
             orig_input = __builtins__.input
             __builtins__.input = lambda prompt=None: str(scheds.index(sched.upper())+1)
@@ -224,6 +263,16 @@ class MiniOSGUI(tk.Tk):
         self.proc_output.config(state=tk.DISABLED)
         self.set_status("Showing core status.")
 
+    def gui_show_report(self):
+        self.proc_output.config(state=tk.NORMAL)
+        self.proc_output.delete(1.0, tk.END)
+        buf = io.StringIO()
+        with contextlib.redirect_stdout(buf):  # Restores stdout even if the report fails
+            self.process_manager.show_report()
+        self.proc_output.insert(tk.END, buf.getvalue())
+        self.proc_output.config(state=tk.DISABLED)
+        self.set_status("Showing scheduler report.")
+
     def init_memory_tab(self):
         label = ttk.Label(self.memory_tab, text="Memory Management", font=("Arial", 16))
         label.pack(pady=10)
@@ -238,6 +287,18 @@ class MiniOSGUI(tk.Tk):
             ("Visualize Fragmentation", self.gui_visualize_fragmentation),
             ("Swap Out Process", self.gui_swap_out),
             ("Swap In Process", self.gui_swap_in),
+            ("Page Table Overhead", self.gui_page_tables),
+            ("TLB Statistics", self.gui_tlb_stats),
+            ("Page Fault Statistics", self.gui_page_faults),
+            ("Swap Statistics", self.gui_swap_stats),
+            ("Reserve Kernel Zone", self.gui_reserve_kernel),
+            ("Kernel Memory", self.gui_kernel_memory),
+            ("Compact Memory", self.gui_compact),
+            ("Reclaimer Statistics", self.gui_reclaimer),
+            ("Fork Process", self.gui_fork),
+            ("Shared Memory", self.gui_sharing),
+            ("Promote Huge Pages", self.gui_promote),
+            ("Huge Pages", self.gui_huge_pages),
         ]
         cols = 4
         for i, (text, cmd) in enumerate(btns):
@@ -286,27 +347,63 @@ class MiniOSGUI(tk.Tk):
     def gui_visualize_fragmentation(self):
         self._show_mem_output(self.memory_manager.visualize_fragmentation)
 
+    def gui_page_tables(self):
+        self._show_mem_output(self.memory_manager.show_page_tables)
+
+    def gui_tlb_stats(self):
+        self._show_mem_output(self.memory_manager.show_tlb)
+
+    def gui_page_faults(self):
+        self._show_mem_output(self.memory_manager.show_page_faults)
+
+    def gui_swap_stats(self):
+        self._show_mem_output(self.memory_manager.show_swap)
+
+    def gui_reserve_kernel(self):
+        frames = simpledialog.askinteger("Reserve Kernel Zone", "Frames for the buddy and slab allocators:")
+        if frames is not None:
+            self._show_mem_output(self.memory_manager.reserve_kernel_zone, frames)
+
+    def gui_kernel_memory(self):
+        self._show_mem_output(self.memory_manager.show_kernel_memory)
+
+    def gui_fork(self):
+        parent = simpledialog.askinteger("Fork Process", "Enter parent PID:")
+        if parent is None:
+            return
+        child = simpledialog.askinteger("Fork Process", "Enter child PID:")
+        if child is not None:
+            self._show_mem_output(self.memory_manager.fork, parent, child)
+
+    def gui_sharing(self):
+        self._show_mem_output(self.memory_manager.show_sharing)
+
+    def gui_promote(self):
+        pid = simpledialog.askinteger("Promote Huge Pages", "Enter PID:")
+        if pid is not None:
+            self._show_mem_output(self.memory_manager.promote_huge_pages, pid)
+
+    def gui_huge_pages(self):
+        self._show_mem_output(self.memory_manager.show_huge_pages)
+
+    def gui_reclaimer(self):
+        self._show_mem_output(self.memory_manager.show_reclaimer)
+
+    def gui_compact(self):
+        mm = self.memory_manager
+        self._show_mem_output(lambda: mm.show_compaction(mm.compact_step()))
+
     def gui_swap_out(self):
         pid = simpledialog.askinteger("Swap Out Process", "Enter PID to swap out:")
         if pid is None:
             return
-        orig_input = __builtins__.input
-        __builtins__.input = lambda prompt=None: str(pid)
-        try:
-            self._show_mem_output(self.memory_manager.swap_out)
-        finally:
-            __builtins__.input = orig_input
+        self._show_mem_output(self.memory_manager.swap_out, pid)
 
     def gui_swap_in(self):
         pid = simpledialog.askinteger("Swap In Process", "Enter PID to swap in:")
         if pid is None:
             return
-        orig_input = __builtins__.input
-        __builtins__.input = lambda prompt=None: str(pid)
-        try:
-            self._show_mem_output(self.memory_manager.swap_in)
-        finally:
-            __builtins__.input = orig_input
+        self._show_mem_output(self.memory_manager.swap_in, pid)
 
     def _show_mem_output(self, func, *args):
         self.mem_output.config(state=tk.NORMAL)
@@ -1,4 +1,6 @@
 import sys
+import time
+import snapshot
 from process import ProcessManager
 from memory import MemoryManager
 from concurrency import ConcurrencyManager
@@ -16,7 +18,9 @@ def main():
         print("2. Memory Management")
         print("3. Concurrency & Synchronization")
         print("4. File System")
-        print("5. Exit")
+        print("5. Save Snapshot")
+        print("6. Load Snapshot")
+        print("7. Exit")
         choice = input("Enter choice: ")
         if choice == '1':
             process_manager.menu(memory_manager)
@@ -26,7 +30,19 @@ def main():
             concurrency_manager.menu()
         elif choice == '4':
             fs_manager.menu()
-        elif choice == '5':
+        elif choice in ('5', '6'):
+            path = input("Snapshot file [minios.snap]: ").strip() or 'minios.snap'
+            start = time.perf_counter()
+            try:
+                if choice == '5':
+                    size = snapshot.save(path, process_manager, memory_manager, concurrency_manager, fs_manager)
+                    print(f"Saved {size} bytes to {path} in {time.perf_counter() - start:.3f}s.")
+                else:
+                    snapshot.load(path, process_manager, memory_manager, concurrency_manager, fs_manager)
+                    print(f"Restored {path} in {time.perf_counter() - start:.3f}s.")
+            except (OSError, ValueError) as e:
+                print(f"Snapshot failed: {e}")
+        elif choice == '7':
             print("Exiting Mini Mobile OS. Goodbye!")
             sys.exit(0)
         else:
@@ -2,122 +2,1006 @@
 memory.py
 ---------
 Memory management module for Mini OS Simulation.
-Supports paging, address translation, memory visualization, fragmentation, and swapping.
+Supports paging, demand paging with page replacement, address translation, memory visualization,
+fragmentation and compaction, swapping with a background reclaimer, copy-on-write fork, huge pages, and a kernel
+zone with buddy and slab allocators. Frames hold real page contents, and pages leaving memory are written to a
+memory-mapped swap file.
 """
+import mmap
+from array import array
 
-class PageTableEntry:
-    """Represents a page table entry for a process."""
-    def __init__(self, page_number, frame_number, valid=True):
-        self.page_number = page_number
-        self.frame_number = frame_number
-        self.valid = valid
+from buddy import BuddyAllocator
+from compaction import Compactor
+from frames import FrameAllocator
+from pagetable import UNMAPPED, new_page_table, np, require_numpy
+from reclaim import Reclaimer
+from replacement import POLICIES, compare, make_policy
+from slab import SlabAllocator
+from swap import SwapSpace
+from tlb import TLB
 
 class MemoryManager:
     """Manages memory allocation, paging, fragmentation, and swapping."""
     def __init__(self, num_frames=8, page_size=1024):
         self.num_frames = num_frames
         self.page_size = page_size
-        self.frames = [None] * num_frames  # Simulate physical memory frames
-        self.page_tables = {}  # pid -> [PageTableEntry]
-        self.memory_constraints = 4  # Max processes in memory
-        self.swapped_out = {}  # pid -> [PageTableEntry] (simulated disk)
+        self.frames = [None] * num_frames  # Simulate physical memory frames: (pid, page) of the page in each
+        self.shared = {}  # frame -> every (pid, page) mapping it, for frames mapped more than once
+        self.cow_faults = {}  # pid -> writes that copied a shared page
+        self.allocator = FrameAllocator(num_frames)  # Free frames, free runs and the largest run, all O(1)
+        self.page_tables = {}  # pid -> FlatPageTable or RadixPageTable
+        self.memory_constraints = 4  # Max processes in memory; a soft limit while the reclaimer is on
+        self.swapped_out = {}  # pid -> array of the page numbers it had in memory (simulated disk)
+        self.address_bits = 32  # Size of a virtual address space
+        self.page_table_levels = 1  # 1 = direct-indexed page tables; 2-4 = radix tables for sparse address spaces
+        self.tlb = TLB()  # Caches translations in front of the page tables
+        self.memory_access_time = 100  # Time of one memory access (the TLB lookup takes tlb.latency)
+        self.current_pid = None  # Process whose address space is loaded
+        self.address_space = {}  # pid -> number of valid pages; a valid page that is not resident faults in
+        self.demand_paging = False  # Load pages on first access instead of when the page table is created
+        self.replacement = make_policy('LRU')  # Tracks resident (pid, page) pairs and picks eviction victims
+        self.page_faults = {}  # pid -> page faults
+        self.evictions = 0
+        self.memory = mmap.mmap(-1, max(num_frames * page_size, 1))  # Physical memory; untouched frames cost nothing
+        self.dirty = bytearray(num_frames)  # 1 while a frame holds data that is not all zeros
+        self.zero_page = bytes(page_size)
+        self.swap = None  # SwapSpace, created on first use
+        self.swap_path = None  # Swap file to use (None = a temporary file)
+        self.swap_slots = {}  # pid -> {page: swap slot} for pages whose contents are on swap
+        self.kernel = None  # BuddyAllocator over the kernel zone, a contiguous range of frames set aside
+        self.slabs = None  # SlabAllocator on top of the kernel zone
+        self.compactor = None  # Compaction pass in progress
+        self.compact_per_switch = 0  # Pages compaction may move on each context switch (0 = only on request)
+        self.referenced = bytearray(num_frames)  # Set on every access to a frame, cleared by reclaimer scans
+        self.reclaimer = None  # Reclaimer when background reclaim is on
+        self.huge_page_frames = 512  # Base pages in a huge page, a power of two (512 x 4 KiB = 2 MiB)
+        self.use_huge_pages = False  # Back whole huge pages of new processes with aligned runs of frames
+        self.huge_pages = {}  # pid -> {huge page number: first frame of its aligned run}
+        self.promotions = 0
+        self.demotions = 0
+
+    def page_bits(self):
+        """Return the number of bits in a page number."""
+        return (((1 << self.address_bits) - 1) // self.page_size).bit_length()
+
+    def new_page_table(self, levels=None):
+        """Return an empty page table in the configured layout (or with the given levels).
+
+        Where no upper level would be wider than a huge page, radix leaves span one huge page (as on x86-64), so a
+        huge page takes one entry in the level above instead of a leaf.
+        """
+        levels = levels or self.page_table_levels
+        bits = self.page_bits()
+        huge_bits = self.huge_page_frames.bit_length() - 1
+        fits = levels > 1 and levels - 1 <= bits - huge_bits <= huge_bits * (levels - 1)
+        return new_page_table(bits, levels, huge_bits if fits else None)
 
     def create_page_table(self, pid, num_pages):
-        """Create a page table for a process and allocate frames."""
-        if len(self.page_tables) >= self.memory_constraints:
+        """Create a page table for a process and allocate frames.
+
+        With use_huge_pages, each whole huge page of the process gets an aligned run of frames while one is free.
+        """
+        if self.reclaimer is None and len(self.page_tables) >= self.memory_constraints:
             print("Memory full! Cannot allocate more processes.")
             return False
-        page_table = []
-        for i in range(num_pages):
-            frame = self.find_free_frame()
-            if frame is not None:
-                self.frames[frame] = (pid, i)
-                page_table.append(PageTableEntry(i, frame))
-            else:
-                print("No free frames available!")
-                return False
+        if num_pages > 1 << self.page_bits():
+            print(f"{num_pages} pages do not fit a {self.address_bits}-bit address space!")
+            return False
+        if self.demand_paging:
+            self.page_tables[pid] = self.new_page_table()
+            self.address_space[pid] = num_pages
+            print(f"Page table created for PID {pid} (pages load on first access).")
+            return True
+        count = self.huge_page_frames
+        blocks = []
+        while self.use_huge_pages and (len(blocks) + 1) * count <= num_pages:
+            block = self.allocator.alloc_run(count, count)
+            if block is None:
+                break
+            blocks.append(block)
+        rest = num_pages - len(blocks) * count
+        frames = self.allocator.alloc_many(rest)
+        if frames is None and self.reclaimer is not None:
+            self.reclaimer.reclaim(rest, keep=pid)
+            frames = self.allocator.alloc_many(rest)
+        if frames is None:
+            for frame in (frame for block in blocks for frame in range(block, block + count)):
+                self.allocator.free(frame)
+            print("No free frames available!")
+            return False
+        page_table = self.new_page_table()
+        for number, block in enumerate(blocks):
+            page_table.map_huge(number * count, block, count)
+        page_table.map_range(len(blocks) * count, frames)
+        if blocks:
+            self.huge_pages[pid] = dict(enumerate(blocks))
+            frames = [frame for block in blocks for frame in range(block, block + count)] + frames
+        for i, frame in enumerate(frames):
+            self.frames[frame] = (pid, i)
+            self.referenced[frame] = 1
+            if self.dirty[frame]:
+                self.clear_frame(frame)
+            self.replacement.add((pid, i))
         self.page_tables[pid] = page_table
-        print(f"Page table created for PID {pid}.")
+        self.address_space[pid] = num_pages
+        print(f"Page table created for PID {pid}{f' ({len(blocks)} huge pages)' if blocks else ''}.")
+        if self.reclaimer is not None:
+            self.reclaimer.balance(keep=pid)
         return True
 
     def find_free_frame(self):
-        """Find a free frame in physical memory."""
-        for i, frame in enumerate(self.frames):
-            if frame is None:
-                return i
-        return None
+        """Return the next free frame in physical memory without allocating it, or None."""
+        return self.allocator.peek()
+
+    def allocate_frame(self, pid, page_number):
+        """Allocate a free frame to a page of a process and return it, or None if memory is full."""
+        frame = self.allocator.alloc()
+        if frame is not None:
+            self.frames[frame] = (pid, page_number)
+        return frame
+
+    def free_frame(self, frame):
+        """Release a frame."""
+        self.frames[frame] = None
+        self.allocator.free(frame)
 
     def translate(self, pid, virtual_address):
         """Translate a virtual address to a physical address for a process."""
         if pid not in self.page_tables:
             print("No page table for this PID.")
             return None
+        resolved = self.resolve(pid, virtual_address)
+        if resolved is None:
+            print("Invalid page access!")
+            return None
+        physical_address, hit, fault = resolved
+        print(f"Virtual address {virtual_address} -> Physical address {physical_address} "
+              f"(TLB {'hit' if hit else 'miss'}{', page fault' if fault else ''})")
+        return physical_address
+
+    def resolve(self, pid, virtual_address):
+        """Translate an address of a process with a page table, silently.
+
+        Returns (physical address, TLB hit, page fault), or None for an invalid address.
+        """
+        if pid != self.current_pid:
+            self.context_switch(pid)
         page_number = virtual_address // self.page_size
         offset = virtual_address % self.page_size
-        for entry in self.page_tables[pid]:
-            if entry.page_number == page_number and entry.valid:
-                physical_address = entry.frame_number * self.page_size + offset
-                print(f"Virtual address {virtual_address} -> Physical address {physical_address}")
-                return physical_address
-        print("Invalid page access!")
+        if page_number < 0:
+            return None
+        huge = self.huge_pages.get(pid)
+        if huge and page_number >> (self.huge_page_frames.bit_length() - 1) in huge:
+            return self.resolve_huge(pid, page_number, offset)
+        frame = self.tlb.lookup(pid, page_number)
+        hit = frame is not None
+        fault = False
+        if not hit:
+            frame = self.page_tables[pid].lookup(page_number)
+            if frame == UNMAPPED and 0 <= page_number < self.address_space.get(pid, 0):
+                frame = self.page_fault(pid, page_number)
+                fault = True
+            if frame != UNMAPPED:
+                self.tlb.insert(pid, page_number, frame)
+        if frame == UNMAPPED:
+            return None
+        return self.finish_access(pid, page_number, frame, offset, hit, fault)
+
+    def resolve_huge(self, pid, page_number, offset):
+        """Translate a page inside a huge page, whose single TLB entry covers the whole huge page."""
+        index = page_number & (self.huge_page_frames - 1)
+        number = page_number >> (self.huge_page_frames.bit_length() - 1)
+        first = self.tlb.lookup(pid, number, huge=True)
+        hit = first is not None
+        if not hit:
+            first = self.page_tables[pid].lookup(page_number) - index
+            self.tlb.insert(pid, number, first, huge=True)
+        return self.finish_access(pid, page_number, first + index, offset, hit, False)
+
+    def finish_access(self, pid, page_number, frame, offset, hit, fault):
+        """Record an access to a resident page; return (physical address, TLB hit, page fault)."""
+        self.replacement.touch((pid, page_number))
+        self.referenced[frame] = 1
+        if self.reclaimer is not None:
+            self.reclaimer.record(pid, fault)
+        return frame * self.page_size + offset, hit, fault
+
+    def access_memory(self, pid, virtual_address, length, data=None):
+        """Read length bytes at a virtual address, or write data there; pages fault in as needed.
+
+        Returns the bytes read (or written), or None if the range leaves the process's pages.
+        """
+        if pid not in self.page_tables or virtual_address < 0:
+            return None
+        chunks = []
+        done = 0
+        while done < length:
+            resolved = self.resolve(pid, virtual_address + done)
+            if resolved is None:
+                return None
+            physical = resolved[0]
+            count = min(length - done, self.page_size - physical % self.page_size)
+            if data is None:
+                chunks.append(self.memory[physical:physical + count])
+            else:
+                frame = physical // self.page_size
+                if frame in self.shared:
+                    frame = self.cow_fault(pid, (virtual_address + done) // self.page_size, frame)
+                    if frame == UNMAPPED:
+                        return None
+                    physical = frame * self.page_size + physical % self.page_size
+                self.memory[physical:physical + count] = data[done:done + count]
+                self.dirty[frame] = 1
+            done += count
+        return b''.join(chunks) if data is None else bytes(data)
+
+    def read_memory(self, pid, virtual_address, length):
+        """Return length bytes from a process's virtual memory, or None for an invalid range."""
+        return self.access_memory(pid, virtual_address, length)
+
+    def write_memory(self, pid, virtual_address, data):
+        """Write bytes into a process's virtual memory; return False for an invalid range."""
+        return self.access_memory(pid, virtual_address, len(data), data) is not None
+
+    def translate_batch(self, pid, virtual_addresses):
+        """Translate a NumPy array (or any buffer) of virtual addresses for a process in one vectorized pass.
+
+        Returns (physical addresses, fault mask): the physical address is -1 wherever the fault mask is set, i.e.
+        wherever translate() would take a page fault or reject the address. Nothing is printed, and no page is
+        loaded and no TLB or replacement state changes; pass the faulting addresses to translate() to load them.
+        """
+        require_numpy()
+        if pid not in self.page_tables:
+            raise ValueError(f"No page table for PID {pid}")
+        addresses = np.asarray(virtual_addresses, dtype=np.int64)
+        pages = addresses // self.page_size
+        frames = self.page_tables[pid].lookup_many(pages)
+        faults = frames == UNMAPPED
+        physical = frames * self.page_size + (addresses - pages * self.page_size)
+        physical[faults] = -1
+        return physical, faults
+
+    def page_fault(self, pid, page_number):
+        """Load a valid page that is not resident, evicting a victim page if memory is full; return its frame."""
+        self.page_faults[pid] = self.page_faults.get(pid, 0) + 1
+        if self.reclaimer is not None:
+            self.reclaimer.balance()  # Before loading, so the reclaimer never takes the page being faulted in
+        frame = self.allocate_frame(pid, page_number)
+        if frame is None:
+            frame = self.evict()
+            if frame is None:
+                return UNMAPPED
+            self.frames[frame] = (pid, page_number)
+        self.page_in(pid, page_number, frame)
+        self.page_tables[pid].map(page_number, frame)
+        self.replacement.add((pid, page_number))
+        return frame
+
+    def evict(self):
+        """Evict replacement victims until a frame is no longer mapped; return it, still allocated, or None.
+
+        Evicting one mapping of a shared frame leaves the frame to its other users, so that takes more victims.
+        """
+        while len(self.replacement):
+            pid, page_number = self.replacement.victim()
+            self.split_huge_page(pid, page_number)
+            frame = self.page_tables[pid].unmap(page_number)
+            self.tlb.invalidate(pid, page_number)
+            self.page_out(pid, page_number, frame)
+            self.evictions += 1
+            if self.drop_mapping(frame, pid, page_number):
+                return frame
         return None
 
+    def reclaim_frame(self, frame):
+        """Evict every mapping of the page in a frame (its contents go to swap) and free the frame."""
+        for pid, page_number in self.mappings(frame):
+            self.split_huge_page(pid, page_number)
+            self.page_tables[pid].unmap(page_number)
+            self.tlb.invalidate(pid, page_number)
+            self.replacement.remove((pid, page_number))
+            self.page_out(pid, page_number, frame)
+            self.evictions += 1
+        self.shared.pop(frame, None)
+        self.free_frame(frame)
+
+    def mappings(self, frame):
+        """Return the (pid, page) pairs mapping a frame."""
+        owners = self.shared.get(frame)
+        if owners is not None:
+            return list(owners)
+        return [] if self.frames[frame] is None else [self.frames[frame]]
+
+    def refcount(self, frame):
+        """Return the number of pages mapping a frame."""
+        owners = self.shared.get(frame)
+        return len(owners) if owners is not None else int(self.frames[frame] is not None)
+
+    def add_mapping(self, frame, pid, page_number):
+        """Record another page mapping an allocated frame."""
+        owners = self.shared.get(frame)
+        if owners is None:
+            owners = self.shared[frame] = [self.frames[frame]]
+        owners.append((pid, page_number))
+
+    def drop_mapping(self, frame, pid, page_number):
+        """Forget one page mapping a frame; return True when no page maps it any more (the frame can be freed)."""
+        owners = self.shared.get(frame)
+        if owners is None:
+            self.frames[frame] = None
+            return True
+        owners.remove((pid, page_number))
+        self.frames[frame] = owners[0]
+        if len(owners) == 1:
+            del self.shared[frame]
+        return False
+
+    def fork(self, parent, child):
+        """Give child a copy of parent's address space that shares every resident frame, copy-on-write.
+
+        Pages the parent has on swap are copied to new swap slots for the child. Returns whether it succeeded.
+        """
+        if parent not in self.page_tables:
+            print("No such process in memory.")
+            return False
+        if child in self.page_tables or child in self.swapped_out:
+            print(f"PID {child} already has an address space.")
+            return False
+        if self.reclaimer is None and len(self.page_tables) >= self.memory_constraints:
+            print("Memory full! Cannot allocate more processes.")
+            return False
+        table = self.new_page_table()
+        for page, frame in self.page_tables[parent].items():
+            table.map(page, frame)
+            self.add_mapping(frame, child, page)
+            self.replacement.add((child, page))
+        self.page_tables[child] = table
+        self.address_space[child] = self.address_space.get(parent, 0)
+        slots = self.swap_slots.get(parent)
+        if slots:
+            swap = self.swap_space()
+            self.swap_slots[child] = {page: swap.write(swap.peek(slot)) for page, slot in slots.items()}
+        print(f"PID {child} forked from PID {parent}, sharing {len(table)} pages.")
+        return True
+
+    def cow_fault(self, pid, page_number, frame):
+        """Give a process its own copy of a shared page it is writing; return the page's frame, or UNMAPPED."""
+        self.cow_faults[pid] = self.cow_faults.get(pid, 0) + 1
+        self.split_huge_page(pid, page_number)
+        key = (pid, page_number)
+        self.replacement.remove(key)  # So making room never evicts the page being copied
+        copy = self.allocator.alloc()
+        if copy is None:
+            copy = self.evict()
+        self.replacement.add(key)
+        if copy is None:
+            return UNMAPPED
+        if frame not in self.shared:  # Evictions left the page with no other users; keep it
+            self.allocator.free(copy)
+            return frame
+        size = self.page_size
+        if self.dirty[frame]:
+            self.memory[copy * size:(copy + 1) * size] = self.memory[frame * size:(frame + 1) * size]
+            self.dirty[copy] = 1
+        elif self.dirty[copy]:
+            self.clear_frame(copy)
+        self.drop_mapping(frame, pid, page_number)
+        self.frames[copy] = key
+        self.referenced[copy] = 1
+        self.page_tables[pid].map(page_number, copy)
+        self.tlb.invalidate(pid, page_number)
+        return copy
+
+    def sharing_stats(self):
+        """Return shared frames, the pages mapping them, frames saved by sharing, and pid -> copy-on-write faults."""
+        mappings = sum(len(owners) for owners in self.shared.values())
+        return {'shared_frames': len(self.shared), 'shared_pages': mappings,
+                'frames_saved': mappings - len(self.shared), 'cow_faults': dict(self.cow_faults)}
+
+    def show_sharing(self):
+        """Print frames shared between processes, the frames that saves, and copy-on-write faults per process."""
+        stats = self.sharing_stats()
+        resident = self.num_frames - self.allocator.free_count
+        print(f"\n[Shared Memory] {stats['shared_frames']} shared frames mapped by {stats['shared_pages']} pages; "
+              f"{stats['frames_saved']} frames saved ({resident} frames used instead of "
+              f"{resident + stats['frames_saved']})")
+        for pid, faults in stats['cow_faults'].items():
+            print(f"PID {pid}: {faults} copy-on-write faults")
+
+    def split_huge_page(self, pid, page_number):
+        """Demote the huge page holding a page, if any, before the page is evicted, moved or copied on its own."""
+        huge = self.huge_pages.get(pid)
+        if huge:
+            number = page_number >> (self.huge_page_frames.bit_length() - 1)
+            if number in huge:
+                self.demote(pid, number)
+
+    def huge_block(self, frame):
+        """Return the first frame of the huge page a frame belongs to, or None."""
+        if self.huge_pages and self.frames[frame] is not None:
+            shift = self.huge_page_frames.bit_length() - 1
+            for pid, page_number in self.mappings(frame):
+                first = self.huge_pages.get(pid, {}).get(page_number >> shift)
+                if first is not None:
+                    return first
+        return None
+
+    def promote(self, pid, number):
+        """Back huge page number of a process with one aligned run of frames; return whether it succeeded.
+
+        Resident pages are copied into the run and their old frames freed, and pages not in memory are loaded into
+        it from swap (or zeroed). Free frames are compacted if no aligned run is free.
+        """
+        count = self.huge_page_frames
+        first_page = number * count
+        if pid not in self.page_tables or number < 0 or first_page + count > self.address_space.get(pid, 0) \
+                or number in self.huge_pages.get(pid, ()):
+            return False
+        block = self.allocator.alloc_run(count, count)
+        if block is None and self.allocator.free_count >= count:
+            self.compactor = None
+            self.compact_step()
+            block = self.allocator.alloc_run(count, count)
+        if block is None:
+            return False
+        table = self.page_tables[pid]
+        size = self.page_size
+        for i in range(count):
+            page_number, frame = first_page + i, block + i
+            old = table.lookup(page_number)
+            if old == UNMAPPED:
+                self.page_in(pid, page_number, frame)
+                self.replacement.add((pid, page_number))
+            else:
+                if self.dirty[old]:
+                    self.memory[frame * size:(frame + 1) * size] = self.memory[old * size:(old + 1) * size]
+                    self.dirty[frame] = 1
+                elif self.dirty[frame]:
+                    self.clear_frame(frame)
+                self.tlb.invalidate(pid, page_number)
+                if self.drop_mapping(old, pid, page_number):
+                    self.allocator.free(old)
+            self.frames[frame] = (pid, page_number)
+            self.referenced[frame] = 1
+        table.map_huge(first_page, block, count)
+        self.huge_pages.setdefault(pid, {})[number] = block
+        self.promotions += 1
+        return True
+
+    def demote(self, pid, number):
+        """Split a huge page of a process into base pages on the same frames."""
+        huge = self.huge_pages[pid]
+        del huge[number]
+        if not huge:
+            del self.huge_pages[pid]
+        self.page_tables[pid].split_huge(number * self.huge_page_frames)
+        self.tlb.invalidate(pid, number, huge=True)
+        self.demotions += 1
+
+    def promote_huge_pages(self, pid, number=None):
+        """Promote one huge page of a process, or every whole huge page of it (number None); return the count."""
+        if pid not in self.page_tables:
+            print("No such process in memory.")
+            return 0
+        huge = self.huge_pages.get(pid, ())
+        numbers = [n for n in (range(self.address_space.get(pid, 0) // self.huge_page_frames) if number is None
+                               else [number]) if n not in huge]
+        promoted = sum(self.promote(pid, n) for n in numbers)
+        print(f"PID {pid}: {promoted} of {len(numbers)} huge page(s) promoted.")
+        return promoted
+
+    def demote_huge_pages(self, pid, number=None):
+        """Split one huge page of a process, or all of them (number None), into base pages; return the count."""
+        numbers = list(self.huge_pages.get(pid, ())) if number is None else \
+            [number] if number in self.huge_pages.get(pid, ()) else []
+        for n in numbers:
+            self.demote(pid, n)
+        print(f"PID {pid}: demoted {len(numbers)} huge page(s).")
+        return len(numbers)
+
+    def huge_page_stats(self):
+        """Return base and huge pages and page-table bytes per process, and TLB reach in bytes.
+
+        tlb_reach is the memory the cached translations cover now; tlb_reach_base and tlb_reach_huge are what a full
+        TLB covers with base pages only and with huge pages only.
+        """
+        count = self.huge_page_frames
+        processes = {}
+        for pid, table in self.page_tables.items():
+            huge = len(self.huge_pages.get(pid, ()))
+            processes[pid] = (len(table) - huge * count, huge, table.memory_bytes())
+        return {'processes': processes, 'huge_page_bytes': count * self.page_size,
+                'tlb_reach': self.tlb.reach(self.page_size, count * self.page_size),
+                'tlb_reach_base': self.tlb.entries * self.page_size,
+                'tlb_reach_huge': self.tlb.entries * count * self.page_size,
+                'promotions': self.promotions, 'demotions': self.demotions}
+
+    def show_huge_pages(self):
+        """Print base and huge pages and page-table memory per process, and the TLB reach."""
+        stats = self.huge_page_stats()
+        print(f"\n[Huge Pages] {self.huge_page_frames} pages ({stats['huge_page_bytes']} bytes) per huge page; "
+              f"{stats['promotions']} promotions, {stats['demotions']} demotions")
+        for pid, (base, huge, size) in stats['processes'].items():
+            print(f"PID {pid}: {base} base pages, {huge} huge pages, page tables {size} bytes")
+        print(f"TLB reach: {stats['tlb_reach']} bytes cached now; a full TLB covers {stats['tlb_reach_base']} bytes "
+              f"with base pages, {stats['tlb_reach_huge']} bytes with huge pages")
+
+    def configure_huge_pages(self):
+        """Set the huge page size and whether new processes get huge pages."""
+        try:
+            count = int(input(f"Pages per huge page (a power of two) [{self.huge_page_frames}]: ")
+                        or self.huge_page_frames)
+        except ValueError:
+            print("Invalid input.")
+            return
+        if count < 2 or count & (count - 1):
+            print("A huge page must be a power of two of at least 2 pages.")
+            return
+        if count != self.huge_page_frames and self.huge_pages:
+            print("Demote every huge page before changing the size.")
+            return
+        answer = input(f"Give new processes huge pages (y/n) [{'y' if self.use_huge_pages else 'n'}]: ").lower()
+        if answer:
+            self.use_huge_pages = answer == 'y'
+        self.huge_page_frames = count
+        print(f"Huge pages of {count} pages; new processes {'get' if self.use_huge_pages else 'do not get'} them.")
+
+    def configure_reclaimer(self):
+        """Turn the background reclaimer on or off and set its watermarks and working-set window."""
+        on = self.reclaimer is not None
+        answer = input(f"Reclaim pages in the background (y/n) [{'y' if on else 'n'}]: ").lower()
+        if answer == 'n' or (not answer and not on):
+            self.reclaimer = None
+            print(f"Background reclaim off; at most {self.memory_constraints} processes in memory.")
+            return
+        current = self.reclaimer or Reclaimer(self)
+        try:
+            low = int(input(f"Low watermark (free frames) [{current.low}]: ") or current.low)
+            high = int(input(f"High watermark (free frames) [{current.high}]: ") or current.high)
+            window = int(input(f"Working-set window (scans) [{current.window}]: ") or current.window)
+        except ValueError:
+            print("Invalid input.")
+            return
+        if not 0 < low < high <= self.num_frames or window < 1:
+            print("Need 0 < low < high <= number of frames and a positive window.")
+            return
+        current.low, current.high, current.window = low, high, window
+        self.reclaimer = current
+        print(f"Background reclaim on: wakes below {low} free frames, reclaims up to {high}; "
+              f"{self.memory_constraints} processes is now a soft limit.")
+
+    def show_reclaimer(self):
+        """Print watermarks, reclaim counts, and working set and page-fault rate per process."""
+        reclaimer = self.reclaimer
+        if reclaimer is None:
+            print("\n[Reclaimer] Off.")
+            return
+        print(f"\n[Reclaimer] watermarks {reclaimer.low}/{reclaimer.high}, {self.allocator.free_count} frames free; "
+              f"{reclaimer.wakeups} wakeups, {reclaimer.scans} scans, {reclaimer.pages_reclaimed} pages reclaimed, "
+              f"{reclaimer.processes_swapped} processes swapped out")
+        for pid, (resident, working_set, rate, thrashing) in reclaimer.stats().items():
+            print(f"PID {pid}: {resident} pages resident, working set {working_set}, "
+                  f"fault rate {rate:.1%}{' (thrashing)' if thrashing else ''}")
+        if reclaimer.thrashing():
+            print("Working sets exceed memory: thrashing, processes will be swapped out.")
+
+    def swap_space(self):
+        """Return the swap space, creating the swap file on first use."""
+        if self.swap is None:
+            self.swap = SwapSpace(self.page_size, path=self.swap_path)
+        return self.swap
+
+    def clear_frame(self, frame):
+        """Zero a frame that still holds an old page's data."""
+        start = frame * self.page_size
+        self.memory[start:start + self.page_size] = self.zero_page
+        self.dirty[frame] = 0
+
+    def page_out(self, pid, page_number, frame):
+        """Write a page that is leaving memory to swap; all-zero pages are never written."""
+        if self.dirty[frame]:
+            start = frame * self.page_size
+            slot = self.swap_space().write(self.memory[start:start + self.page_size])
+            self.swap_slots.setdefault(pid, {})[page_number] = slot
+
+    def page_in(self, pid, page_number, frame):
+        """Fill a newly allocated frame with a page's contents from swap, or with zeros."""
+        slots = self.swap_slots.get(pid)
+        slot = slots.pop(page_number, None) if slots else None
+        if slot is None:
+            if self.dirty[frame]:
+                self.clear_frame(frame)
+            return
+        if not slots:
+            del self.swap_slots[pid]
+        start = frame * self.page_size
+        self.memory[start:start + self.page_size] = self.swap.read(slot)
+        self.dirty[frame] = 1
+
+    def show_swap(self):
+        """Print the pages and bytes swapped each way, swap bandwidth and latency per page."""
+        print(f"\n[Swap] {self.page_size}-byte pages, {len(self.swapped_out)} process(es) swapped out")
+        if self.swap is None:
+            print("Swap file not used yet.")
+            return
+        stats = self.swap.stats()
+        print(f"Slots in use: {stats['slots_used']}/{stats['slots']}")
+        for direction, label in (('out', 'Out'), ('in', 'In')):
+            print(f"{label}: {stats[f'pages_{direction}']} pages, {stats[f'bytes_{direction}']} bytes in "
+                  f"{stats[f'time_{direction}'] * 1000:.3f} ms ({stats[f'bandwidth_{direction}'] / 1e6:.1f} MB/s, "
+                  f"{stats[f'latency_{direction}'] * 1e6:.2f} us/page)")
+
+    def set_replacement(self, name):
+        """Switch the page replacement policy, keeping track of the pages already resident."""
+        policy = make_policy(name)
+        for frame, entry in enumerate(self.frames):
+            if entry is not None:
+                for key in self.shared.get(frame, (entry,)):
+                    policy.add(key)
+        self.replacement = policy
+
+    def show_page_faults(self):
+        """Print page faults per process and evictions."""
+        print(f"\n[Demand Paging] {'on' if self.demand_paging else 'off'}, {self.replacement.name} replacement, "
+              f"{self.evictions} evictions")
+        for pid, faults in self.page_faults.items():
+            print(f"PID {pid}: {faults} page faults")
+
+    def configure_demand_paging(self):
+        """Turn demand paging on or off and choose the page replacement policy."""
+        answer = input(f"Load pages on first access (y/n) [{'y' if self.demand_paging else 'n'}]: ").lower()
+        if answer:
+            self.demand_paging = answer == 'y'
+        name = input(f"Replacement policy ({'/'.join(POLICIES)}) [{self.replacement.name}]: ")
+        try:
+            if name:
+                self.set_replacement(name)
+        except ValueError as e:
+            print(e)
+            return
+        print(f"Demand paging {'on' if self.demand_paging else 'off'}, {self.replacement.name} replacement.")
+
+    def compare_replacement(self):
+        """Count the page faults of every replacement policy, and Belady's optimum, on a reference string."""
+        try:
+            references = [int(page) for page in input("Reference string (page numbers, comma separated): ")
+                          .replace(' ', '').split(',') if page]
+            frames = int(input("Number of frames: "))
+        except ValueError:
+            print("Invalid input.")
+            return
+        if frames < 1:
+            print("Need at least one frame.")
+            return
+        print(f"\n[Page Faults] {len(references)} references, {frames} frames")
+        for name, faults in compare(references, frames).items():
+            print(f"{name:6s} {faults} faults")
+
+    def context_switch(self, pid):
+        """Load a process's address space: the TLB switches ASID or is flushed.
+
+        With background compaction on, each switch also moves a few pages while free memory is fragmented.
+        """
+        self.current_pid = pid
+        self.tlb.switch(pid)
+        if self.compact_per_switch and (self.compactor is not None or self.allocator.free_runs > 1):
+            self.compact_step(self.compact_per_switch)
+        if self.reclaimer is not None:
+            self.reclaimer.balance()
+
+    def move_frame(self, source, target):
+        """Move the page in frame source to the free frame target, which must start a free run.
+
+        The contents are copied first, then each page-table entry mapping the frame is switched in a single write and
+        its stale TLB entry dropped, so every translation sees either the old frame or the new one, never a
+        half-moved page.
+        """
+        owners = self.mappings(source)
+        for pid, page_number in owners:
+            self.split_huge_page(pid, page_number)
+        self.allocator.alloc_at(target)
+        size = self.page_size
+        if self.dirty[source]:
+            self.memory[target * size:(target + 1) * size] = self.memory[source * size:(source + 1) * size]
+            self.dirty[target] = 1
+        elif self.dirty[target]:
+            self.clear_frame(target)
+        for pid, page_number in owners:
+            self.page_tables[pid].map(page_number, target)
+            self.tlb.invalidate(pid, page_number)
+        if source in self.shared:
+            self.shared[target] = self.shared.pop(source)
+        self.frames[target] = self.frames[source]
+        self.frames[source] = None
+        self.referenced[target] = self.referenced[source]
+        if self.reclaimer is not None:
+            self.reclaimer.age[target] = self.reclaimer.age[source]
+        self.allocator.free(source)
+
+    def compact_step(self, max_moves=None):
+        """Run the current compaction pass (starting one if needed) for up to max_moves page moves.
+
+        Returns the pass report: moved frames and bytes, fragmentation before and after, and whether it is done.
+        """
+        if self.compactor is None:
+            self.compactor = Compactor(self)
+        self.compactor.step(max_moves)
+        report = self.compactor.report()
+        if report['done']:
+            self.compactor = None
+        return report
+
+    def compact(self):
+        """Compact memory, a bounded number of moves at a time or until the free frames form one run."""
+        answer = input("Maximum pages to move (blank = until done): ")
+        try:
+            max_moves = int(answer) if answer else None
+        except ValueError:
+            print("Invalid input.")
+            return
+        self.show_compaction(self.compact_step(max_moves))
+
+    def show_compaction(self, report):
+        """Print a compaction report."""
+        before, after = report['before'], report['after']
+        print(f"\n[Compaction] moved {report['moved_frames']} frames ({report['moved_bytes']} bytes)"
+              f"{'' if report['done'] else ', pass in progress'}")
+        for label, stats in (('Before', before), ('After', after)):
+            print(f"{label}: {stats['free_runs']} free fragments, largest free run {stats['largest_free_run']}, "
+                  f"external fragmentation {stats['external_fragmentation']:.0%}")
+
+    def configure_compaction(self):
+        """Set how many pages compaction moves on each context switch."""
+        try:
+            moves = int(input(f"Pages to move per context switch (0 = off) [{self.compact_per_switch}]: ")
+                        or self.compact_per_switch)
+        except ValueError:
+            print("Invalid input.")
+            return
+        self.compact_per_switch = max(moves, 0)
+        print(f"Background compaction {'off' if not moves else f'moves up to {moves} pages per switch'}.")
+
+    def tlb_stats(self):
+        """Return pid -> (hits, misses, flushes, hit rate, effective memory access time)."""
+        stats = {}
+        for pid, (hits, misses, flushes) in self.tlb.counts.items():
+            table = self.page_tables.get(pid)
+            levels = table.levels if table is not None else self.page_table_levels
+            stats[pid] = (hits, misses, flushes, self.tlb.hit_rate(pid),
+                          self.tlb.effective_access_time(self.memory_access_time, levels, pid))
+        return stats
+
+    def show_tlb(self):
+        """Print the TLB configuration and per-process hit rates."""
+        tlb = self.tlb
+        print(f"\n[TLB] {tlb.entries} entries, {tlb.ways}-way, {tlb.policy.upper()} replacement, "
+              f"{'ASID-tagged' if tlb.asid else 'flushed on switch'}; memory access {self.memory_access_time}, "
+              f"TLB lookup {tlb.latency}")
+        for pid, (hits, misses, flushes, rate, eat) in self.tlb_stats().items():
+            print(f"PID {pid}: {hits} hits, {misses} misses, {flushes} flushes, hit rate {rate:.1%}, "
+                  f"effective access time {eat:.1f}")
+        print(f"Overall hit rate: {tlb.hit_rate():.1%}")
+
+    def configure_tlb(self):
+        """Set the TLB size, associativity, replacement policy and ASID tagging (resets its statistics)."""
+        tlb = self.tlb
+        try:
+            entries = int(input(f"TLB entries [{tlb.entries}]: ") or tlb.entries)
+            ways = int(input(f"Associativity (ways, {entries} = fully associative) [{tlb.ways}]: ") or tlb.ways)
+            policy = (input(f"Replacement (lru/random) [{tlb.policy}]: ") or tlb.policy).lower()
+            asid = (input(f"Tag entries with ASIDs instead of flushing on switch (y/n) "
+                          f"[{'y' if tlb.asid else 'n'}]: ") or ('y' if tlb.asid else 'n')).lower() == 'y'
+            self.tlb = TLB(entries, ways, policy, asid, tlb.latency)
+        except ValueError as e:
+            print(f"Invalid TLB configuration: {e}")
+            return
+        self.tlb.current = self.current_pid
+        print(f"TLB set to {entries} entries, {ways}-way, {policy.upper()}, {'ASID' if asid else 'flush'} mode.")
+
+    def page_table_stats(self):
+        """Return pid -> (levels, mapped pages, page-table bytes) for every process in memory."""
+        return {pid: (table.levels, len(table), table.memory_bytes()) for pid, table in self.page_tables.items()}
+
+    def show_page_tables(self):
+        """Print the page-table memory overhead of every process in memory."""
+        print(f"\n[Page Tables] {self.address_bits}-bit addresses, {self.page_size}-byte pages, "
+              f"{'direct-indexed' if self.page_table_levels == 1 else f'{self.page_table_levels}-level'} tables")
+        total = 0
+        for pid, (levels, pages, size) in self.page_table_stats().items():
+            per_page = f"{size / pages:.1f} B/page" if pages else "no pages"
+            print(f"PID {pid}: {pages} pages, {levels} level(s), {size} bytes ({per_page})")
+            total += size
+        print(f"Total page-table memory: {total} bytes")
+
+    def configure_page_tables(self):
+        """Set the virtual address size and page-table layout used for new page tables."""
+        try:
+            bits = int(input(f"Virtual address bits [{self.address_bits}]: ") or self.address_bits)
+            levels = int(input(f"Page-table levels (1 = direct-indexed, up to 4) [{self.page_table_levels}]: ")
+                         or self.page_table_levels)
+        except ValueError:
+            print("Invalid input.")
+            return
+        if not 1 <= levels <= 4 or bits < 1:
+            print("Levels must be 1-4 and address bits positive.")
+            return
+        self.address_bits = bits
+        self.page_table_levels = levels
+        print(f"New page tables: {bits}-bit addresses, {levels} level(s).")
+
+    def reserve_kernel_zone(self, num_frames):
+        """Set aside contiguous frames for the buddy and slab allocators; return whether it succeeded."""
+        if self.kernel is not None:
+            print("Kernel zone already reserved.")
+            return False
+        if num_frames < 1:
+            print("The kernel zone needs at least one frame.")
+            return False
+        base = self.allocator.alloc_run(num_frames)
+        if base is None and self.allocator.free_count >= num_frames:
+            self.compactor = None
+            self.compact_step()  # Gather the scattered free frames into one run
+            base = self.allocator.alloc_run(num_frames)
+        if base is None:
+            print(f"No run of {num_frames} free frames.")
+            return False
+        for frame in range(base, base + num_frames):
+            if self.dirty[frame]:
+                self.clear_frame(frame)
+        self.kernel = BuddyAllocator(num_frames, base)
+        self.slabs = SlabAllocator(self.kernel, self.page_size)
+        print(f"Kernel zone: frames {base}-{base + num_frames - 1}.")
+        return True
+
+    def in_kernel_zone(self, frame):
+        return self.kernel is not None and self.kernel.base <= frame < self.kernel.base + self.kernel.num_frames
+
+    def show_kernel_memory(self):
+        """Print buddy free blocks, slab caches, and internal and external fragmentation of the kernel zone."""
+        if self.kernel is None:
+            print("\n[Kernel Memory] No kernel zone reserved.")
+            return
+        buddy = self.kernel.fragmentation()
+        print(f"\n[Kernel Memory] {self.kernel.num_frames} frames from frame {self.kernel.base}")
+        print(f"Buddy: {buddy['allocated_blocks']} blocks allocated, {buddy['free_frames']} frames free, "
+              f"largest free block {buddy['largest_free_block']}")
+        print("Free blocks: " + (", ".join(f"{count} x {size}" for size, count in buddy['free_blocks'].items())
+                                 or "none"))
+        print(f"Internal fragmentation {buddy['internal_fragmentation']:.0%}, "
+              f"external fragmentation {buddy['external_fragmentation']:.0%}")
+        slabs = self.slabs.fragmentation()
+        for name, stats in slabs['caches'].items():
+            print(f"Slab cache {name}: {stats['objects']} x {stats['object_size']} B in {stats['slabs']} slab(s) "
+                  f"of {stats['objects_per_slab']}, internal fragmentation {stats['internal_fragmentation']:.0%}")
+        if slabs['caches']:
+            print(f"Slab internal fragmentation: {slabs['internal_fragmentation']:.0%}")
+
+    def kernel_menu(self):
+        """Menu for the kernel zone: contiguous blocks from the buddy allocator and objects from slab caches."""
+        while True:
+            print("\n[Kernel Memory]")
+            print("1. Reserve Kernel Zone")
+            print("2. Allocate Contiguous Frames")
+            print("3. Free Contiguous Frames")
+            print("4. Create Slab Cache")
+            print("5. Allocate Object")
+            print("6. Free Object")
+            print("7. Kernel Memory Statistics")
+            print("8. Back")
+            choice = input("Enter choice: ")
+            try:
+                if choice == '1':
+                    self.reserve_kernel_zone(int(input("Frames to reserve: ")))
+                elif choice == '8':
+                    break
+                elif choice not in ('2', '3', '4', '5', '6', '7'):
+                    print("Invalid choice.")
+                elif self.kernel is None:
+                    print("Reserve a kernel zone first.")
+                elif choice == '2':
+                    frames = int(input("Number of frames: "))
+                    frame = self.kernel.alloc(frames)
+                    print("No free block large enough." if frame is None else
+                          f"Allocated frames {frame}-{frame + self.kernel.block_frames(frame) - 1}.")
+                elif choice == '3':
+                    self.kernel.free(int(input("First frame of the block: ")))
+                    print("Block freed.")
+                elif choice == '4':
+                    name = input("Cache name: ")
+                    cache = self.slabs.create_cache(name, int(input("Object size in bytes: ")))
+                    print(f"Cache {name}: {cache.per_slab} objects per {cache.slab_bytes}-byte slab.")
+                elif choice == '5':
+                    address = self.slabs.alloc(input("Cache name: "))
+                    print("Kernel zone full." if address is None else f"Object at physical address {address}.")
+                elif choice == '6':
+                    name = input("Cache name: ")
+                    self.slabs.free(name, int(input("Physical address: ")))
+                    print("Object freed.")
+                else:
+                    self.show_kernel_memory()
+            except KeyError as e:
+                print(f"No cache named {e}.")
+            except ValueError as e:
+                print(e)
+
     def visualize_memory(self):
         """Print the current state of memory frames."""
         print("\n[Memory Frames]")
         for i, frame in enumerate(self.frames):
-            if frame:
+            if frame and i in self.shared:
+                print(f"Frame {i}: shared by " + ", ".join(f"PID {pid} Page {page}" for pid, page in self.shared[i]))
+            elif frame:
                 print(f"Frame {i}: PID {frame[0]}, Page {frame[1]}")
+            elif self.in_kernel_zone(i):
+                print(f"Frame {i}: Kernel")
             else:
                 print(f"Frame {i}: Free")
 
     def visualize_fragmentation(self):
         """Show the number of free fragments and memory state."""
         print("\n[Memory Fragmentation]")
-        fragments = 0
-        in_fragment = False
-        for frame in self.frames:
-            if frame is None:
-                if not in_fragment:
-                    fragments += 1
-                    in_fragment = True
-            else:
-                in_fragment = False
-        print(f"Number of free fragments: {fragments}")
+        stats = self.allocator.fragmentation()
+        print(f"Number of free fragments: {stats['free_runs']}")
+        print(f"Free frames: {stats['free_frames']}/{self.num_frames}, largest free run: {stats['largest_free_run']} "
+              f"(external fragmentation {stats['external_fragmentation']:.0%})")
+        if self.kernel is not None:
+            self.show_kernel_memory()
         self.visualize_memory()
 
-    def swap_out(self):
-        """Swap a process out to simulated disk (free its frames)."""
-        pid = int(input("Enter PID to swap out: "))
+    def swap_out(self, pid=None):
+        """Swap a process out to disk: write its pages to swap and free its frames."""
+        if pid is None:
+            pid = int(input("Enter PID to swap out: "))
         if pid not in self.page_tables:
             print("No such process in memory.")
             return
-        self.swapped_out[pid] = self.page_tables.pop(pid)
-        # Free frames
-        for entry in self.swapped_out[pid]:
-            self.frames[entry.frame_number] = None
+        self.evict_process(pid)
         print(f"Process {pid} swapped out to disk.")
 
-    def swap_in(self):
-        """Swap a process in from simulated disk (allocate frames)."""
-        pid = int(input("Enter PID to swap in: "))
+    def evict_process(self, pid):
+        """Write all of a process's pages to swap, free its frames and drop its page table."""
+        table = self.page_tables.pop(pid)
+        self.huge_pages.pop(pid, None)  # Swapping in brings the pages back as base pages
+        self.tlb.flush(pid)
+        pages = array('q')
+        for page, frame in table.items():
+            pages.append(page)
+            self.page_out(pid, page, frame)
+            if self.drop_mapping(frame, pid, page):
+                self.allocator.free(frame)
+            self.replacement.remove((pid, page))
+        self.swapped_out[pid] = pages
+
+    def swap_in(self, pid=None):
+        """Swap a process in from disk: allocate frames and read its pages back from swap."""
+        if pid is None:
+            pid = int(input("Enter PID to swap in: "))
         if pid not in self.swapped_out:
             print("No such process on disk.")
             return
-        if len(self.page_tables) >= self.memory_constraints:
+        if self.reclaimer is None and len(self.page_tables) >= self.memory_constraints:
             print("Memory full! Cannot swap in.")
             return
-        # Try to allocate frames
-        for entry in self.swapped_out[pid]:
-            frame = self.find_free_frame()
-            if frame is not None:
-                self.frames[frame] = (pid, entry.page_number)
-                entry.frame_number = frame
-            else:
-                print("Not enough free frames to swap in.")
-                return
-        self.page_tables[pid] = self.swapped_out.pop(pid)
+        pages = self.swapped_out[pid]
+        frames = self.allocator.alloc_many(len(pages))
+        if frames is None and self.reclaimer is not None:
+            self.reclaimer.reclaim(len(pages), keep=pid)
+            frames = self.allocator.alloc_many(len(pages))
+        if frames is None:
+            print("Not enough free frames to swap in.")
+            return
+        table = self.new_page_table()
+        for page, frame in zip(pages, frames):
+            self.frames[frame] = (pid, page)
+            self.referenced[frame] = 1
+            self.page_in(pid, page, frame)
+            table.map(page, frame)
+            self.replacement.add((pid, page))
+        self.page_tables[pid] = table
+        del self.swapped_out[pid]
         print(f"Process {pid} swapped in from disk.")
+        if self.reclaimer is not None:
+            self.reclaimer.balance(keep=pid)
 
     def menu(self):
         """Main menu for memory management."""
@@ -129,7 +1013,28 @@ class MemoryManager:
             print("4. Visualize Fragmentation")
             print("5. Swap Out Process")
             print("6. Swap In Process")
-            print("7. Back")
+            print("7. Page Table Overhead")
+            print("8. Configure Page Tables")
+            print("9. TLB Statistics")
+            print("10. Configure TLB")
+            print("11. Configure Demand Paging")
+            print("12. Page Fault Statistics")
+            print("13. Compare Replacement Policies")
+            print("14. Write to Memory")
+            print("15. Read from Memory")
+            print("16. Swap Statistics")
+            print("17. Kernel Memory (Buddy/Slab)")
+            print("18. Compact Memory")
+            print("19. Configure Background Compaction")
+            print("20. Configure Reclaimer")
+            print("21. Reclaimer Statistics")
+            print("22. Fork Process (Copy-on-Write)")
+            print("23. Shared Memory Statistics")
+            print("24. Promote to Huge Pages")
+            print("25. Demote Huge Pages")
+            print("26. Huge Page Statistics")
+            print("27. Configure Huge Pages")
+            print("28. Back")
             choice = input("Enter choice: ")
             if choice == '1':
                 pid = int(input("Enter PID: "))
@@ -148,6 +1053,64 @@ class MemoryManager:
             elif choice == '6':
                 self.swap_in()
             elif choice == '7':
+                self.show_page_tables()
+            elif choice == '8':
+                self.configure_page_tables()
+            elif choice == '9':
+                self.show_tlb()
+            elif choice == '10':
+                self.configure_tlb()
+            elif choice == '11':
+                self.configure_demand_paging()
+            elif choice == '12':
+                self.show_page_faults()
+            elif choice == '13':
+                self.compare_replacement()
+            elif choice == '14':
+                pid = int(input("Enter PID: "))
+                vaddr = int(input("Enter virtual address: "))
+                text = input("Text to write: ")
+                if self.write_memory(pid, vaddr, text.encode()):
+                    print(f"Wrote {len(text.encode())} bytes.")
+                else:
+                    print("Invalid address range!")
+            elif choice == '15':
+                pid = int(input("Enter PID: "))
+                vaddr = int(input("Enter virtual address: "))
+                length = int(input("Number of bytes: "))
+                data = self.read_memory(pid, vaddr, length)
+                print("Invalid address range!" if data is None else f"Data: {data!r}")
+            elif choice == '16':
+                self.show_swap()
+            elif choice == '17':
+                self.kernel_menu()
+            elif choice == '18':
+                self.compact()
+            elif choice == '19':
+                self.configure_compaction()
+            elif choice == '20':
+                self.configure_reclaimer()
+            elif choice == '21':
+                self.show_reclaimer()
+            elif choice == '22':
+                parent = int(input("Enter parent PID: "))
+                child = int(input("Enter child PID: "))
+                self.fork(parent, child)
+            elif choice == '23':
+                self.show_sharing()
+            elif choice in ('24', '25'):
+                pid = int(input("Enter PID: "))
+                answer = input("Huge page number (blank = all): ")
+                number = int(answer) if answer else None
+                if choice == '24':
+                    self.promote_huge_pages(pid, number)
+                else:
+                    self.demote_huge_pages(pid, number)
+            elif choice == '26':
+                self.show_huge_pages()
+            elif choice == '27':
+                self.configure_huge_pages()
+            elif choice == '28':
                 break
             else:
                 print("Invalid choice.")
\ No newline at end of file
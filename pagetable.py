@@ -0,0 +1,269 @@
+"""
+pagetable.py
+------------
+Page tables for the Mini OS Simulation memory manager.
+FlatPageTable is one array indexed by page number. RadixPageTable splits the page number into one index per
+level, like a hardware page-table walk, so a sparse 32- or 48-bit address space only pays for the nodes it touches.
+Translation costs O(levels) either way. lookup_many translates a whole NumPy array of page numbers at once
+(NumPy is only needed for that). map_huge maps a huge page: in a radix table, a whole leaf's worth of pages on
+consecutive frames is held by one entry in the level above, like a 2 MiB page on x86-64.
+"""
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+UNMAPPED = -1
+PTE_SIZE = 8  # Bytes per page-table entry, for overhead figures
+
+def require_numpy():
+    """Raise a helpful error when NumPy is not installed."""
+    if np is None:
+        raise RuntimeError("Batch translation requires NumPy: pip install numpy")
+
+class FlatPageTable:
+    """Direct-indexed page table: entry i holds the frame of page i, or UNMAPPED. Grows to the highest page mapped."""
+    levels = 1
+
+    def __init__(self, page_bits=None):
+        self.page_bits = page_bits  # Bits of a page number (None = unbounded)
+        self.entries = array('q')
+        self.mapped = 0
+
+    def __len__(self):
+        return self.mapped
+
+    def in_range(self, page):
+        """Return whether a page number fits the address space."""
+        return 0 <= page and (self.page_bits is None or page >> self.page_bits == 0)
+
+    def lookup(self, page):
+        """Return the frame of a page, or UNMAPPED."""
+        entries = self.entries
+        return entries[page] if 0 <= page < len(entries) else UNMAPPED
+
+    def map(self, page, frame):
+        """Point a page at a frame."""
+        self.map_range(page, [frame])
+
+    def map_range(self, first_page, frames):
+        """Map consecutive pages from first_page to the given frames."""
+        if not frames:
+            return
+        last = first_page + len(frames) - 1
+        if not (self.in_range(first_page) and self.in_range(last)):
+            raise ValueError(f"Pages {first_page}-{last} are outside the address space")
+        entries = self.entries
+        if last >= len(entries):
+            entries.extend(array('q', [UNMAPPED]) * (last + 1 - len(entries)))
+        self.mapped += entries[first_page:last + 1].count(UNMAPPED)
+        entries[first_page:last + 1] = array('q', frames)
+
+    def map_huge(self, first_page, first_frame, count):
+        """Map count consecutive pages to consecutive frames (a flat table just fills the entries)."""
+        self.map_range(first_page, range(first_frame, first_frame + count))
+
+    def split_huge(self, page):
+        """Turn the huge mapping holding a page back into single entries (nothing to do in a flat table)."""
+
+    def lookup_many(self, pages):
+        """Return the frames of a NumPy int64 array of pages (UNMAPPED where unmapped), indexing the entries directly."""
+        require_numpy()
+        entries = np.frombuffer(self.entries, dtype=np.int64) if len(self.entries) else np.empty(0, np.int64)
+        frames = np.full(len(pages), UNMAPPED, dtype=np.int64)
+        inside = (pages >= 0) & (pages < len(entries))
+        frames[inside] = entries[pages[inside]]
+        return frames
+
+    def unmap(self, page):
+        """Unmap a page and return the frame it had, or UNMAPPED."""
+        frame = self.lookup(page)
+        if frame != UNMAPPED:
+            self.entries[page] = UNMAPPED
+            self.mapped -= 1
+        return frame
+
+    def items(self):
+        """Yield (page, frame) for every mapped page in page order."""
+        for page, frame in enumerate(self.entries):
+            if frame != UNMAPPED:
+                yield page, frame
+
+    def memory_bytes(self):
+        """Return the memory the table's entries take."""
+        return len(self.entries) * PTE_SIZE
+
+class RadixPageTable:
+    """Multi-level page table over page numbers of page_bits bits.
+
+    Interior nodes are lists of child nodes and leaves are arrays of frames; a node is created the first time a
+    page under it is mapped. A huge page is an int in place of a leaf: the first of the leaf's consecutive frames.
+    The leaf takes leaf_bits bits if given; the other levels split the rest evenly, and the top level takes any
+    bits left over.
+    """
+    def __init__(self, page_bits, levels=2, leaf_bits=None):
+        self.page_bits = page_bits
+        self.levels = levels
+        if leaf_bits is None:
+            bits = [page_bits // levels] * levels
+            bits[0] += page_bits % levels
+        else:
+            upper = page_bits - leaf_bits
+            bits = [upper // (levels - 1)] * (levels - 1) + [leaf_bits]
+            bits[0] += upper % (levels - 1)
+        self.leaf_bits = bits[-1]
+        self.leaf_mask = (1 << bits[-1]) - 1
+        self.interior = []  # (shift, mask, child fanout) per interior level, top first
+        shift = page_bits
+        for level in range(levels - 1):
+            shift -= bits[level]
+            self.interior.append((shift, (1 << bits[level]) - 1, 1 << bits[level + 1]))
+        self.node_bytes = 0
+        self.mapped = 0
+        self.root = self.new_node(1 << bits[0], levels == 1)
+
+    def new_node(self, fanout, leaf):
+        """Return an empty node: a leaf array of frames or an interior list of children."""
+        self.node_bytes += fanout * PTE_SIZE
+        return array('q', [UNMAPPED]) * fanout if leaf else [None] * fanout
+
+    def __len__(self):
+        return self.mapped
+
+    def lookup(self, page):
+        """Return the frame of a page, or UNMAPPED, walking one node per level."""
+        if page < 0 or page >> self.page_bits:
+            return UNMAPPED
+        node = self.root
+        for shift, mask, _ in self.interior:
+            node = node[(page >> shift) & mask]
+            if node is None:
+                return UNMAPPED
+        if node.__class__ is int:
+            return node + (page & self.leaf_mask)
+        return node[page & self.leaf_mask]
+
+    def find_leaf(self, page):
+        """Return the leaf holding a page's entry (the first frame for a huge page), or None if it was never created."""
+        node = self.root
+        for shift, mask, _ in self.interior:
+            node = node[(page >> shift) & mask]
+            if node is None:
+                return None
+        return node
+
+    def lookup_many(self, pages):
+        """Return the frames of a NumPy int64 array of pages (UNMAPPED where unmapped).
+
+        Walks the table once per distinct leaf the pages touch, then gathers every entry with one indexing step.
+        """
+        require_numpy()
+        frames = np.full(len(pages), UNMAPPED, dtype=np.int64)
+        inside = (pages >= 0) & (pages >> self.page_bits == 0)
+        pages = pages[inside]
+        leaf_ids, which = np.unique(pages >> self.leaf_bits, return_inverse=True)
+        leaves = np.full((len(leaf_ids), self.leaf_mask + 1), UNMAPPED, dtype=np.int64)
+        for i, leaf_id in enumerate(leaf_ids.tolist()):
+            leaf = self.find_leaf(leaf_id << self.leaf_bits)
+            if leaf.__class__ is int:
+                leaves[i] = np.arange(leaf, leaf + self.leaf_mask + 1, dtype=np.int64)
+            elif leaf is not None:
+                leaves[i] = np.frombuffer(leaf, dtype=np.int64)
+        frames[inside] = leaves[which.reshape(-1), pages & self.leaf_mask]
+        return frames
+
+    def leaf(self, page):
+        """Return the leaf holding a page's entry, creating nodes on the way and splitting a huge page."""
+        if page < 0 or page >> self.page_bits:
+            raise ValueError(f"Page {page} is outside the {self.page_bits}-bit address space")
+        node = self.root
+        last = len(self.interior) - 1
+        for level, (shift, mask, fanout) in enumerate(self.interior):
+            index = (page >> shift) & mask
+            child = node[index]
+            if child is None:
+                child = node[index] = self.new_node(fanout, level == last)
+            elif child.__class__ is int:
+                self.node_bytes += fanout * PTE_SIZE
+                child = node[index] = array('q', range(child, child + fanout))
+            node = child
+        return node
+
+    def map_huge(self, first_page, first_frame, count):
+        """Map count consecutive pages to consecutive frames; a whole aligned leaf becomes one huge entry."""
+        if count != self.leaf_mask + 1 or first_page & self.leaf_mask or not self.interior:
+            self.map_range(first_page, range(first_frame, first_frame + count))
+            return
+        if first_page < 0 or first_page >> self.page_bits:
+            raise ValueError(f"Page {first_page} is outside the {self.page_bits}-bit address space")
+        node = self.root
+        for level, (shift, mask, fanout) in enumerate(self.interior[:-1]):
+            index = (first_page >> shift) & mask
+            if node[index] is None:
+                node[index] = self.new_node(fanout, False)
+            node = node[index]
+        index = (first_page >> self.interior[-1][0]) & self.interior[-1][1]
+        old = node[index]
+        if old is None:
+            self.mapped += count
+        elif old.__class__ is not int:
+            self.mapped += old.count(UNMAPPED)
+            self.node_bytes -= len(old) * PTE_SIZE
+        node[index] = first_frame
+
+    def split_huge(self, page):
+        """Turn the huge mapping holding a page back into a leaf of single entries."""
+        if self.find_leaf(page).__class__ is int:
+            self.leaf(page)
+
+    def map(self, page, frame):
+        """Point a page at a frame."""
+        self.map_range(page, [frame])
+
+    def map_range(self, first_page, frames):
+        """Map consecutive pages from first_page to the given frames, one leaf slice at a time."""
+        done = 0
+        while done < len(frames):
+            page = first_page + done
+            leaf = self.leaf(page)
+            start = page & self.leaf_mask
+            count = min(len(frames) - done, len(leaf) - start)
+            self.mapped += leaf[start:start + count].count(UNMAPPED)
+            leaf[start:start + count] = array('q', frames[done:done + count])
+            done += count
+
+    def unmap(self, page):
+        """Unmap a page and return the frame it had, or UNMAPPED."""
+        frame = self.lookup(page)
+        if frame != UNMAPPED:
+            self.leaf(page)[page & self.leaf_mask] = UNMAPPED
+            self.mapped -= 1
+        return frame
+
+    def items(self):
+        """Yield (page, frame) for every mapped page in page order."""
+        def walk(node, level, base):
+            if node.__class__ is int:
+                for i in range(self.leaf_mask + 1):
+                    yield base | i, node + i
+                return
+            if level == len(self.interior):
+                for i, frame in enumerate(node):
+                    if frame != UNMAPPED:
+                        yield base | i, frame
+                return
+            shift = self.interior[level][0]
+            for i, child in enumerate(node):
+                if child is not None:
+                    yield from walk(child, level + 1, base | (i << shift))
+        yield from walk(self.root, 0, 0)
+
+    def memory_bytes(self):
+        """Return the memory the table's nodes take."""
+        return self.node_bytes
+
+def new_page_table(page_bits, levels=1, leaf_bits=None):
+    """Return an empty page table: direct-indexed for one level, radix for more."""
+    return FlatPageTable(page_bits) if levels == 1 else RadixPageTable(page_bits, levels, leaf_bits)
@@ -1,39 +1,82 @@
-import random
 import threading
-import time
+
+from energy import EnergyModel
+from proctable import ProcessTable
+from runqueue import NICE_0_WEIGHT, FairQueue, ReadyQueue, RunQueue, nice_weight
+from simulation import Simulation
 
 """
 process.py
 ----------
 Process management module for Mini OS Simulation.
-Supports process creation, scheduling (FIFO, RR, MLFQ, Power-aware), multi-core simulation, and process visualization.
+Supports process creation, scheduling (FIFO, RR, MLFQ, Power-aware, CFS), multi-core simulation, and process visualization.
 """
 
 class PCB:
     """Process Control Block: stores process metadata."""
-    def __init__(self, pid, name, power_profile):
+    __slots__ = ('pid', 'name', 'state', 'power_profile', 'arrival_time', 'burst_time', 'remaining_time',
+                 'io_interval', 'io_duration', 'io_progress', 'mlfq_level', 'mlfq_used', 'core', 'ready_since',
+                 'first_run_time', 'completion_time', 'cpu_time', 'wait_time', 'nice', 'vruntime', 'energy',
+                 'cache_mark')
+
+    def __init__(self, pid, name, power_profile, arrival_time=0, burst_time=None, io_interval=None, io_duration=0,
+                 nice=0):
         self.pid = pid
         self.name = name
         self.state = 'READY'
         self.power_profile = power_profile  # e.g., 'low', 'medium', 'high'
+        self.arrival_time = arrival_time
+        self.burst_time = burst_time  # Total CPU time needed; None runs until terminated
+        self.remaining_time = burst_time
+        self.io_interval = io_interval  # CPU time between I/O requests; None never blocks
+        self.io_duration = io_duration
+        self.io_progress = 0  # CPU time since the last I/O request
+        self.mlfq_level = 0
+        self.mlfq_used = 0  # CPU time used at the current MLFQ level, charged against its allotment
+        self.core = None  # Core the process last ran on
+        self.cache_mark = 0  # That core's busy time when the process left it; later busy time cools its cache
+        self.nice = min(max(nice, -20), 19)  # -20 (highest priority) to 19, clamped; sets the CFS weight
+        self.vruntime = 0  # CPU time scaled by 1024 / weight, the CFS ordering key
+        # Scheduling metrics, updated by the simulation at each state transition
+        self.ready_since = arrival_time
+        self.first_run_time = None
+        self.completion_time = None
+        self.cpu_time = 0
+        self.wait_time = 0
+        self.energy = 0  # Joules spent running this process
 
 class ProcessManager:
     """Manages processes, scheduling, and multi-core simulation."""
-    def __init__(self):
-        self.processes = []
+    def __init__(self, compact=False):
+        # pid -> PCB; the compact table stores processes as array columns for very large simulations
+        self.processes = ProcessTable() if compact else {}
         self.pid_counter = 1
-        self.ready_queue = []
+        self.ready_queue = ReadyQueue()
         self.running = None
         self.scheduler_type = 'FIFO'  # Default scheduler
         self.time_quantum = 2  # For Round Robin
-        self.rr_counter = 0
-        self.mlfq_queues = [[], [], []]  # 3-level MLFQ
-        self.mlfq_quantums = [1, 2, 4]
-        self.mlfq_running_level = 0
+        self.mlfq_quantums = [1, 2, 4]  # One time slice per MLFQ level, highest priority first
+        self.mlfq_allotments = None  # CPU time a process may use at each level before demotion (None = one quantum)
+        self.mlfq_boost_interval = 50  # Time between moves of every process back to the top level (None = never)
+        self.mlfq_queue = RunQueue(len(self.mlfq_quantums))
+        self.mlfq_elapsed = 0  # Quantums handed out by mlfq_schedule since the last boost
+        self.starvation_threshold = 100  # A single wait for the CPU longer than this counts as starvation
+        self.energy_model = EnergyModel()  # P-states, process power draw and battery for the power-aware scheduler
+        self.battery_energy = self.energy_model.battery_capacity  # Joules left for interactive scheduling
+        self.context_switch_cost = 0  # Time lost on a core each time it switches to a different process
+        self.cache_refill_cost = 0  # Time lost refilling a fully cold cache (always paid after a migration)
+        self.cache_window = 10  # CPU time of other processes on a core that fully evicts a process's cache
+        self.migration_threshold = 1  # Queue length a process must leave behind before it is moved off its core
+        self.cfs_queue = FairQueue()  # Completely Fair Scheduler, ordered by vruntime
+        self.cfs_latency = 6  # CFS: time in which every runnable process on a core should get a turn
+        self.cfs_min_granularity = 0.75  # CFS: shortest slice, however many processes share the core
         self.num_cores = 1
+        self.balance_interval = 10  # Virtual time between load-balancing passes across cores
         self.core_threads = []
         self.core_running = [None]
         self.stop_cores = False
+        self.simulation = None
+        self.memory_manager = None  # Told about context switches so it can switch or flush the TLB
 
     def set_scheduler(self):
         """Allow user to select the scheduling algorithm."""
@@ -42,6 +85,7 @@ class ProcessManager:
         print("2. Round Robin")
         print("3. Multi-Level Feedback Queue (MLFQ)")
         print("4. Power-aware")
+        print("5. Completely Fair Scheduler (CFS)")
         choice = input("Select scheduler: ")
         if choice == '1':
             self.scheduler_type = 'FIFO'
@@ -51,6 +95,8 @@ class ProcessManager:
             self.scheduler_type = 'MLFQ'
         elif choice == '4':
             self.scheduler_type = 'POWER'
+        elif choice == '5':
+            self.scheduler_type = 'CFS'
         else:
             print("Invalid choice. Keeping previous scheduler.")
         print(f"Scheduler set to {self.scheduler_type}.")
@@ -60,22 +106,50 @@ class ProcessManager:
         name = input("Enter app name: ")
         power_profile = input("Power profile (low/medium/high): ")
         pcb = PCB(self.pid_counter, name, power_profile)
-        self.processes.append(pcb)
-        if self.scheduler_type == 'MLFQ':
-            self.mlfq_queues[0].append(pcb)
+        self.processes[pcb.pid] = pcb
+        pcb = self.processes[pcb.pid]
+        if self.core_threads:
+            self.simulation.submit(pcb)
         else:
-            self.ready_queue.append(pcb)
+            self.enqueue(pcb)
         self.pid_counter += 1
         print(f"Process {pcb.name} (PID {pcb.pid}) created.")
 
-    def terminate_process(self):
-        """Terminate the currently running process."""
-        if not self.running:
-            print("No process is currently running.")
+    def terminate_process(self, pid=None):
+        """Terminate the currently running process, or any process by PID."""
+        if pid is None:
+            if not self.running:
+                print("No process is currently running.")
+                return
+            pid = self.running.pid
+        pcb = self.processes.get(pid)
+        if pcb is None:
+            print(f"No process with PID {pid}.")
             return
-        print(f"Terminating process {self.running.name} (PID {self.running.pid})...")
-        self.processes.remove(self.running)
-        self.running = None
+        print(f"Terminating process {pcb.name} (PID {pcb.pid})...")
+        pcb.state = 'TERMINATED'
+        del self.processes[pid]
+        for queue in self.queues():
+            queue.remove(pid)
+        if self.running is not None and self.running.pid == pid:
+            self.running = None
+
+    def queues(self):
+        """Return every ready queue."""
+        return [self.ready_queue, self.cfs_queue, self.mlfq_queue]
+
+    def enqueue(self, pcb):
+        """Put a process in the ready queue of the current scheduler."""
+        if self.scheduler_type == 'MLFQ':
+            self.mlfq_queue.append(pcb, pcb.mlfq_level)
+        elif self.scheduler_type == 'CFS':
+            self.cfs_queue.append(pcb)
+        else:
+            self.ready_queue.append(pcb)
+
+    def is_queued(self, pid):
+        """Return True if a process is waiting in any ready queue."""
+        return any(pid in queue for queue in self.queues())
 
     def schedule(self):
         """Schedule the next process based on the selected algorithm."""
@@ -87,6 +161,8 @@ class ProcessManager:
             self.mlfq_schedule()
         elif self.scheduler_type == 'POWER':
             self.power_aware_schedule()
+        elif self.scheduler_type == 'CFS':
+            self.cfs_schedule()
         else:
             self.fifo_schedule()
 
@@ -96,7 +172,7 @@ class ProcessManager:
             print("No processes in ready queue.")
             self.running = None
             return
-        self.running = self.ready_queue.pop(0)
+        self.running = self.ready_queue.popleft()
         self.running.state = 'RUNNING'
         print(f"[FIFO] Running process: {self.running.name} (PID {self.running.pid})")
 
@@ -106,73 +182,99 @@ class ProcessManager:
             print("No processes in ready queue.")
             self.running = None
             return
-        if self.rr_counter >= len(self.ready_queue):
-            self.rr_counter = 0
-        self.running = self.ready_queue.pop(self.rr_counter)
+        self.running = self.ready_queue.popleft()
         self.running.state = 'RUNNING'
         print(f"[Round Robin] Running process: {self.running.name} (PID {self.running.pid})")
         # After time quantum, put it back if not terminated
         self.ready_queue.append(self.running)
 
+    def mlfq_allotment(self, level):
+        """Return the CPU time a process may use at an MLFQ level before it is demoted."""
+        return self.mlfq_allotments[level] if self.mlfq_allotments else self.mlfq_quantums[level]
+
     def mlfq_schedule(self):
         """Multi-Level Feedback Queue scheduling."""
-        for level, queue in enumerate(self.mlfq_queues):
-            if queue:
-                self.running = queue.pop(0)
-                self.running.state = 'RUNNING'
-                self.mlfq_running_level = level
-                print(f"[MLFQ] Running process: {self.running.name} (PID {self.running.pid}) at level {level}")
-                # Demote process if not finished
-                if level < 2:
-                    self.mlfq_queues[level+1].append(self.running)
-                else:
-                    self.mlfq_queues[level].append(self.running)
-                return
-        print("No processes in MLFQ queues.")
-        self.running = None
+        self.running = self.mlfq_queue.popleft()
+        if self.running is None:
+            print("No processes in MLFQ queues.")
+            return
+        level = self.running.mlfq_level
+        self.running.state = 'RUNNING'
+        print(f"[MLFQ] Running process: {self.running.name} (PID {self.running.pid}) at level {level}")
+        # Charge one quantum against the level's allotment; demote once it is used up
+        quantum = self.mlfq_quantums[level]
+        self.running.mlfq_used += quantum
+        if self.running.mlfq_used >= self.mlfq_allotment(level):
+            self.running.mlfq_used = 0
+            self.running.mlfq_level = min(level + 1, len(self.mlfq_quantums) - 1)
+        self.mlfq_queue.append(self.running, self.running.mlfq_level)
+        self.mlfq_elapsed += quantum
+        if self.mlfq_boost_interval and self.mlfq_elapsed >= self.mlfq_boost_interval:
+            self.mlfq_elapsed = 0
+            print(f"[MLFQ] Priority boost: {self.mlfq_queue.boost()} processes moved to level 0")
+
+    def cfs_schedule(self):
+        """Completely Fair scheduling: run the process with the smallest virtual runtime."""
+        if not self.cfs_queue:
+            print("No processes in ready queue.")
+            self.running = None
+            return
+        self.running = self.cfs_queue.popleft()
+        self.running.state = 'RUNNING'
+        print(f"[CFS] Running process: {self.running.name} (PID {self.running.pid}), "
+              f"nice {self.running.nice}, vruntime {self.running.vruntime:g}")
+        # Charge one time quantum, scaled by the process weight, and put it back
+        self.running.vruntime += self.time_quantum * NICE_0_WEIGHT / nice_weight(self.running.nice)
+        self.cfs_queue.append(self.running)
 
     def power_aware_schedule(self):
-        """Power-aware scheduling: prefers low-power processes if battery is low."""
+        """Power-aware scheduling: prefers low-power processes and slower P-states when the battery is low."""
         if not self.ready_queue:
             print("No processes in ready queue.")
             self.running = None
             return
-        battery_level = random.randint(1, 100)
-        print(f"[Power-aware] Simulated battery level: {battery_level}%")
-        if battery_level < 30:
-            low_power = [p for p in self.ready_queue if p.power_profile == 'low']
-            if low_power:
-                self.running = low_power[0]
-                self.ready_queue.remove(self.running)
-            else:
-                self.running = self.ready_queue.pop(0)
-        else:
-            self.running = self.ready_queue.pop(0)
+        model = self.energy_model
+        battery_level = self.battery_energy / model.battery_capacity
+        print(f"[Power-aware] Battery level: {battery_level:.1%}")
+        self.running = None
+        if battery_level < model.low_battery:
+            self.running = self.ready_queue.popleft('low')
+        if self.running is None:
+            self.running = self.ready_queue.popleft()
         self.running.state = 'RUNNING'
-        print(f"[Power-aware] Running process: {self.running.name} (PID {self.running.pid})")
+        # Pick the core frequency and charge one time quantum of the process's power draw to the battery
+        state = model.pick_state(battery_level, len(self.ready_queue))
+        energy = model.active_power(self.running.power_profile, state) * self.time_quantum
+        self.running.energy += energy
+        self.battery_energy = max(self.battery_energy - energy, 0)
+        print(f"[Power-aware] Running process: {self.running.name} (PID {self.running.pid}) "
+              f"at {model.frequency(state):g}x frequency, {energy:.3g} J")
 
     def switch_process(self):
         """Switch to the next process."""
         if self.running:
             self.running.state = 'READY'
-            if self.scheduler_type == 'MLFQ':
-                self.mlfq_queues[self.mlfq_running_level].append(self.running)
-            else:
-                self.ready_queue.append(self.running)
+            # RR, MLFQ and CFS requeue the running process when they dispatch it
+            if not self.is_queued(self.running.pid):
+                self.enqueue(self.running)
         self.schedule()
+        if self.memory_manager is not None and self.running is not None:
+            self.memory_manager.context_switch(self.running.pid)
 
     def list_processes(self):
         """List all processes and their states."""
         print("\n[Process Table]")
-        for p in self.processes:
+        for p in self.processes.values():
             print(f"PID: {p.pid}, Name: {p.name}, State: {p.state}, Power: {p.power_profile}")
 
     def visualize_queues(self):
         """Visualize the current process queues and running process."""
         print("\n[Process Queues Visualization]")
         if self.scheduler_type == 'MLFQ':
-            for i, queue in enumerate(self.mlfq_queues):
+            for i, queue in enumerate(self.mlfq_queue.levels):
                 print(f"MLFQ Level {i}: {[p.pid for p in queue]}")
+        elif self.scheduler_type == 'CFS':
+            print(f"CFS Queue (by vruntime): {[(p.pid, round(p.vruntime, 2)) for p in self.cfs_queue]}")
         else:
             print(f"Ready Queue: {[p.pid for p in self.ready_queue]}")
         if self.running:
@@ -190,49 +292,109 @@ class ProcessManager:
         self.core_running = [None] * n
         print(f"Number of CPU cores set to {n}.")
 
-    def core_worker(self, core_id):
-        """Thread worker for each simulated CPU core."""
-        while not self.stop_cores:
-            if self.scheduler_type == 'MLFQ':
-                for level, queue in enumerate(self.mlfq_queues):
-                    if queue:
-                        proc = queue.pop(0)
-                        proc.state = 'RUNNING'
-                        self.core_running[core_id] = proc
-                        print(f"[Core {core_id}] Running PID {proc.pid} ({proc.name}) at MLFQ level {level}")
-                        time.sleep(1)
-                        proc.state = 'READY'
-                        if level < 2:
-                            self.mlfq_queues[level+1].append(proc)
-                        else:
-                            self.mlfq_queues[level].append(proc)
-                        break
-                else:
-                    self.core_running[core_id] = None
-            else:
-                if self.ready_queue:
-                    proc = self.ready_queue.pop(0)
-                    proc.state = 'RUNNING'
-                    self.core_running[core_id] = proc
-                    print(f"[Core {core_id}] Running PID {proc.pid} ({proc.name})")
-                    time.sleep(1)
-                    proc.state = 'READY'
-                    self.ready_queue.append(proc)
-                else:
-                    self.core_running[core_id] = None
-            time.sleep(0.1)
+    def configure_mlfq(self):
+        """Set the MLFQ levels (one quantum each), their allotments and the priority boost interval."""
+        try:
+            quantums = [float(q) for q in input("Quantum per level, highest priority first (e.g. 1,2,4,8): ").split(',')]
+            allotments = input("Allotment per level (blank = one quantum each): ").strip()
+            allotments = [float(a) for a in allotments.split(',')] if allotments else None
+            boost = input("Priority boost interval (blank = never): ").strip()
+            boost = float(boost) if boost else None
+        except ValueError:
+            print("Invalid number.")
+            return
+        if not quantums or min(quantums) <= 0 or (allotments and len(allotments) != len(quantums)):
+            print("Need a positive quantum per level and, if given, one allotment per level.")
+            return
+        queued = list(self.mlfq_queue)
+        self.mlfq_quantums = quantums
+        self.mlfq_allotments = allotments
+        self.mlfq_boost_interval = boost
+        self.mlfq_queue = RunQueue(len(quantums))
+        for pcb in queued:
+            pcb.mlfq_level = min(pcb.mlfq_level, len(quantums) - 1)
+            self.mlfq_queue.append(pcb, pcb.mlfq_level)
+        print(f"MLFQ set to {len(quantums)} levels, quantums {', '.join(f'{q:g}' for q in quantums)}, "
+              f"boost every {f'{boost:g}' if boost else 'never'}.")
+
+    def simulate(self, workload, until=None, seed=None, keep_records=True):
+        """Run a workload (PCBs sorted by arrival time) on the virtual clock and return the simulation."""
+        self.simulation = Simulation(self, seed=seed, keep_records=keep_records)
+        self.simulation.load(workload)
+        self.simulation.run(until)
+        return self.simulation
+
+    def replay_trace(self):
+        """Replay a CSV/JSONL workload trace file on the virtual clock and show the report."""
+        from workload import read_trace
+        path = input("Trace file (.csv/.jsonl, optionally .gz): ")
+        try:
+            self.simulate(read_trace(path), keep_records=False)
+        except (OSError, ValueError) as e:
+            print(f"Cannot replay trace: {e}")
+            return
+        self.show_report()
+
+    def report(self, per_process=False):
+        """Return the last simulation's aggregate, per-core, per-MLFQ-level and (optionally) per-process statistics."""
+        if not self.simulation:
+            return None
+        report = {'summary': self.simulation.summary(), 'cores': self.simulation.core_stats()}
+        if self.simulation.scheduler_type == 'MLFQ':
+            report['levels'] = self.simulation.level_stats()
+        if per_process:
+            report['processes'] = self.simulation.process_stats()
+        return report
+
+    def show_report(self):
+        """Print turnaround, waiting and response times, throughput and core utilization."""
+        print("\n[Scheduler Report]")
+        report = self.report()
+        if report is None:
+            print("No simulation has run yet. Start the CPU cores or call simulate().")
+            return
+        s = report['summary']
+        print(f"Scheduler: {s['scheduler']}, Cores: {s['cores']}, Time: {s['clock']:g}, Completed: {s['completed']}")
+        print(f"Throughput: {s['throughput']:.4g}/unit, Context switches: {s['context_switches']}")
+        for name in ('turnaround', 'waiting', 'response'):
+            print(f"{name.capitalize()}: mean {s[name + '_mean']:.4g}, p50 {s[name + '_p50']:.4g}, "
+                  f"p95 {s[name + '_p95']:.4g}, p99 {s[name + '_p99']:.4g}")
+        print(f"Fairness (Jain, weighted CPU share): {s['fairness']:.4f}")
+        if s['interactive_completed']:
+            print(f"Interactive waiting ({s['interactive_completed']} processes): mean {s['interactive_waiting_mean']:.4g}, "
+                  f"p95 {s['interactive_waiting_p95']:.4g}, p99 {s['interactive_waiting_p99']:.4g}")
+        print(f"Longest wait for a core: {s['max_ready_wait']:.4g}, "
+              f"waits over {self.simulation.starvation_threshold:g}: {s['starved_dispatches']}")
+        for level in report.get('levels', []):
+            print(f"MLFQ level {level['level']} (quantum {level['quantum']:g}, allotment {level['allotment']:g}): "
+                  f"{level['dispatches']} dispatches, {level['cpu_time']:.4g} CPU time")
+        if s['boosts']:
+            print(f"Priority boosts: {s['boosts']}")
+        print(f"Energy: {s['energy']:.4g} J ({s['idle_energy']:.4g} J idle), {s['energy_per_job']:.4g} J/job, "
+              f"average power {s['avg_power']:.4g} W, {s['jobs_per_joule']:.4g} jobs/J, "
+              f"mean frequency {s['mean_frequency']:.3g}x, battery {s['battery_level']:.1%}")
+        print(f"Overhead: {s['switch_overhead']:.4g} switching, {s['cache_overhead']:.4g} cache refill "
+              f"({s['overhead_fraction']:.1%} of busy time), {s['migrations']} migrations, "
+              f"effective utilization {s['effective_utilization']:.1%}")
+        for core in report['cores']:
+            print(f"Core {core['core']}: {core['utilization']:.1%} busy, {core['energy']:.4g} J")
 
     def start_cores(self):
-        """Start all CPU core threads."""
+        """Start the CPU cores: the simulation engine paced at one second per time unit."""
         if self.core_threads:
             print("Cores already running.")
             return
         self.stop_cores = False
-        self.core_threads = []
-        for i in range(self.num_cores):
-            t = threading.Thread(target=self.core_worker, args=(i,), daemon=True)
-            self.core_threads.append(t)
-            t.start()
+        self.simulation = Simulation(self, pacing=1.0, verbose=True)
+        ready = [p for queue in self.queues() for p in queue]
+        for queue in self.queues():
+            queue.clear()
+        for pcb in ready:
+            self.simulation.submit(pcb)
+        self.core_running = self.simulation.core_running
+        t = threading.Thread(target=self.simulation.run_paced, args=(lambda: self.stop_cores,), daemon=True)
+        self.core_threads = [t]
+        t.start()
         print(f"Started {self.num_cores} CPU cores.")
 
     def stop_cores_func(self):
@@ -240,7 +402,11 @@ class ProcessManager:
         self.stop_cores = True
         for t in self.core_threads:
             t.join(timeout=1)
+        if self.core_threads:
+            for pcb in self.simulation.drain():
+                self.enqueue(pcb)
         self.core_threads = []
+        self.core_running = [None] * self.num_cores
         print("Stopped all CPU cores.")
 
     def show_cores(self):
@@ -251,9 +417,14 @@ class ProcessManager:
                 print(f"Core {i}: Running PID {proc.pid} ({proc.name})")
             else:
                 print(f"Core {i}: Idle")
+        if self.simulation:
+            for stats in self.simulation.core_stats():
+                print(f"Core {stats['core']}: {stats['queued']} queued, {stats['dispatches']} dispatches, "
+                      f"{stats['steals']} steals, {stats['migrations_in']} migrations in, {stats['migrations_out']} out")
 
     def menu(self, memory_manager):
         """Main menu for process management."""
+        self.memory_manager = memory_manager
         while True:
             print("\n[Process Management]")
             print("1. Create Process")
@@ -266,7 +437,10 @@ class ProcessManager:
             print("8. Start CPU Cores")
             print("9. Stop CPU Cores")
             print("10. Show Core Status")
-            print("11. Back")
+            print("11. Scheduler Report")
+            print("12. Replay Workload Trace")
+            print("13. Configure MLFQ")
+            print("14. Back")
             choice = input("Enter choice: ")
             if choice == '1':
                 self.create_process()
@@ -289,6 +463,12 @@ class ProcessManager:
             elif choice == '10':
                 self.show_cores()
             elif choice == '11':
+                self.show_report()
+            elif choice == '12':
+                self.replay_trace()
+            elif choice == '13':
+                self.configure_mlfq()
+            elif choice == '14':
                 self.stop_cores_func()
                 break
             else:
@@ -0,0 +1,204 @@
+"""
+proctable.py
+------------
+Compact struct-of-arrays process table for Mini OS Simulation.
+Stores every process as one row across typed array columns instead of one Python object per process.
+
+Per-process footprint (64-bit CPython) of the columns, as ProcessTable.bytes_per_process() reports it:
+    15 float64 timing columns  120 bytes
+    pid (int64)                  8 bytes
+    state, power profile,        9 bytes  (int8 codes and nice, int32 MLFQ level, int16 core)
+    MLFQ level, nice, core
+    name reference               8 bytes  (the name string itself is shared or stored separately)
+    pid -> row index             8 bytes  (PIDs far from the rest go in a dict instead)
+    total                      153 bytes
+
+Measured by python3 -m benchmarks.bench_proctable, which also counts array over-allocation and the float objects
+PCBs hold, in bytes per process:
+                         10k processes  200k processes
+    PCB with __dict__              302             324
+    PCB with __slots__             238             260
+    ProcessTable                   161             164
+"""
+import math
+from array import array
+from collections.abc import MutableMapping
+
+STATES = ['READY', 'RUNNING', 'BLOCKED', 'TERMINATED']
+STATE_CODES = {state: code for code, state in enumerate(STATES)}
+
+# Timing columns; the nullable ones store None as NaN
+FLOAT_COLUMNS = ['arrival_time', 'burst_time', 'remaining_time', 'io_interval', 'io_duration', 'io_progress',
+                 'ready_since', 'first_run_time', 'completion_time', 'cpu_time', 'wait_time', 'vruntime',
+                 'mlfq_used', 'energy', 'cache_mark']
+NULLABLE = {'burst_time', 'remaining_time', 'io_interval', 'first_run_time', 'completion_time'}
+# Small integer columns: attribute -> array typecode
+INT_COLUMNS = {'pid': 'q', 'mlfq_level': 'i', 'nice': 'b', 'core': 'h'}  # nice is clamped to -20..19 by PCB
+DENSE_SLACK = 1024  # PIDs up to this far past twice the row count are indexed by row_of; the rest by a dict
+NAN = float('nan')
+
+class ProcessRecord:
+    """A view of one process-table row that reads and writes like a PCB."""
+    __slots__ = ('table', 'row')
+
+    def __init__(self, table, row):
+        self.table = table
+        self.row = row
+
+    def __repr__(self):
+        return f"ProcessRecord(pid={self.pid}, name={self.name!r}, state={self.state})"
+
+def float_column(name):
+    """Property for a timing column."""
+    if name in NULLABLE:
+        def get(self):
+            value = self.table.columns[name][self.row]
+            return None if math.isnan(value) else value
+        def set(self, value):
+            self.table.columns[name][self.row] = NAN if value is None else value
+    else:
+        def get(self):
+            return self.table.columns[name][self.row]
+        def set(self, value):
+            self.table.columns[name][self.row] = value
+    return property(get, set)
+
+def int_column(name):
+    """Property for an integer column; core uses -1 for None."""
+    def get(self):
+        value = self.table.columns[name][self.row]
+        return None if name == 'core' and value < 0 else value
+    def set(self, value):
+        self.table.columns[name][self.row] = -1 if value is None else value
+    return property(get, set)
+
+for _name in FLOAT_COLUMNS:
+    setattr(ProcessRecord, _name, float_column(_name))
+for _name in INT_COLUMNS:
+    setattr(ProcessRecord, _name, int_column(_name))
+ProcessRecord.state = property(lambda self: STATES[self.table.states[self.row]],
+                               lambda self, value: self.table.states.__setitem__(self.row, STATE_CODES[value]))
+ProcessRecord.power_profile = property(lambda self: self.table.profiles[self.table.profile_codes[self.row]],
+                                       lambda self, value: self.table.profile_codes.__setitem__(self.row, self.table.profile_code(value)))
+ProcessRecord.name = property(lambda self: self.table.names[self.row],
+                              lambda self, value: self.table.names.__setitem__(self.row, value))
+
+class ProcessTable(MutableMapping):
+    """pid -> process mapping backed by array columns; drop-in replacement for ProcessManager.processes.
+
+    Rows freed by finished processes are reused. Values are ProcessRecord views, so hold on to the
+    view a table returns rather than the PCB that was stored.
+    """
+    def __init__(self):
+        self.columns = {name: array('d') for name in FLOAT_COLUMNS}
+        self.columns.update({name: array(code) for name, code in INT_COLUMNS.items()})
+        self.states = array('b')
+        self.profile_codes = array('b')
+        self.names = []
+        self.profiles = []  # Power profile names by code
+        self.profile_index = {}
+        self.row_of = array('q')  # pid -> row, -1 when absent, for PIDs below its length
+        self.sparse = {}  # pid -> row for negative PIDs and PIDs too far past the others to index densely
+        self.free_rows = array('q')
+        self.size = 0
+
+    def profile_code(self, profile):
+        """Return the code of a power profile, registering new profiles."""
+        code = self.profile_index.get(profile)
+        if code is None:
+            code = self.profile_index[profile] = len(self.profiles)
+            self.profiles.append(profile)
+        return code
+
+    def row(self, pid):
+        """Return the row of a PID, or -1."""
+        if 0 <= pid < len(self.row_of):
+            return self.row_of[pid]
+        return self.sparse.get(pid, -1)
+
+    def index(self, pid, row):
+        """Record the row of a PID that has none."""
+        row_of = self.row_of
+        if 0 <= pid < len(row_of):
+            row_of[pid] = row
+        elif 0 <= pid < 2 * len(self.names) + DENSE_SLACK:
+            # Grow geometrically so dense PIDs cost O(1) amortized; a stray huge PID goes to the dict instead
+            row_of.extend(array('q', [-1]) * max(pid + 1 - len(row_of), len(row_of)))
+            row_of[pid] = row
+        else:
+            self.sparse[pid] = row
+
+    def reindex(self):
+        """Rebuild the PID index from the pid column, skipping free rows."""
+        self.row_of = array('q')
+        self.sparse = {}
+        free = set(self.free_rows)
+        for row, pid in enumerate(self.columns['pid']):
+            if row not in free:
+                self.index(pid, row)
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        for pid in range(len(self.row_of)):
+            if self.row_of[pid] >= 0:
+                yield pid
+        yield from list(self.sparse)
+
+    def __getitem__(self, pid):
+        row = self.row(pid)
+        if row < 0:
+            raise KeyError(pid)
+        return ProcessRecord(self, row)
+
+    def __setitem__(self, pid, pcb):
+        """Copy a PCB (or another table's record) into a row."""
+        if isinstance(pcb, ProcessRecord) and pcb.table is self and self.row(pid) == pcb.row:
+            return
+        row = self.row(pid)
+        if row < 0:
+            if self.free_rows:
+                row = self.free_rows.pop()
+            else:
+                row = len(self.names)
+                for column in self.columns.values():
+                    column.append(0)
+                self.states.append(0)
+                self.profile_codes.append(0)
+                self.names.append(None)
+            self.index(pid, row)
+            self.size += 1
+        columns = self.columns
+        for name in FLOAT_COLUMNS:
+            value = getattr(pcb, name)
+            columns[name][row] = NAN if value is None else value
+        columns['pid'][row] = pid
+        columns['mlfq_level'][row] = pcb.mlfq_level
+        columns['nice'][row] = pcb.nice
+        columns['core'][row] = -1 if pcb.core is None else pcb.core
+        self.states[row] = STATE_CODES[pcb.state]
+        self.profile_codes[row] = self.profile_code(pcb.power_profile)
+        self.names[row] = pcb.name
+
+    def __delitem__(self, pid):
+        row = self.row(pid)
+        if row < 0:
+            raise KeyError(pid)
+        if 0 <= pid < len(self.row_of):
+            self.row_of[pid] = -1
+        else:
+            del self.sparse[pid]
+        self.names[row] = None
+        self.free_rows.append(row)
+        self.size -= 1
+
+    def bytes_per_process(self):
+        """Bytes of column storage per row, plus the pid index and name reference."""
+        row = sum(column.itemsize for column in self.columns.values())
+        return row + self.states.itemsize + self.profile_codes.itemsize + 8 + self.row_of.itemsize
+
+    def nbytes(self):
+        """Total bytes held by the columns and the pid index, excluding name strings."""
+        arrays = list(self.columns.values()) + [self.states, self.profile_codes, self.row_of]
+        return sum(a.itemsize * len(a) for a in arrays) + 8 * len(self.names) + 8 * len(self.free_rows)
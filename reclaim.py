@@ -0,0 +1,140 @@
+"""
+reclaim.py
+----------
+Background page reclaimer (in the style of kswapd) for the Mini OS Simulation memory manager.
+Every access sets the referenced bit of its frame. Periodic scans turn the bits into ages, giving each process a
+working-set estimate (its pages referenced within the last few scans) and a page-fault rate. When free frames drop
+below the low watermark, the reclaimer wakes and frees frames up to the high watermark. It first evicts cold
+pages, those outside every working set. If the working sets themselves do not fit, memory is thrashing, and whole
+processes are swapped out instead, largest first. Past the manager's memory_constraints, swapping out a whole
+process is allowed even without thrashing, so the process cap becomes a soft limit.
+"""
+
+class Reclaimer:
+    """Watermark-driven reclaimer for a MemoryManager, with working-set and fault-rate tracking per process."""
+    def __init__(self, mm, low=None, high=None, window=4, interval=None, thrash_rate=0.5):
+        self.mm = mm
+        self.low = max(1, mm.num_frames // 16) if low is None else low  # Wake when fewer frames are free
+        self.high = max(self.low + 1, mm.num_frames // 8) if high is None else high  # Reclaim up to this many
+        self.window = window  # Scans a page stays in its process's working set after its last reference
+        self.interval = interval or max(mm.num_frames, 64)  # Accesses between working-set scans
+        self.thrash_rate = thrash_rate  # Faults per access above which a process counts as thrashing
+        self.age = bytearray(mm.num_frames)  # Scans since each frame's page was last referenced
+        self.hand = 0  # Where the next cold-page sweep starts
+        self.accesses = 0  # Accesses since the last scan
+        self.counts = {}  # pid -> [accesses, page faults] since the last scan
+        self.fault_rate = {}  # pid -> page faults per access over the last scan interval
+        self.working_set = {}  # pid -> pages referenced within the window
+        self.scans = 0
+        self.wakeups = 0
+        self.pages_reclaimed = 0
+        self.processes_swapped = 0
+
+    def record(self, pid, fault):
+        """Count one access of a process (and whether it faulted); scan every interval accesses."""
+        counts = self.counts.get(pid)
+        if counts is None:
+            counts = self.counts[pid] = [0, 0]
+        counts[0] += 1
+        counts[1] += fault
+        self.accesses += 1
+        if self.accesses >= self.interval:
+            self.scan()
+
+    def scan(self):
+        """Age every resident page from its referenced bit and recompute working sets and fault rates."""
+        referenced, age, window, shared = self.mm.referenced, self.age, self.window, self.mm.shared
+        working_set = {}
+        for frame, entry in enumerate(self.mm.frames):
+            if entry is None:
+                continue
+            if referenced[frame]:
+                referenced[frame] = 0
+                age[frame] = 0
+            elif age[frame] < 255:
+                age[frame] += 1
+            if age[frame] < window:
+                for pid, _ in shared.get(frame, (entry,)):  # A shared frame is in each sharer's working set
+                    working_set[pid] = working_set.get(pid, 0) + 1
+        self.working_set = working_set
+        self.fault_rate = {pid: faults / accesses for pid, (accesses, faults) in self.counts.items() if accesses}
+        self.counts = {}
+        self.accesses = 0
+        self.scans += 1
+
+    def is_cold(self, frame):
+        return not self.mm.referenced[frame] and self.age[frame] >= self.window
+
+    def thrashing(self):
+        """Return whether the working sets of the processes in memory need more frames than there are."""
+        resident = self.mm.page_tables
+        needed = sum(size for pid, size in self.working_set.items() if pid in resident)
+        return needed > self.mm.num_frames - self.low
+
+    def balance(self, keep=None):
+        """Wake up if free frames are below the low watermark and reclaim up to the high one; return frames freed.
+
+        The running process and keep (a process being loaded) are never swapped out whole.
+        """
+        if self.mm.allocator.free_count >= self.low:
+            return 0
+        self.wakeups += 1
+        return self.reclaim(self.high, keep)
+
+    def reclaim(self, target, keep=None):
+        """Free frames until target are free; return the number freed.
+
+        Cold pages go first. Then whole processes go, largest first, while memory is thrashing or more processes
+        than memory_constraints are in memory, so the rest keep their working sets. As a last resort, pages are
+        taken by second chance.
+        """
+        mm = self.mm
+        allocator = mm.allocator
+        start = allocator.free_count
+        self.sweep(target, cold_only=True)
+        while allocator.free_count < target and (self.thrashing() or len(mm.page_tables) > mm.memory_constraints):
+            if not self.swap_out_largest(keep):
+                break
+        self.sweep(target, cold_only=False)
+        return allocator.free_count - start
+
+    def sweep(self, target, cold_only):
+        """Evict pages from the hand onwards until target frames are free, at most two turns of memory.
+
+        cold_only evicts only pages outside the working sets; otherwise referenced pages get a second chance.
+        """
+        mm = self.mm
+        frames, referenced = mm.frames, mm.referenced
+        for _ in range(2 * mm.num_frames):
+            if mm.allocator.free_count >= target:
+                return
+            frame = self.hand
+            self.hand = (frame + 1) % mm.num_frames
+            if frames[frame] is None:
+                continue
+            if cold_only:
+                if not self.is_cold(frame):
+                    continue
+            elif referenced[frame]:
+                referenced[frame] = 0
+                continue
+            mm.reclaim_frame(frame)
+            self.pages_reclaimed += 1
+
+    def swap_out_largest(self, keep=None):
+        """Swap out the process with the most resident pages, other than the running one and keep; return whether
+        one was.
+        """
+        mm = self.mm
+        candidates = [(len(table), pid) for pid, table in mm.page_tables.items() if pid not in (mm.current_pid, keep)]
+        if not candidates:
+            return False
+        mm.evict_process(max(candidates)[1])
+        self.processes_swapped += 1
+        return True
+
+    def stats(self):
+        """Return pid -> (resident pages, working-set estimate, fault rate, thrashing) for processes in memory."""
+        return {pid: (len(table), self.working_set.get(pid, 0), self.fault_rate.get(pid, 0.0),
+                      self.fault_rate.get(pid, 0.0) > self.thrash_rate)
+                for pid, table in self.mm.page_tables.items()}
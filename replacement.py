@@ -0,0 +1,278 @@
+"""
+replacement.py
+--------------
+Page replacement policies for Mini OS Simulation demand paging.
+The policy classes track the resident pages of a MemoryManager and choose eviction victims, each operation in
+O(1): amortized for Clock, and LFU takes O(log k), for k distinct access counts, when it starts a new count.
+The *_faults functions replay a whole reference string through one policy in a tight loop, for comparing
+policies on tens of millions of references; opt_faults (Belady) needs the future, so it only exists as a replay.
+"""
+import heapq
+from collections import OrderedDict, deque
+
+class FIFOPolicy:
+    """Evict the page that was loaded first."""
+    name = 'FIFO'
+
+    def __init__(self):
+        self.pages = OrderedDict()  # Resident pages, oldest first
+
+    def __len__(self):
+        return len(self.pages)
+
+    def __contains__(self, key):
+        return key in self.pages
+
+    def add(self, key):
+        """Record a page that was just loaded."""
+        self.pages[key] = None
+
+    def touch(self, key):
+        """Record an access to a resident page."""
+
+    def remove(self, key):
+        """Forget a page that left memory some other way."""
+        self.pages.pop(key, None)
+
+    def victim(self):
+        """Remove and return the page to evict."""
+        return self.pages.popitem(last=False)[0]
+
+class LRUPolicy(FIFOPolicy):
+    """Evict the least recently used page."""
+    name = 'LRU'
+
+    def touch(self, key):
+        self.pages.move_to_end(key)
+
+class ClockPolicy:
+    """Second chance: a hand sweeps the frames, clearing referenced bits, and evicts the first unreferenced page."""
+    name = 'CLOCK'
+
+    def __init__(self):
+        self.slots = []  # Page in each clock position, None when empty
+        self.referenced = bytearray()
+        self.slot_of = {}  # page -> position
+        self.empty = []  # Free positions
+        self.hand = 0
+
+    def __len__(self):
+        return len(self.slot_of)
+
+    def __contains__(self, key):
+        return key in self.slot_of
+
+    def add(self, key):
+        if self.empty:
+            slot = self.empty.pop()
+            self.slots[slot] = key
+        else:
+            slot = len(self.slots)
+            self.slots.append(key)
+            self.referenced.append(0)
+        self.referenced[slot] = 1
+        self.slot_of[key] = slot
+
+    def touch(self, key):
+        self.referenced[self.slot_of[key]] = 1
+
+    def remove(self, key):
+        slot = self.slot_of.pop(key, None)
+        if slot is not None:
+            self.slots[slot] = None
+            self.empty.append(slot)
+
+    def victim(self):
+        slots, referenced = self.slots, self.referenced
+        while True:
+            hand = self.hand
+            self.hand = (hand + 1) % len(slots)
+            key = slots[hand]
+            if key is None:
+                continue
+            if referenced[hand]:
+                referenced[hand] = 0
+                continue
+            self.remove(key)
+            return key
+
+class LFUPolicy:
+    """Evict the least frequently used page, the least recently used among equals."""
+    name = 'LFU'
+
+    def __init__(self):
+        self.count = {}  # page -> accesses while resident
+        self.buckets = {}  # access count -> dict of pages in insertion order, least recent first
+        self.min_count = 0  # Lowest count with pages, unless a removal emptied it; victim() then asks the heap
+        self.heap = []  # Counts of the buckets (and of some emptied ones), to find the lowest count after removals
+
+    def __len__(self):
+        return len(self.count)
+
+    def __contains__(self, key):
+        return key in self.count
+
+    def bucket(self, count):
+        """Return the pages with an access count, creating the bucket if needed."""
+        bucket = self.buckets.get(count)
+        if bucket is None:
+            bucket = self.buckets[count] = {}
+            heapq.heappush(self.heap, count)
+            if len(self.heap) > 2 * len(self.buckets) + 64:  # Drop counts whose buckets are gone
+                self.heap = list(self.buckets)
+                heapq.heapify(self.heap)
+        return bucket
+
+    def add(self, key):
+        self.count[key] = 1
+        self.bucket(1)[key] = None
+        self.min_count = 1
+
+    def touch(self, key):
+        count = self.count[key]
+        bucket = self.buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[count]
+            if self.min_count == count:
+                self.min_count = count + 1
+        self.count[key] = count + 1
+        self.bucket(count + 1)[key] = None
+
+    def remove(self, key):
+        count = self.count.pop(key, None)
+        if count is not None:
+            bucket = self.buckets[count]
+            del bucket[key]
+            if not bucket:
+                del self.buckets[count]
+
+    def victim(self):
+        if self.min_count not in self.buckets:
+            heap = self.heap
+            while heap[0] not in self.buckets:
+                heapq.heappop(heap)
+            self.min_count = heap[0]
+        bucket = self.buckets[self.min_count]
+        key = next(iter(bucket))
+        del bucket[key]
+        if not bucket:
+            del self.buckets[self.min_count]
+        del self.count[key]
+        return key
+
+POLICIES = {policy.name: policy for policy in (FIFOPolicy, LRUPolicy, ClockPolicy, LFUPolicy)}
+
+def make_policy(name):
+    """Return an empty replacement policy by name (FIFO, LRU, CLOCK or LFU)."""
+    try:
+        return POLICIES[name.upper()]()
+    except KeyError:
+        raise ValueError(f"Unknown replacement policy {name!r}; choose from {', '.join(POLICIES)}") from None
+
+def fifo_faults(references, frames):
+    """Return the page faults of FIFO replacement over a reference string."""
+    resident = set()
+    order = deque()
+    faults = 0
+    for page in references:
+        if page not in resident:
+            faults += 1
+            if len(order) >= frames:
+                resident.discard(order.popleft())
+            resident.add(page)
+            order.append(page)
+    return faults
+
+def lru_faults(references, frames):
+    """Return the page faults of LRU replacement over a reference string."""
+    resident = OrderedDict()
+    touch = resident.move_to_end
+    faults = 0
+    for page in references:
+        if page in resident:
+            touch(page)
+        else:
+            faults += 1
+            if len(resident) >= frames:
+                resident.popitem(last=False)
+            resident[page] = None
+    return faults
+
+def clock_faults(references, frames):
+    """Return the page faults of Clock (second chance) replacement over a reference string."""
+    slot_of = {}
+    slots = [None] * frames
+    referenced = bytearray(frames)
+    hand = 0
+    faults = 0
+    for page in references:
+        slot = slot_of.get(page)
+        if slot is not None:
+            referenced[slot] = 1
+            continue
+        faults += 1
+        if len(slot_of) < frames:
+            slot = len(slot_of)
+        else:
+            while referenced[hand]:
+                referenced[hand] = 0
+                hand = (hand + 1) % frames
+            slot = hand
+            hand = (hand + 1) % frames
+            del slot_of[slots[slot]]
+        slots[slot] = page
+        referenced[slot] = 1
+        slot_of[page] = slot
+    return faults
+
+def lfu_faults(references, frames):
+    """Return the page faults of LFU replacement over a reference string."""
+    policy = LFUPolicy()
+    count, add, touch, victim = policy.count, policy.add, policy.touch, policy.victim
+    faults = 0
+    for page in references:
+        if page in count:
+            touch(page)
+        else:
+            faults += 1
+            if len(count) >= frames:
+                victim()
+            add(page)
+    return faults
+
+def opt_faults(references, frames):
+    """Return the page faults of Belady's optimal replacement: evict the page used furthest in the future."""
+    references = list(references)
+    never = len(references)
+    next_use = [never] * len(references)
+    last_seen = {}
+    for i in range(len(references) - 1, -1, -1):
+        page = references[i]
+        next_use[i] = last_seen.get(page, never)
+        last_seen[page] = i
+    resident = {}  # page -> index of its next use
+    heap = []  # (-next use, page); entries whose next use has changed are skipped
+    faults = 0
+    for i, page in enumerate(references):
+        if page not in resident:
+            faults += 1
+            if len(resident) >= frames:
+                while True:
+                    when, victim = heapq.heappop(heap)
+                    if resident.get(victim) == -when:
+                        del resident[victim]
+                        break
+        resident[page] = next_use[i]
+        heapq.heappush(heap, (-next_use[i], page))
+        if len(heap) > 2 * frames + 64:
+            heap = [(-when, page) for page, when in resident.items()]
+            heapq.heapify(heap)
+    return faults
+
+FAULT_COUNTERS = {'FIFO': fifo_faults, 'LRU': lru_faults, 'CLOCK': clock_faults, 'LFU': lfu_faults,
+                  'OPT': opt_faults}
+
+def compare(references, frames, policies=None):
+    """Return policy name -> page faults for one reference string and frame count."""
+    return {name: FAULT_COUNTERS[name](references, frames) for name in (policies or FAULT_COUNTERS)}
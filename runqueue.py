@@ -0,0 +1,290 @@
+"""
+runqueue.py
+-----------
+Ready-queue data structures for the Mini OS Simulation schedulers.
+Enqueue, dequeue, per-power-profile dequeue and removal by PID all run in amortized O(1), with a bitmap
+of non-empty MLFQ levels;
+the CFS queue orders processes by virtual runtime in O(log n).
+"""
+from collections import deque
+
+class ReadyQueue:
+    """FIFO ready queue indexed by PID, with a bucket per power profile."""
+    def __init__(self):
+        self.order = deque()  # Entries in arrival order; an entry is [pcb], emptied once it leaves the queue
+        self.buckets = {}  # power profile -> deque of the same entries
+        self.entries = {}  # pid -> entry
+        self.stale = 0  # Emptied entries still sitting in a deque
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, pid):
+        return pid in self.entries
+
+    def __iter__(self):
+        for entry in self.order:
+            if entry[0] is not None:
+                yield entry[0]
+
+    def append(self, pcb):
+        """Add a process at the back; a process already queued moves to the back."""
+        if pcb.pid in self.entries:
+            self.remove(pcb.pid)
+        entry = [pcb]
+        self.entries[pcb.pid] = entry
+        self.order.append(entry)
+        bucket = self.buckets.get(pcb.power_profile)
+        if bucket is None:
+            bucket = self.buckets[pcb.power_profile] = deque()
+        bucket.append(entry)
+
+    def popleft(self, profile=None):
+        """Remove and return the oldest process (of the given power profile), or None."""
+        queue = self.order if profile is None else self.buckets.get(profile)
+        while queue:
+            entry = queue.popleft()
+            pcb = entry[0]
+            if pcb is not None:
+                entry[0] = None
+                del self.entries[pcb.pid]
+                self.stale += 1  # Still in the other deque
+                self.compact()
+                return pcb
+            self.stale -= 1
+        return None
+
+    def peek(self, profile=None):
+        """Return the oldest process (of the given power profile) without removing it."""
+        queue = self.order if profile is None else self.buckets.get(profile)
+        while queue and queue[0][0] is None:
+            queue.popleft()
+            self.stale -= 1
+        return queue[0][0] if queue else None
+
+    def remove(self, pid):
+        """Remove a process by PID and return it, or None if it is not queued."""
+        entry = self.entries.pop(pid, None)
+        if entry is None:
+            return None
+        pcb = entry[0]
+        entry[0] = None
+        self.stale += 2
+        self.compact()
+        return pcb
+
+    def compact(self):
+        """Rebuild the deques once emptied entries outnumber live ones (amortized O(1))."""
+        if self.stale <= 2 * len(self.entries) + 64:
+            return
+        live = [entry for entry in self.order if entry[0] is not None]
+        self.order = deque(live)
+        self.buckets = {}
+        for entry in live:
+            self.buckets.setdefault(entry[0].power_profile, deque()).append(entry)
+        self.stale = 0
+
+    def clear(self):
+        """Remove every process."""
+        self.order.clear()
+        self.buckets = {}
+        self.entries = {}
+        self.stale = 0
+
+class RunQueue:
+    """A core's run queue: one ReadyQueue per priority level, level 0 served first.
+
+    A bitmap of non-empty levels finds the highest-priority process, and a pid -> level index finds any queued
+    process, in O(1) however many levels there are.
+    """
+    def __init__(self, levels=1):
+        self.levels = [ReadyQueue() for _ in range(levels)]
+        self.bitmap = 0  # Bit i is set while level i has processes
+        self.level_of = {}  # pid -> level of every queued process
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        for level in self.levels:
+            yield from level
+
+    def append(self, pcb, level=0):
+        """Queue a process at the given priority level."""
+        queue = self.levels[level]
+        if self.level_of.get(pcb.pid) != level:
+            self.remove(pcb.pid)
+            self.size += 1
+            self.level_of[pcb.pid] = level
+        queue.append(pcb)
+        self.bitmap |= 1 << level
+
+    def popleft(self, profile=None):
+        """Remove and return the oldest process of the highest non-empty level, or None."""
+        bitmap = self.bitmap
+        while bitmap:
+            lowest = bitmap & -bitmap
+            queue = self.levels[lowest.bit_length() - 1]
+            pcb = queue.popleft(profile)
+            if pcb is not None:
+                self.size -= 1
+                del self.level_of[pcb.pid]
+                if not queue:
+                    self.bitmap &= ~lowest
+                return pcb
+            bitmap ^= lowest  # No process of this profile here; try the next level down
+        return None
+
+    def remove(self, pid):
+        """Remove a process by PID and return it, or None if it is not queued."""
+        level = self.level_of.pop(pid, None)
+        if level is None:
+            return None
+        queue = self.levels[level]
+        pcb = queue.remove(pid)
+        self.size -= 1
+        if not queue:
+            self.bitmap &= ~(1 << level)
+        return pcb
+
+    def boost(self):
+        """Move every process to level 0, oldest level first, and return how many moved."""
+        top = self.levels[0]
+        for pcb in top:
+            pcb.mlfq_used = 0
+        moved = 0
+        for queue in self.levels[1:]:
+            pcb = queue.popleft()
+            while pcb is not None:
+                pcb.mlfq_level = 0
+                pcb.mlfq_used = 0
+                top.append(pcb)
+                self.level_of[pcb.pid] = 0
+                moved += 1
+                pcb = queue.popleft()
+        self.bitmap = 1 if top else 0
+        return moved
+
+    def clear(self):
+        """Remove every process."""
+        for level in self.levels:
+            level.clear()
+        self.bitmap = 0
+        self.level_of.clear()
+        self.size = 0
+
+# Load weight of each nice value from -20 to 19 (the Linux CFS table): one nice step changes the CPU share by about 10%
+NICE_WEIGHTS = [
+    88761, 71755, 56483, 46273, 36291, 29154, 23254, 18705, 14949, 11916,
+    9548, 7620, 6100, 4904, 3906, 3121, 2501, 1991, 1586, 1277,
+    1024, 820, 655, 526, 423, 335, 272, 215, 172, 137,
+    110, 87, 70, 56, 45, 36, 29, 23, 18, 15,
+]
+NICE_0_WEIGHT = 1024
+
+def nice_weight(nice):
+    """Return the load weight of a nice value (clamped to -20..19)."""
+    return NICE_WEIGHTS[min(max(nice, -20), 19) + 20]
+
+class FairQueue:
+    """CFS run queue: an indexed min-heap on virtual runtime, O(log n) enqueue, pick-next and removal by PID.
+
+    Processes with equal vruntime leave in the order they were queued.
+    """
+    def __init__(self):
+        self.heap = []  # Entries [vruntime, seq, pcb]
+        self.position = {}  # pid -> index of its entry in the heap
+        self.seq = 0
+        self.weight = 0  # Total load weight of the queued processes
+        self.min_vruntime = 0  # Never decreases; arriving and waking processes are placed relative to it
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, pid):
+        return pid in self.position
+
+    def __iter__(self):
+        """Yield the queued processes in vruntime order."""
+        for entry in sorted(self.heap):
+            yield entry[2]
+
+    def sift_up(self, i):
+        """Move the entry at index i towards the root until its parent is smaller."""
+        heap, position = self.heap, self.position
+        entry = heap[i]
+        while i:
+            parent = (i - 1) >> 1
+            if heap[parent] <= entry:
+                break
+            heap[i] = heap[parent]
+            position[heap[i][2].pid] = i
+            i = parent
+        heap[i] = entry
+        position[entry[2].pid] = i
+
+    def sift_down(self, i):
+        """Move the entry at index i towards the leaves until its children are larger."""
+        heap, position = self.heap, self.position
+        entry = heap[i]
+        n = len(heap)
+        while True:
+            child = 2 * i + 1
+            if child >= n:
+                break
+            if child + 1 < n and heap[child + 1] < heap[child]:
+                child += 1
+            if entry <= heap[child]:
+                break
+            heap[i] = heap[child]
+            position[heap[i][2].pid] = i
+            i = child
+        heap[i] = entry
+        position[entry[2].pid] = i
+
+    def append(self, pcb, level=0):
+        """Queue a process by its current vruntime; a process already queued is re-keyed."""
+        if pcb.pid in self.position:
+            self.remove(pcb.pid)
+        self.seq += 1
+        self.heap.append([pcb.vruntime, self.seq, pcb])
+        self.weight += nice_weight(pcb.nice)
+        self.sift_up(len(self.heap) - 1)
+
+    def take(self, i):
+        """Remove and return the process at heap index i."""
+        heap = self.heap
+        pcb = heap[i][2]
+        del self.position[pcb.pid]
+        last = heap.pop()
+        if i < len(heap):
+            heap[i] = last
+            self.position[last[2].pid] = i
+            self.sift_down(i)
+            self.sift_up(self.position[last[2].pid])
+        self.weight -= nice_weight(pcb.nice)
+        return pcb
+
+    def popleft(self, profile=None):
+        """Remove and return the process with the smallest vruntime, or None (power profiles are not used)."""
+        if not self.heap:
+            return None
+        pcb = self.take(0)
+        self.min_vruntime = max(self.min_vruntime, pcb.vruntime)
+        return pcb
+
+    def peek(self, profile=None):
+        """Return the process with the smallest vruntime without removing it."""
+        return self.heap[0][2] if self.heap else None
+
+    def remove(self, pid):
+        """Remove a process by PID and return it, or None if it is not queued."""
+        i = self.position.get(pid)
+        return None if i is None else self.take(i)
+
+    def clear(self):
+        """Remove every process."""
+        self.heap = []
+        self.position = {}
+        self.weight = 0
@@ -0,0 +1,606 @@
+"""
+simulation.py
+-------------
+Discrete-event scheduling engine for Mini OS Simulation.
+Drives the FIFO, RR, MLFQ, Power-aware and CFS schedulers on a virtual clock, with optional wall-clock pacing.
+Each core owns a run queue; idle cores steal from the busiest peer and a periodic balancer evens out the queues.
+"""
+import heapq
+import math
+import random
+import time
+from array import array
+from collections import deque
+
+from runqueue import NICE_0_WEIGHT, FairQueue, RunQueue, nice_weight
+
+# Event kinds. Simultaneous events are handled in this order: cores are released
+# first, then newly ready processes join the queue (new arrivals ahead of a
+# preempted process), and idle cores dispatch last. The periodic balance and boost
+# passes come after everything else and never outlast the last other event.
+COMPLETION = 0
+IO_BLOCK = 1
+ARRIVAL = 2
+IO_UNBLOCK = 3
+QUANTUM_EXPIRE = 4
+DISPATCH = 5
+LOAD_BALANCE = 6
+PRIORITY_BOOST = 7
+
+INFINITY = float('inf')
+RESERVOIR_SIZE = 100000  # Finished processes sampled for percentiles when records are not kept
+
+def percentile(values, p):
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not values:
+        return 0
+    return values[max(math.ceil(p / 100 * len(values)) - 1, 0)]
+
+def jain_index(values):
+    """Jain's fairness index: 1 when all values are equal, 1/n when one value takes everything."""
+    total = sum(values)
+    squares = sum(v * v for v in values)
+    return total * total / (len(values) * squares) if squares else 1
+
+class Simulation:
+    """Event-driven simulation of a ProcessManager's scheduler on a virtual clock."""
+    def __init__(self, manager, pacing=0.0, verbose=False, seed=None, keep_records=True):
+        self.scheduler_type = manager.scheduler_type
+        self.time_quantum = manager.time_quantum
+        self.mlfq_quantums = list(manager.mlfq_quantums)
+        self.mlfq_allotments = list(manager.mlfq_allotments or manager.mlfq_quantums)
+        self.mlfq_boost_interval = manager.mlfq_boost_interval
+        self.starvation_threshold = manager.starvation_threshold
+        self.energy_model = manager.energy_model
+        self.context_switch_cost = manager.context_switch_cost
+        self.cache_refill_cost = manager.cache_refill_cost
+        self.cache_window = manager.cache_window
+        self.migration_threshold = manager.migration_threshold
+        self.num_cores = manager.num_cores
+        self.balance_interval = manager.balance_interval
+        self.cfs_latency = manager.cfs_latency
+        self.cfs_min_granularity = manager.cfs_min_granularity
+        self.pacing = pacing  # Wall-clock seconds per virtual time unit (0 = as fast as possible)
+        self.verbose = verbose
+        self.clock = 0
+        self.events = []  # Heap of (time, kind, seq, arg, pcb); arg is a core id or arrival source
+        self.seq = 0
+        self.dispatch_pending = False
+        self.balance_pending = False
+        self.boost_pending = False
+        self.inbox = deque()  # Processes submitted from other threads while running paced
+        self.processes = manager.processes  # pid -> PCB; finished processes leave the table
+        levels = len(self.mlfq_quantums) if self.scheduler_type == 'MLFQ' else 1
+        if self.scheduler_type == 'CFS':
+            self.run_queues = [FairQueue() for _ in range(self.num_cores)]
+        else:
+            self.run_queues = [RunQueue(levels) for _ in range(self.num_cores)]
+        self.queue_lengths = [0] * self.num_cores
+        self.queued = 0  # Processes waiting in any run queue
+        self.next_core = 0  # Round-robin placement of arriving processes
+        self.core_running = [None] * self.num_cores
+        self.core_slice = [0] * self.num_cores
+        self.core_slice_overhead = [0] * self.num_cores  # Part of the current slice lost to switch and cache costs
+        self.core_overhead = [0] * self.num_cores
+        self.switch_overhead = 0  # Time lost to context switches
+        self.cache_overhead = 0  # Time lost refilling cold caches
+        self.core_state = [self.energy_model.nominal_state] * self.num_cores  # P-state of each core's current slice
+        self.core_energy = [0] * self.num_cores  # Joules spent running processes
+        self.state_time = [0] * len(self.energy_model.p_states)  # Busy time spent in each P-state
+        self.active_energy = 0
+        self.busy_total = 0
+        self.core_last = [None] * self.num_cores
+        self.core_busy_time = [0] * self.num_cores
+        self.core_dispatches = [0] * self.num_cores
+        self.core_steals = [0] * self.num_cores  # Processes this core pulled from a peer's queue
+        self.core_migrations_in = [0] * self.num_cores
+        self.core_migrations_out = [0] * self.num_cores
+        self.balanced = 0  # Processes moved by the load balancer
+        self.imbalance_total = 0
+        self.imbalance_samples = 0
+        self.imbalance_max = 0
+        self.idle_cores = list(range(self.num_cores))  # Min-heap, so the lowest idle core dispatches first
+        self.context_switches = 0
+        self.boosts = 0
+        self.max_ready_wait = 0  # Longest single wait for a core
+        self.starved = 0  # Dispatches that waited longer than starvation_threshold
+        self.level_dispatches = [0] * levels
+        self.level_cpu_time = [0] * levels
+        self.events_processed = 0
+        self.completed = 0
+        # One entry per finished process, in completion order. Without keep_records only a uniform
+        # sample of RESERVOIR_SIZE processes is kept, so replaying an endless trace uses constant memory.
+        self.keep_records = keep_records
+        self.sample_rng = random.Random(seed)
+        self.total_turnaround = 0
+        self.total_wait = 0
+        self.total_response = 0
+        self.total_job_energy = 0
+        self.finished_pids = array('q')
+        self.finished_arrival = array('d')
+        self.finished_first_run = array('d')
+        self.finished_completion = array('d')
+        self.finished_cpu = array('d')
+        self.finished_wait = array('d')
+        self.finished_nice = array('b')
+        self.finished_interactive = array('b')  # 1 for processes that block on I/O
+        self.finished_energy = array('d')
+
+    def push_event(self, when, kind, arg=None, pcb=None):
+        """Schedule an event on the virtual clock."""
+        self.seq += 1
+        heapq.heappush(self.events, (when, kind, self.seq, arg, pcb))
+
+    def load(self, workload):
+        """Add a workload: an iterable of PCBs sorted by arrival_time, consumed lazily."""
+        self.next_arrival(iter(workload))
+
+    def next_arrival(self, source):
+        """Schedule the arrival of the next process from a workload source."""
+        pcb = next(source, None)
+        if pcb is not None:
+            self.push_event(max(pcb.arrival_time, self.clock), ARRIVAL, source, pcb)
+
+    def submit(self, pcb):
+        """Hand a process to a running simulation; it arrives at the current virtual time."""
+        self.inbox.append(pcb)
+
+    def request_dispatch(self):
+        """Make sure idle cores look for work once the current instant is settled."""
+        if not self.dispatch_pending and self.idle_cores:
+            self.dispatch_pending = True
+            self.push_event(self.clock, DISPATCH)
+
+    def work_pending(self):
+        """Return True if events other than the periodic balance and boost passes are pending."""
+        return len(self.events) > self.balance_pending + self.boost_pending
+
+    def request_balance(self):
+        """Schedule the next load-balancing pass while other events are pending."""
+        if self.num_cores > 1 and self.balance_interval and not self.balance_pending and self.work_pending():
+            self.balance_pending = True
+            self.push_event(self.clock + self.balance_interval, LOAD_BALANCE)
+
+    def request_boost(self):
+        """Schedule the next MLFQ priority boost while other events are pending."""
+        if (self.scheduler_type == 'MLFQ' and self.mlfq_boost_interval and not self.boost_pending
+                and self.work_pending()):
+            self.boost_pending = True
+            self.push_event(self.clock + self.mlfq_boost_interval, PRIORITY_BOOST)
+
+    def boost(self):
+        """Move every process, queued, running or blocked, back to the top MLFQ level."""
+        self.boosts += 1
+        for queue in self.run_queues:
+            queue.boost()
+        others = [pcb for pcb in self.core_running if pcb is not None]
+        others.extend(pcb for _, kind, _, _, pcb in self.events if kind == IO_UNBLOCK)
+        for pcb in others:
+            pcb.mlfq_level = 0
+            pcb.mlfq_used = 0
+
+    def enqueue(self, pcb, core):
+        """Put a process in a core's run queue."""
+        if self.scheduler_type == 'CFS':
+            # New processes start at the queue's minimum vruntime; waking ones get up to half a latency of credit
+            credit = self.cfs_latency / 2 if pcb.state == 'BLOCKED' else 0
+            pcb.vruntime = max(pcb.vruntime, self.run_queues[core].min_vruntime - credit)
+        pcb.state = 'READY'
+        pcb.ready_since = self.clock
+        self.run_queues[core].append(pcb, pcb.mlfq_level if self.scheduler_type == 'MLFQ' else 0)
+        self.queue_lengths[core] += 1
+        self.queued += 1
+
+    def place(self, pcb):
+        """Queue a newly arrived process, spreading arrivals round-robin over the cores."""
+        self.enqueue(pcb, self.next_core)
+        self.next_core = (self.next_core + 1) % self.num_cores
+
+    def pick_next(self, core):
+        """Remove and return the next process for a core, stealing from the busiest peer if its queue is empty.
+
+        dispatch() serves idle cores with their own queues first, so the peers left to steal from are all busy.
+        """
+        lengths = self.queue_lengths
+        source = core
+        if not lengths[core]:
+            source = max(range(self.num_cores), key=lengths.__getitem__)
+            if not lengths[source] or lengths[source] < self.migration_threshold:
+                return None  # Nothing queued, or not enough to pull a process off its warm core
+            self.core_steals[core] += 1
+        queue = self.run_queues[source]
+        pcb = None
+        if self.scheduler_type == 'POWER' and self.battery_level() < self.energy_model.low_battery:
+            pcb = queue.popleft('low')
+        if pcb is None:
+            pcb = queue.popleft()
+        if source != core and self.scheduler_type == 'CFS':
+            pcb.vruntime += self.run_queues[core].min_vruntime - queue.min_vruntime  # Keep its lag on the new core
+        lengths[source] -= 1
+        self.queued -= 1
+        return pcb
+
+    def battery_level(self):
+        """Return the charge left (0-1) after the energy spent so far, idle cores included."""
+        model = self.energy_model
+        idle_energy = model.idle_power * (self.clock * self.num_cores - self.busy_total)
+        return max(1 - (self.active_energy + idle_energy) / model.battery_capacity, 0)
+
+    def quantum(self, pcb, core):
+        """Return the time slice the scheduler grants a process (None = run until it yields)."""
+        if self.scheduler_type == 'RR':
+            return self.time_quantum
+        if self.scheduler_type == 'MLFQ':
+            # Never past the end of the level's allotment, so demotion happens on time
+            level = pcb.mlfq_level
+            return min(self.mlfq_quantums[level], self.mlfq_allotments[level] - pcb.mlfq_used)
+        if self.scheduler_type == 'CFS':
+            # The process's weighted share of the scheduling latency among everything queued on its core
+            weight = nice_weight(pcb.nice)
+            share = self.cfs_latency * weight / (weight + self.run_queues[core].weight)
+            return max(share, self.cfs_min_granularity)
+        return None
+
+    def dispatch(self):
+        """Assign ready processes to idle cores."""
+        self.dispatch_pending = False
+        # Cores with work queued of their own go first, so nothing is stolen from a core that is about to run it
+        own = [core for core in self.idle_cores if self.queue_lengths[core]]
+        if own:
+            self.idle_cores = [core for core in self.idle_cores if not self.queue_lengths[core]]
+            heapq.heapify(self.idle_cores)
+            for core in own:
+                self.run_on(core, self.pick_next(core))
+        passed = []
+        while self.idle_cores and self.queued:
+            core = heapq.heappop(self.idle_cores)
+            pcb = self.pick_next(core)
+            if pcb is None:
+                passed.append(core)
+                continue
+            self.run_on(core, pcb)
+        for core in passed:
+            heapq.heappush(self.idle_cores, core)
+
+    def balance(self):
+        """Even out run-queue lengths and record the load imbalance across cores."""
+        lengths = self.queue_lengths
+        loads = [length + (running is not None) for length, running in zip(lengths, self.core_running)]
+        mean = sum(loads) / self.num_cores
+        if mean:
+            imbalance = (max(loads) - mean) / mean
+            self.imbalance_total += imbalance
+            self.imbalance_samples += 1
+            self.imbalance_max = max(self.imbalance_max, imbalance)
+        floor = sum(lengths) // self.num_cores
+        ceil = floor + (sum(lengths) % self.num_cores > 0)
+        order = sorted(range(self.num_cores), key=lengths.__getitem__)
+        lo, hi = 0, self.num_cores - 1
+        while lo < hi:
+            receiver, donor = order[lo], order[hi]
+            if lengths[receiver] >= floor:
+                lo += 1
+            elif lengths[donor] <= ceil:
+                hi -= 1
+            elif lengths[donor] - lengths[receiver] <= self.migration_threshold:
+                break  # Not worth a cold cache
+            else:
+                pcb = self.run_queues[donor].popleft()
+                if self.scheduler_type == 'CFS':
+                    pcb.vruntime += self.run_queues[receiver].min_vruntime - self.run_queues[donor].min_vruntime
+                self.run_queues[receiver].append(pcb, pcb.mlfq_level if self.scheduler_type == 'MLFQ' else 0)
+                lengths[donor] -= 1
+                lengths[receiver] += 1
+                self.balanced += 1
+
+    def run_on(self, core, pcb):
+        """Start a process on a core and schedule the event that ends its slice."""
+        pcb.state = 'RUNNING'
+        wait = self.clock - pcb.ready_since
+        pcb.wait_time += wait
+        if wait > self.max_ready_wait:
+            self.max_ready_wait = wait
+        if wait > self.starvation_threshold:
+            self.starved += 1
+        if self.scheduler_type == 'MLFQ':
+            self.level_dispatches[pcb.mlfq_level] += 1
+        if pcb.first_run_time is None:
+            pcb.first_run_time = self.clock
+        self.core_running[core] = pcb
+        self.core_dispatches[core] += 1
+        # Cache warmth: fully cold on a new core, otherwise cooling with the CPU time others ran here since
+        if pcb.core == core and self.cache_window:
+            coldness = min((self.core_busy_time[core] - pcb.cache_mark) / self.cache_window, 1)
+        else:
+            coldness = 1
+        if pcb.core is not None and pcb.core != core:
+            self.core_migrations_out[pcb.core] += 1
+            self.core_migrations_in[core] += 1
+        pcb.core = core
+        switch = 0
+        if self.core_last[core] is not pcb:
+            self.context_switches += 1
+            self.core_last[core] = pcb
+            switch = self.context_switch_cost
+        refill = self.cache_refill_cost * coldness
+        self.switch_overhead += switch
+        self.cache_overhead += refill
+        overhead = switch + refill
+        if self.verbose:
+            print(f"[Core {core}] Running PID {pcb.pid} ({pcb.name}) at t={self.clock:g}")
+        # The power-aware scheduler sets the core's P-state per slice; the others run at nominal speed
+        state = self.energy_model.nominal_state
+        if self.scheduler_type == 'POWER':
+            state = self.energy_model.pick_state(self.battery_level(), self.queue_lengths[core])
+        self.core_state[core] = state
+        speed = self.energy_model.frequency(state)
+        length, kind = INFINITY, None
+        if pcb.remaining_time is not None:
+            length, kind = pcb.remaining_time, COMPLETION
+        if pcb.io_interval and pcb.io_interval - pcb.io_progress < length:
+            length, kind = pcb.io_interval - pcb.io_progress, IO_BLOCK
+        if speed != 1:
+            length /= speed  # Work to time
+        quantum = self.quantum(pcb, core)
+        if quantum is not None and quantum < length:
+            length, kind = quantum, QUANTUM_EXPIRE
+        length += overhead  # The slice's useful time starts once the switch and cache refill are paid
+        self.core_slice[core] = length
+        self.core_slice_overhead[core] = overhead
+        if kind is not None:
+            self.push_event(self.clock + length, kind, core, pcb)
+
+    def release(self, core, pcb):
+        """Charge the finished slice to a process and free its core."""
+        length = self.core_slice[core]
+        overhead = self.core_slice_overhead[core]
+        self.core_busy_time[core] += length
+        self.core_overhead[core] += overhead
+        self.busy_total += length
+        pcb.cache_mark = self.core_busy_time[core]
+        state = self.core_state[core]
+        energy = length * self.energy_model.active_power(pcb.power_profile, state)
+        self.core_energy[core] += energy
+        self.active_energy += energy
+        self.state_time[state] += length
+        pcb.energy += energy
+        length -= overhead  # Only the useful part advances the process
+        pcb.cpu_time += length
+        work = length * self.energy_model.frequency(state)
+        if self.scheduler_type == 'CFS':
+            pcb.vruntime += length * NICE_0_WEIGHT / nice_weight(pcb.nice)
+        elif self.scheduler_type == 'MLFQ':
+            level = pcb.mlfq_level
+            self.level_cpu_time[level] += length
+            pcb.mlfq_used += length
+            if pcb.mlfq_used >= self.mlfq_allotments[level] - 1e-9:
+                # Allotment used up, whether in one slice or across I/O waits: demote
+                pcb.mlfq_used = 0
+                pcb.mlfq_level = min(level + 1, len(self.mlfq_quantums) - 1)
+        if pcb.remaining_time is not None:
+            pcb.remaining_time -= work
+        if pcb.io_interval:
+            pcb.io_progress += work
+        self.core_running[core] = None
+        heapq.heappush(self.idle_cores, core)
+        self.request_dispatch()
+
+    def step(self):
+        """Advance the clock to the next event and handle it."""
+        when, kind, _, arg, pcb = heapq.heappop(self.events)
+        if kind == LOAD_BALANCE:
+            self.balance_pending = False
+        elif kind == PRIORITY_BOOST:
+            self.boost_pending = False
+        if kind >= LOAD_BALANCE and not self.work_pending():
+            return  # A periodic pass with nothing left to act on; the clock stays at the last real event
+        self.clock = when
+        self.events_processed += 1
+        if kind == DISPATCH:
+            self.dispatch()
+        elif kind == ARRIVAL:
+            self.processes[pcb.pid] = pcb
+            pcb = self.processes[pcb.pid]  # The compact process table hands back its own view
+            self.place(pcb)
+            self.request_dispatch()
+            self.request_balance()
+            self.request_boost()
+            if arg is not None:
+                self.next_arrival(arg)
+        elif kind == COMPLETION:
+            self.release(arg, pcb)
+            pcb.remaining_time = 0
+            pcb.state = 'TERMINATED'
+            pcb.completion_time = self.clock
+            self.completed += 1
+            self.record(pcb)
+            self.processes.pop(pcb.pid, None)
+        elif kind == IO_BLOCK:
+            self.release(arg, pcb)
+            pcb.io_progress = 0
+            pcb.state = 'BLOCKED'
+            self.push_event(self.clock + pcb.io_duration, IO_UNBLOCK, None, pcb)
+        elif kind == IO_UNBLOCK:
+            self.enqueue(pcb, pcb.core)
+            self.request_dispatch()
+        elif kind == QUANTUM_EXPIRE:
+            self.release(arg, pcb)
+            self.enqueue(pcb, arg)
+        elif kind == LOAD_BALANCE:
+            self.balance()
+            self.request_balance()
+        elif kind == PRIORITY_BOOST:
+            self.boost()
+            self.request_boost()
+
+    def record(self, pcb):
+        """Add a finished process to the running totals and the per-process records."""
+        self.total_turnaround += self.clock - pcb.arrival_time
+        self.total_wait += pcb.wait_time
+        self.total_response += pcb.first_run_time - pcb.arrival_time
+        self.total_job_energy += pcb.energy
+        row = (pcb.pid, pcb.arrival_time, pcb.first_run_time, self.clock, pcb.cpu_time, pcb.wait_time,
+               pcb.nice, pcb.io_interval is not None, pcb.energy)
+        columns = (self.finished_pids, self.finished_arrival, self.finished_first_run,
+                   self.finished_completion, self.finished_cpu, self.finished_wait,
+                   self.finished_nice, self.finished_interactive, self.finished_energy)
+        if self.keep_records or len(self.finished_pids) < RESERVOIR_SIZE:
+            for column, value in zip(columns, row):
+                column.append(value)
+            return
+        slot = self.sample_rng.randrange(self.completed)
+        if slot < RESERVOIR_SIZE:
+            for column, value in zip(columns, row):
+                column[slot] = value
+
+    def run(self, until=None):
+        """Process events as fast as possible until none remain or the clock passes `until`."""
+        events = self.events
+        while events and (until is None or events[0][0] <= until):
+            self.step()
+        if until is not None and self.clock < until:
+            self.clock = until
+        return self
+
+    def run_paced(self, should_stop):
+        """Process events in step with the wall clock until should_stop() returns True."""
+        start_wall = time.monotonic()
+        start_clock = self.clock
+        while not should_stop():
+            now = start_clock + (time.monotonic() - start_wall) / self.pacing
+            while self.inbox:
+                pcb = self.inbox.popleft()
+                self.push_event(max(self.clock, now), ARRIVAL, None, pcb)
+            if self.events and self.events[0][0] <= now:
+                self.step()
+                continue
+            wait = 0.1
+            if self.events:
+                wait = min(wait, (self.events[0][0] - now) * self.pacing)
+            time.sleep(max(wait, 0))
+
+    def drain(self):
+        """Remove every unfinished process from the simulation and return them as READY PCBs."""
+        pcbs = [pcb for pcb in self.core_running if pcb is not None]
+        for queue in self.run_queues:
+            pcbs.extend(queue)
+            queue.clear()
+        self.queue_lengths = [0] * self.num_cores
+        self.queued = 0
+        pcbs.extend(pcb for _, kind, _, _, pcb in self.events if kind == IO_UNBLOCK)
+        pcbs.extend(self.inbox)
+        self.inbox.clear()
+        self.events = []
+        self.core_running[:] = [None] * self.num_cores
+        for pcb in pcbs:
+            pcb.state = 'READY'
+        return pcbs
+
+    def summary(self):
+        """Return the headline figures and latency statistics of the run as a dict."""
+        turnaround = sorted(c - a for c, a in zip(self.finished_completion, self.finished_arrival))
+        response = sorted(r - a for r, a in zip(self.finished_first_run, self.finished_arrival))
+        waiting = sorted(self.finished_wait)
+        stats = {
+            'scheduler': self.scheduler_type,
+            'cores': self.num_cores,
+            'clock': self.clock,
+            'completed': self.completed,
+            'throughput': self.completed / self.clock if self.clock else 0,
+            'utilization': sum(self.core_busy_time) / (self.clock * self.num_cores) if self.clock else 0,
+            'context_switches': self.context_switches,
+            'events': self.events_processed,
+            'busy_time': sum(self.core_busy_time),
+            'migrations': sum(self.core_migrations_in),
+            'steals': sum(self.core_steals),
+            'balanced': self.balanced,
+            'load_imbalance': self.imbalance_total / self.imbalance_samples if self.imbalance_samples else 0,
+            'max_load_imbalance': self.imbalance_max,
+            'max_ready_wait': self.max_ready_wait,
+            'starved_dispatches': self.starved,
+            'boosts': self.boosts,
+        }
+        # Energy: active energy of the slices run plus idle power of the cores while idle
+        idle_energy = self.energy_model.idle_power * (self.clock * self.num_cores - self.busy_total)
+        energy = self.active_energy + idle_energy
+        stats['energy'] = energy
+        stats['idle_energy'] = idle_energy
+        stats['avg_power'] = energy / self.clock if self.clock else 0
+        stats['energy_per_job'] = self.total_job_energy / self.completed if self.completed else 0
+        stats['jobs_per_joule'] = self.completed / energy if energy else 0  # Throughput per watt
+        stats['battery_level'] = self.battery_level()
+        work = sum(self.energy_model.frequency(state) * time for state, time in enumerate(self.state_time))
+        stats['mean_frequency'] = work / self.busy_total if self.busy_total else 0
+        # CPU time lost to context switches and cold caches
+        lost = sum(self.core_overhead)
+        stats['switch_overhead'] = self.switch_overhead
+        stats['cache_overhead'] = self.cache_overhead
+        stats['overhead_fraction'] = lost / self.busy_total if self.busy_total else 0
+        stats['effective_utilization'] = (self.busy_total - lost) / (self.clock * self.num_cores) if self.clock else 0
+        totals = {'turnaround': self.total_turnaround, 'waiting': self.total_wait, 'response': self.total_response}
+        for name, values in (('turnaround', turnaround), ('waiting', waiting), ('response', response)):
+            stats[f'{name}_mean'] = totals[name] / self.completed if self.completed else 0
+            for p in (50, 95, 99):
+                stats[f'{name}_p{p}'] = percentile(values, p)
+        # Fairness: how evenly processes received CPU time in proportion to their weight while in the system
+        shares = [cpu / (nice_weight(nice) * (c - a)) for cpu, nice, c, a in zip(
+            self.finished_cpu, self.finished_nice, self.finished_completion, self.finished_arrival) if c > a]
+        stats['fairness'] = jain_index(shares) if shares else 1
+        # Tail latency of interactive (I/O-bound) processes, which wait for the CPU after every I/O
+        interactive = [i for i, flag in enumerate(self.finished_interactive) if flag]
+        stats['interactive_completed'] = len(interactive)
+        interactive_waiting = sorted(self.finished_wait[i] for i in interactive)
+        interactive_response = sorted(self.finished_first_run[i] - self.finished_arrival[i] for i in interactive)
+        for name, values in (('waiting', interactive_waiting), ('response', interactive_response)):
+            stats[f'interactive_{name}_mean'] = sum(values) / len(values) if values else 0
+            for p in (50, 95, 99):
+                stats[f'interactive_{name}_p{p}'] = percentile(values, p)
+        return stats
+
+    def process_stats(self):
+        """Return arrival, first-run, completion, CPU, waiting, turnaround and response times, nice value,
+        interactive flag and energy per finished process.
+
+        Without keep_records this covers the sampled processes only.
+        """
+        return [{
+            'pid': pid,
+            'arrival': arrival,
+            'first_run': first_run,
+            'completion': completion,
+            'cpu_time': cpu,
+            'waiting': wait,
+            'turnaround': completion - arrival,
+            'response': first_run - arrival,
+            'nice': nice,
+            'interactive': bool(interactive),
+            'energy': energy,
+        } for pid, arrival, first_run, completion, cpu, wait, nice, interactive, energy in zip(
+            self.finished_pids, self.finished_arrival, self.finished_first_run,
+            self.finished_completion, self.finished_cpu, self.finished_wait,
+            self.finished_nice, self.finished_interactive, self.finished_energy)]
+
+    def level_stats(self):
+        """Return dispatches and CPU time per MLFQ level."""
+        return [{
+            'level': level,
+            'quantum': self.mlfq_quantums[level],
+            'allotment': self.mlfq_allotments[level],
+            'dispatches': self.level_dispatches[level],
+            'cpu_time': self.level_cpu_time[level],
+        } for level in range(len(self.level_dispatches))]
+
+    def core_stats(self):
+        """Return per-core utilization, dispatch, steal and migration counts, energy and time lost to overhead."""
+        return [{
+            'core': core,
+            'busy_time': self.core_busy_time[core],
+            'utilization': self.core_busy_time[core] / self.clock if self.clock else 0,
+            'dispatches': self.core_dispatches[core],
+            'steals': self.core_steals[core],
+            'migrations_in': self.core_migrations_in[core],
+            'migrations_out': self.core_migrations_out[core],
+            'energy': self.core_energy[core],
+            'overhead': self.core_overhead[core],
+            'queued': len(self.run_queues[core]),
+        } for core in range(self.num_cores)]
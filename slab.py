@@ -0,0 +1,134 @@
+"""
+slab.py
+-------
+Slab allocator for fixed-size kernel objects in the Mini OS Simulation.
+Each cache takes slabs (buddy blocks of one or more frames) and cuts them into equal objects, so allocating and
+freeing an object is O(1) and never fragments the buddy zone below. A slab that empties is returned to the buddy
+allocator unless it is the cache's only slab with free objects.
+"""
+
+class SlabCache:
+    """Objects of one size, carved from slabs of 2**order frames."""
+    def __init__(self, name, object_size, buddy, page_size, order=None):
+        if object_size < 1 or object_size > page_size << buddy.max_order:
+            raise ValueError(f"Object size must be 1 to {page_size << buddy.max_order} bytes")
+        if order is None:  # Smallest slab that holds at least 8 objects, up to 8 frames
+            order = 0
+            while (page_size << order) < 8 * object_size and order < min(3, buddy.max_order):
+                order += 1
+            while (page_size << order) < object_size:
+                order += 1
+        self.name = name
+        self.object_size = object_size
+        self.buddy = buddy
+        self.page_size = page_size
+        self.order = order
+        self.slab_bytes = page_size << order
+        self.per_slab = self.slab_bytes // object_size
+        self.free_objects = {}  # First frame of a slab -> stack of its free object indices
+        self.used = {}  # First frame of a slab -> bytearray, 1 per object in use
+        self.partial = {}  # Slabs with free objects, most recently used last
+        self.in_use = 0
+
+    def new_slab(self, frame):
+        """Start tracking a slab that begins at a frame, with every object free."""
+        self.free_objects[frame] = list(range(self.per_slab - 1, -1, -1))
+        self.used[frame] = bytearray(self.per_slab)
+        self.partial[frame] = None
+
+    def alloc(self):
+        """Allocate an object and return its physical address, or None when the buddy zone is full."""
+        if not self.partial:
+            frame = self.buddy.alloc(1 << self.order)
+            if frame is None:
+                return None
+            self.new_slab(frame)
+        frame = next(reversed(self.partial))
+        free = self.free_objects[frame]
+        index = free.pop()
+        if not free:
+            del self.partial[frame]
+        self.used[frame][index] = 1
+        self.in_use += 1
+        return frame * self.page_size + index * self.object_size
+
+    def slab_of(self, address):
+        """Return (first frame of the slab, object index) for an object address."""
+        frame = address // self.page_size
+        base = self.buddy.base
+        frame = base + ((frame - base) >> self.order << self.order)
+        return frame, (address - frame * self.page_size) // self.object_size
+
+    def free(self, address):
+        """Free the object at a physical address."""
+        frame, index = self.slab_of(address)
+        used = self.used.get(frame)
+        if used is None or index >= self.per_slab or not used[index] \
+                or address != frame * self.page_size + index * self.object_size:
+            raise ValueError(f"No {self.name} object allocated at address {address}")
+        used[index] = 0
+        self.in_use -= 1
+        free = self.free_objects[frame]
+        free.append(index)
+        if len(free) == self.per_slab and len(self.partial) > (frame in self.partial):
+            del self.free_objects[frame], self.used[frame]
+            self.partial.pop(frame, None)
+            self.buddy.free(frame)
+        else:
+            self.partial[frame] = None
+
+    def restore(self, frame, indices):
+        """Adopt a slab already claimed from the buddy allocator, with the given objects in use."""
+        self.new_slab(frame)
+        used = self.used[frame]
+        for index in indices:
+            used[index] = 1
+        free = self.free_objects[frame] = [i for i in range(self.per_slab - 1, -1, -1) if not used[i]]
+        if not free:
+            del self.partial[frame]
+        self.in_use += len(indices)
+
+    def slabs(self):
+        """Yield (first frame, indices of objects in use) for every slab."""
+        for frame, used in self.used.items():
+            yield frame, [i for i, flag in enumerate(used) if flag]
+
+    def stats(self):
+        """Return objects in use, slabs, and internal fragmentation (bytes of slab memory not holding objects)."""
+        total = len(self.used) * self.slab_bytes
+        return {
+            'object_size': self.object_size,
+            'objects': self.in_use,
+            'slabs': len(self.used),
+            'objects_per_slab': self.per_slab,
+            'internal_fragmentation': 1 - self.in_use * self.object_size / total if total else 0.0,
+        }
+
+class SlabAllocator:
+    """Named object caches sharing one buddy allocator."""
+    def __init__(self, buddy, page_size):
+        self.buddy = buddy
+        self.page_size = page_size
+        self.caches = {}  # name -> SlabCache
+
+    def create_cache(self, name, object_size, order=None):
+        """Create a cache of objects of a fixed size and return it."""
+        if name in self.caches:
+            raise ValueError(f"Cache {name!r} already exists")
+        cache = self.caches[name] = SlabCache(name, object_size, self.buddy, self.page_size, order)
+        return cache
+
+    def alloc(self, name):
+        """Allocate an object from a cache; return its physical address, or None when memory is full."""
+        return self.caches[name].alloc()
+
+    def free(self, name, address):
+        """Free an object of a cache."""
+        self.caches[name].free(address)
+
+    def fragmentation(self):
+        """Return cache name -> stats, plus internal fragmentation over all slabs."""
+        stats = {name: cache.stats() for name, cache in self.caches.items()}
+        total = sum(len(cache.used) * cache.slab_bytes for cache in self.caches.values())
+        used = sum(cache.in_use * cache.object_size for cache in self.caches.values())
+        return {'caches': stats, 'internal_fragmentation': 1 - used / total if total else 0.0}
@@ -0,0 +1,530 @@
+"""
+snapshot.py
+-----------
+Binary snapshots of the whole Mini OS Simulation: processes and queues, memory, concurrency buffer and file tree.
+
+File layout (version 2), written and read as a stream of sections:
+    header     8-byte magic, format version, byte order
+    sections   tag, name, array typecode, item count, payload length, payload
+               'JSON' sections hold small settings and the file tree; 'ARRY' sections hold typed arrays,
+               8-byte aligned so a memory-mapped snapshot exposes them without copying (Snapshot.view)
+    end        an 'END ' section
+
+Large tables (the process table columns, frames and page tables) are written as arrays, so saving and restoring
+them is a bulk copy rather than one Python object at a time.
+
+VERSION changes whenever the sections or their contents change, and load() reads only the version save() writes.
+Version 1 stored page-table entries with valid flags and the pid -> row index of the process table, and had none
+of the TLB, replacement, swap data, kernel zone, shared-frame or huge-page state.
+"""
+import copy
+import functools
+import gc
+import itertools
+import json
+import mmap
+import struct
+import sys
+from array import array
+from collections import deque
+from operator import attrgetter
+
+from proctable import FLOAT_COLUMNS, INT_COLUMNS, NAN, NULLABLE, STATE_CODES, STATES, ProcessTable
+
+MAGIC = b'VOSSNAP\x00'
+VERSION = 2
+HEADER = struct.Struct('<8sHBx')  # magic, version, byte order (0 little, 1 big)
+SECTION = struct.Struct('<4sHcxQQ')  # tag, name length, typecode, item count, payload length
+ALIGN = 8
+
+# ProcessManager settings saved as plain values
+PROCESS_SETTINGS = ['pid_counter', 'scheduler_type', 'time_quantum', 'mlfq_quantums', 'mlfq_allotments',
+                    'mlfq_boost_interval', 'mlfq_elapsed', 'starvation_threshold', 'num_cores', 'balance_interval',
+                    'cfs_latency', 'cfs_min_granularity', 'battery_energy', 'context_switch_cost',
+                    'cache_refill_cost', 'cache_window', 'migration_threshold']
+
+def padding(offset):
+    """Bytes needed to align an offset to ALIGN."""
+    return -offset % ALIGN
+
+class SnapshotWriter:
+    """Streams sections to a binary file object."""
+    def __init__(self, f):
+        self.f = f
+        self.offset = 0
+        self.write(HEADER.pack(MAGIC, VERSION, 0 if sys.byteorder == 'little' else 1))
+        self.write(bytes(padding(self.offset)))
+
+    def write(self, data):
+        self.f.write(data)
+        self.offset += memoryview(data).nbytes
+
+    def section(self, tag, name, typecode, count, payload):
+        """Write one section; payload is any bytes-like object."""
+        name = name.encode()
+        self.write(SECTION.pack(tag, len(name), typecode, count, memoryview(payload).nbytes))
+        self.write(name)
+        self.write(bytes(padding(self.offset)))
+        self.write(payload)
+        self.write(bytes(padding(self.offset)))
+
+    def json(self, name, value):
+        """Write a JSON section."""
+        self.section(b'JSON', name, b' ', 0, json.dumps(value, separators=(',', ':')).encode())
+
+    def array(self, name, values):
+        """Write an array.array section."""
+        self.section(b'ARRY', name, values.typecode.encode(), len(values), values)
+
+    def close(self):
+        self.section(b'END ', '', b' ', 0, b'')
+
+class Snapshot:
+    """A snapshot file opened for reading; arrays are read from a memory map of the file."""
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # An empty file cannot be mapped
+            self.file.close()
+            raise ValueError(f"Corrupt snapshot {path}: the file is empty") from None
+        self.buffer = memoryview(self.map)
+        try:
+            self.read_sections(path)
+        except ValueError:
+            self.close()
+            raise
+        except (struct.error, KeyError, IndexError) as e:  # Truncated header or section
+            self.close()
+            raise ValueError(f"Corrupt snapshot {path}: {e}") from e
+
+    def read_sections(self, path):
+        """Check the header and index the JSON and array sections."""
+        magic, version, order = HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a simulator snapshot")
+        if version != VERSION:
+            raise ValueError(f"{path} is snapshot version {version}; this simulator reads version {VERSION}")
+        self.swapped = order != (0 if sys.byteorder == 'little' else 1)
+        self.json = {}
+        self.arrays = {}  # name -> (typecode, start, end)
+        offset = HEADER.size + padding(HEADER.size)
+        while True:
+            tag, name_length, typecode, _, length = SECTION.unpack_from(self.buffer, offset)
+            offset += SECTION.size
+            name = bytes(self.buffer[offset:offset + name_length]).decode()
+            offset += name_length
+            offset += padding(offset)
+            if offset + length > len(self.buffer):
+                raise ValueError(f"Corrupt snapshot {path}: section {name!r} runs past the end of the file")
+            if tag == b'END ':
+                break
+            if tag == b'JSON':
+                self.json[name] = json.loads(bytes(self.buffer[offset:offset + length]))
+            elif tag == b'ARRY':
+                self.arrays[name] = (typecode.decode(), offset, offset + length)
+            offset += length + padding(length)
+
+    def section(self, name):
+        """Return the (typecode, start, end) of an array section."""
+        if name not in self.arrays:
+            raise ValueError(f"Corrupt snapshot: array section {name!r} is missing")
+        return self.arrays[name]
+
+    def view(self, name):
+        """Return an array section as a memoryview into the mapped file (no copy, native byte order only)."""
+        if self.swapped:
+            raise ValueError("Snapshot was written with the other byte order; use array() instead")
+        typecode, start, end = self.section(name)
+        return self.buffer[start:end].cast(typecode)
+
+    def array(self, name):
+        """Return a copy of an array section as an array.array."""
+        typecode, start, end = self.section(name)
+        values = array(typecode)
+        values.frombytes(self.buffer[start:end])
+        if self.swapped:
+            values.byteswap()
+        return values
+
+    def close(self):
+        self.buffer.release()
+        self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def encode_strings(strings):
+    """Pack strings (None allowed) into a byte blob and an array of lengths (-1 for None)."""
+    encoded = [None if s is None else s.encode() for s in strings]
+    lengths = array('q', [-1 if s is None else len(s) for s in encoded])
+    return b''.join(s for s in encoded if s is not None), lengths
+
+def decode_strings(blob, lengths):
+    """Inverse of encode_strings."""
+    strings = []
+    offset = 0
+    for length in lengths:
+        if length < 0:
+            strings.append(None)
+        else:
+            strings.append(blob[offset:offset + length].decode())
+            offset += length
+    return strings
+
+def table_from_pcbs(pcbs):
+    """Build a ProcessTable from PCB objects one column at a time, row i holding pcbs[i]."""
+    table = ProcessTable()
+    for name in FLOAT_COLUMNS:
+        values = map(attrgetter(name), pcbs)
+        if name in NULLABLE:
+            values = [NAN if value is None else value for value in values]
+        table.columns[name] = array('d', values)
+    table.columns['core'] = array('h', [-1 if pcb.core is None else pcb.core for pcb in pcbs])
+    for name in ('pid', 'mlfq_level', 'nice'):
+        table.columns[name] = array(INT_COLUMNS[name], map(attrgetter(name), pcbs))
+    table.states = array('b', [STATE_CODES[pcb.state] for pcb in pcbs])
+    table.profile_codes = array('b', [table.profile_code(pcb.power_profile) for pcb in pcbs])
+    table.names = [pcb.name for pcb in pcbs]
+    table.reindex()
+    table.size = len(pcbs)
+    return table
+
+def save_processes(writer, pm):
+    """Write the process table, queues and scheduler settings of a ProcessManager."""
+    table = pm.processes
+    if not isinstance(table, ProcessTable):
+        table = table_from_pcbs(list(pm.processes.values()))
+    settings = {name: getattr(pm, name) for name in PROCESS_SETTINGS}
+    settings['energy_model'] = vars(pm.energy_model)
+    settings['profiles'] = table.profiles
+    settings['running'] = pm.running.pid if pm.running else None
+    settings['mlfq_levels'] = len(pm.mlfq_queue.levels)
+    settings['min_vruntime'] = pm.cfs_queue.min_vruntime
+    settings['rows'] = len(table.names)
+    writer.json('processes', settings)
+    for name, column in table.columns.items():
+        writer.array(f'proc.{name}', column)
+    writer.array('proc.states', table.states)
+    writer.array('proc.profile_codes', table.profile_codes)
+    writer.array('proc.free_rows', table.free_rows)
+    blob, lengths = encode_strings(table.names)
+    writer.array('proc.name_lengths', lengths)
+    writer.section(b'ARRY', 'proc.names', b'B', len(blob), blob)
+    writer.array('queue.ready', array('q', [p.pid for p in pm.ready_queue]))
+    writer.array('queue.cfs', array('q', [p.pid for p in pm.cfs_queue]))
+    for level, queue in enumerate(pm.mlfq_queue.levels):
+        writer.array(f'queue.mlfq.{level}', array('q', [p.pid for p in queue]))
+
+def load_processes(snap, pm):
+    """Restore a ProcessManager from a snapshot, into its compact table or as PCB objects."""
+    from energy import EnergyModel
+    from process import PCB
+    from runqueue import FairQueue, ReadyQueue, RunQueue
+    settings = snap.json['processes']
+    for name in PROCESS_SETTINGS:
+        setattr(pm, name, settings[name])
+    pm.energy_model = EnergyModel()
+    for name, value in settings['energy_model'].items():
+        setattr(pm.energy_model, name, value)
+    pm.energy_model.p_states = [tuple(state) for state in pm.energy_model.p_states]
+    table = ProcessTable()
+    for name, column in table.columns.items():
+        values = snap.array(f'proc.{name}')
+        table.columns[name] = values if values.typecode == column.typecode else array(column.typecode, values)
+    table.states = snap.array('proc.states')
+    table.profile_codes = snap.array('proc.profile_codes')
+    table.free_rows = snap.array('proc.free_rows')
+    typecode, start, end = snap.section('proc.names')
+    table.names = decode_strings(bytes(snap.buffer[start:end]), snap.array('proc.name_lengths'))
+    for profile in settings['profiles']:
+        table.profile_code(profile)
+    table.size = len(table.names) - len(table.free_rows)
+    table.reindex()  # The PID index is rebuilt from the pid column rather than stored
+    if isinstance(pm.processes, ProcessTable):
+        pm.processes = table
+    else:
+        columns = {name: column.tolist() for name, column in table.columns.items()}
+        for name in NULLABLE:
+            columns[name] = [None if value != value else value for value in columns[name]]  # NaN marks None
+        columns['core'] = [None if core < 0 else core for core in columns['core']]
+        columns['state'] = [STATES[code] for code in table.states]
+        live = [(pid, table.row(pid)) for pid in table]
+        rows = [row for _, row in live]
+        pcbs = [PCB(pid, table.names[row], table.profiles[table.profile_codes[row]]) for pid, row in live]
+        for name in FLOAT_COLUMNS + ['mlfq_level', 'nice', 'core', 'state']:
+            column = columns[name]
+            deque(map(getattr(PCB, name).__set__, pcbs, [column[row] for row in rows]), maxlen=0)  # Slot writes in C
+        pm.processes = {pcb.pid: pcb for pcb in pcbs}
+    processes = pm.processes
+    pm.ready_queue = ReadyQueue()
+    pm.cfs_queue = FairQueue()
+    pm.mlfq_queue = RunQueue(settings['mlfq_levels'])
+    for pid in snap.array('queue.ready'):
+        pm.ready_queue.append(processes[pid])
+    pm.cfs_queue.min_vruntime = settings['min_vruntime']
+    for pid in snap.array('queue.cfs'):
+        pm.cfs_queue.append(processes[pid])
+    for level in range(settings['mlfq_levels']):
+        for pid in snap.array(f'queue.mlfq.{level}'):
+            pm.mlfq_queue.append(processes[pid], level)
+    pm.running = processes.get(settings['running']) if settings['running'] is not None else None
+    pm.simulation = None
+
+def save_memory(writer, mm):
+    """Write frames and their contents, page tables, swapped-out page lists and the pages held on swap."""
+    writer.json('memory', {'num_frames': mm.num_frames, 'page_size': mm.page_size,
+                           'memory_constraints': mm.memory_constraints, 'address_bits': mm.address_bits,
+                           'page_table_levels': mm.page_table_levels, 'memory_access_time': mm.memory_access_time,
+                           'tlb': [mm.tlb.entries, mm.tlb.ways, mm.tlb.policy, mm.tlb.asid, mm.tlb.latency],
+                           'demand_paging': mm.demand_paging, 'replacement': mm.replacement.name,
+                           'address_space': list(mm.address_space.items()), 'page_faults': list(mm.page_faults.items()),
+                           'evictions': mm.evictions, 'compact_per_switch': mm.compact_per_switch,
+                           'cow_faults': list(mm.cow_faults.items()),
+                           'huge_pages': [mm.huge_page_frames, mm.use_huge_pages, mm.promotions, mm.demotions],
+                           'reclaimer': None if mm.reclaimer is None else
+                           [mm.reclaimer.low, mm.reclaimer.high, mm.reclaimer.window, mm.reclaimer.interval,
+                            mm.reclaimer.thrash_rate],
+                           'swap_stats': None if mm.swap is None else
+                           [mm.swap.pages_out, mm.swap.pages_in, mm.swap.time_out, mm.swap.time_in],
+                           'kernel': None if mm.kernel is None else {
+                               'base': mm.kernel.base, 'frames': mm.kernel.num_frames,
+                               'blocks': list(mm.kernel.blocks()),
+                               'caches': [[cache.name, cache.object_size, cache.order, list(cache.slabs())]
+                                          for cache in mm.slabs.caches.values()]}})
+    writer.array('mem.frame_pid', array('q', [-1 if f is None else f[0] for f in mm.frames]))
+    writer.array('mem.frame_page', array('q', [-1 if f is None else f[1] for f in mm.frames]))
+    writer.section(b'ARRY', 'mem.used', b'B', mm.num_frames, mm.allocator.used)
+    shared = [(frame, pid, page) for frame, owners in mm.shared.items() for pid, page in owners]
+    writer.array('mem.shared.frames', array('q', [frame for frame, _, _ in shared]))
+    writer.array('mem.shared.pids', array('q', [pid for _, pid, _ in shared]))
+    writer.array('mem.shared.pages', array('q', [page for _, _, page in shared]))
+    huge = [(pid, number, frame) for pid, pages in mm.huge_pages.items() for number, frame in pages.items()]
+    writer.array('mem.huge.pids', array('q', [pid for pid, _, _ in huge]))
+    writer.array('mem.huge.numbers', array('q', [number for _, number, _ in huge]))
+    writer.array('mem.huge.frames', array('q', [frame for _, _, frame in huge]))
+    tables = mm.page_tables
+    writer.array('mem.pt.pids', array('q', tables))
+    writer.array('mem.pt.levels', array('b', [table.levels for table in tables.values()]))
+    writer.array('mem.pt.counts', array('q', [len(table) for table in tables.values()]))
+    items = [item for table in tables.values() for item in table.items()]
+    writer.array('mem.pt.pages', array('q', [page for page, _ in items]))
+    writer.array('mem.pt.frames', array('q', [frame for _, frame in items]))
+    writer.array('mem.swap.pids', array('q', mm.swapped_out))
+    writer.array('mem.swap.counts', array('q', [len(pages) for pages in mm.swapped_out.values()]))
+    writer.array('mem.swap.pages', array('q', [page for pages in mm.swapped_out.values() for page in pages]))
+    size = mm.page_size
+    writer.section(b'ARRY', 'mem.dirty', b'B', mm.num_frames, mm.dirty)
+    dirty = itertools.compress(range(mm.num_frames), mm.dirty)  # Only frames holding data need saving
+    data = b''.join([mm.memory[frame * size:(frame + 1) * size] for frame in dirty])
+    writer.section(b'ARRY', 'mem.data', b'B', len(data), data)
+    slots = [(pid, page, slot) for pid, pages in mm.swap_slots.items() for page, slot in pages.items()]
+    writer.array('mem.slots.pids', array('q', [pid for pid, _, _ in slots]))
+    writer.array('mem.slots.pages', array('q', [page for _, page, _ in slots]))
+    data = b''.join([mm.swap.peek(slot) for _, _, slot in slots])
+    writer.section(b'ARRY', 'mem.slots.data', b'B', len(data), data)
+
+def map_runs(table, pages, frames):
+    """Map pages to frames, one map_range call per run of consecutive pages."""
+    start = 0
+    for i in range(1, len(pages) + 1):
+        if i == len(pages) or pages[i] != pages[i - 1] + 1:
+            table.map_range(pages[start], frames[start:i])
+            start = i
+
+def load_memory(snap, mm):
+    """Restore a MemoryManager from a snapshot; return the finish_memory call that completes it on the live manager."""
+    from buddy import BuddyAllocator
+    from frames import FrameAllocator
+    from slab import SlabAllocator
+    from tlb import TLB
+    settings = snap.json['memory']
+    for name in ('num_frames', 'page_size', 'memory_constraints', 'address_bits', 'page_table_levels',
+                 'memory_access_time'):
+        setattr(mm, name, settings[name])
+    mm.tlb = TLB(*settings['tlb'])  # Translations are not saved; the restored TLB starts cold
+    mm.current_pid = None
+    mm.frames = [None if pid < 0 else (pid, page)
+                 for pid, page in zip(snap.array('mem.frame_pid'), snap.array('mem.frame_page'))]
+    mm.allocator = FrameAllocator(mm.num_frames, snap.array('mem.used'))
+    mm.shared = {}
+    for frame, pid, page in zip(snap.array('mem.shared.frames'), snap.array('mem.shared.pids'),
+                                snap.array('mem.shared.pages')):
+        mm.shared.setdefault(frame, []).append((pid, page))
+    mm.cow_faults = dict(settings['cow_faults'])
+    mm.huge_page_frames, mm.use_huge_pages, mm.promotions, mm.demotions = settings['huge_pages']
+    mm.demand_paging = settings['demand_paging']
+    mm.address_space = dict(settings['address_space'])
+    mm.page_faults = dict(settings['page_faults'])
+    mm.evictions = settings['evictions']
+    mm.compact_per_switch = settings['compact_per_switch']
+    mm.compactor = None
+    mm.referenced = bytearray(mm.num_frames)  # Like the TLB, reference history starts afresh
+    mm.set_replacement(settings['replacement'])  # Resident pages re-enter the policy in frame order
+    pages, frames = snap.array('mem.pt.pages'), snap.array('mem.pt.frames')
+    mm.page_tables = {}
+    offset = 0
+    for pid, levels, count in zip(snap.array('mem.pt.pids'), snap.array('mem.pt.levels'), snap.array('mem.pt.counts')):
+        table = mm.page_tables[pid] = mm.new_page_table(levels)
+        map_runs(table, pages[offset:offset + count], frames[offset:offset + count])
+        offset += count
+    mm.huge_pages = {}
+    for pid, number, frame in zip(snap.array('mem.huge.pids'), snap.array('mem.huge.numbers'),
+                                  snap.array('mem.huge.frames')):
+        mm.page_tables[pid].map_huge(number * mm.huge_page_frames, frame, mm.huge_page_frames)
+        mm.huge_pages.setdefault(pid, {})[number] = frame
+    pages = snap.array('mem.swap.pages')
+    mm.swapped_out = {}
+    offset = 0
+    for pid, count in zip(snap.array('mem.swap.pids'), snap.array('mem.swap.counts')):
+        mm.swapped_out[pid] = pages[offset:offset + count]
+        offset += count
+    size = mm.page_size
+    mm.memory = mmap.mmap(-1, max(mm.num_frames * size, 1))
+    mm.dirty = bytearray(snap.array('mem.dirty'))
+    mm.zero_page = bytes(size)
+    data = snap.array('mem.data')
+    for i, frame in enumerate(itertools.compress(range(mm.num_frames), mm.dirty)):
+        mm.memory[frame * size:(frame + 1) * size] = data[i * size:(i + 1) * size]
+    data = snap.array('mem.slots.data')
+    slots = list(zip(snap.array('mem.slots.pids'), snap.array('mem.slots.pages')))
+    if len(data) != len(slots) * size:
+        raise ValueError("Corrupt snapshot: swapped page data does not match the swap slots")
+    slots = [(pid, page, data[i * size:(i + 1) * size]) for i, (pid, page) in enumerate(slots)]
+    kernel = settings['kernel']
+    mm.kernel = mm.slabs = None
+    if kernel is not None:
+        mm.kernel = BuddyAllocator(kernel['frames'], kernel['base'])
+        for frame, order, requested in kernel['blocks']:
+            mm.kernel.claim(frame, order, requested)
+        mm.slabs = SlabAllocator(mm.kernel, mm.page_size)
+        for name, object_size, order, slabs in kernel['caches']:
+            cache = mm.slabs.create_cache(name, object_size, order)
+            for frame, indices in slabs:
+                cache.restore(frame, indices)
+    return functools.partial(finish_memory, reclaimer=settings['reclaimer'], slots=slots,
+                             swap_stats=settings['swap_stats'])
+
+def finish_memory(mm, reclaimer, slots, swap_stats):
+    """Rebuild the reclaimer and swap file of a restored MemoryManager once every section has been read."""
+    from reclaim import Reclaimer
+    mm.reclaimer = None if reclaimer is None else Reclaimer(mm, *reclaimer)
+    if mm.swap is not None:
+        mm.swap.close()
+        mm.swap = None
+    mm.swap_slots = {}
+    for pid, page, data in slots:
+        mm.swap_slots.setdefault(pid, {})[page] = mm.swap_space().write(data)
+    if swap_stats is not None:
+        swap = mm.swap_space()
+        swap.pages_out, swap.pages_in, swap.time_out, swap.time_in = swap_stats
+    elif mm.swap is not None:
+        mm.swap.pages_out = mm.swap.time_out = 0
+
+def save_concurrency(writer, cm):
+    """Write the producer-consumer buffer, lock and condition state."""
+    writer.json('concurrency', {'buffer': list(cm.buffer), 'buffer_size': cm.buffer_size,
+                                'locked': cm.lock.locked, 'waiting': list(cm.condition.waiting)})
+
+def load_concurrency(snap, cm):
+    """Restore a ConcurrencyManager from a snapshot."""
+    from concurrency import Condition, Lock
+    state = snap.json['concurrency']
+    cm.buffer = deque(state['buffer'])
+    cm.buffer_size = state['buffer_size']
+    cm.lock = Lock()
+    cm.lock.locked = state['locked']
+    cm.condition = Condition()
+    cm.condition.waiting.extend(state['waiting'])
+
+def directory_state(directory):
+    """Return a directory tree as nested lists: [name, files, subdirectories]."""
+    files = [[f.name, f.content, f.owner, f.encrypted, f.permissions] for f in directory.files.values()]
+    return [directory.name, files, [directory_state(d) for d in directory.subdirs.values()]]
+
+def build_directory(state):
+    """Inverse of directory_state."""
+    from filesystem import Directory, File
+    name, files, subdirs = state
+    directory = Directory(name)
+    for file_name, content, owner, encrypted, permissions in files:
+        directory.files[file_name] = File(file_name, content, owner, encrypted, permissions)
+    for sub in subdirs:
+        child = build_directory(sub)
+        directory.subdirs[child.name] = child
+    return directory
+
+def find_path(directory, target, path=()):
+    """Return the subdirectory names leading from directory to target, or None."""
+    if directory is target:
+        return list(path)
+    for name, sub in directory.subdirs.items():
+        found = find_path(sub, target, path + (name,))
+        if found is not None:
+            return found
+    return None
+
+def save_filesystem(writer, fs):
+    """Write the directory tree, current directory and current user."""
+    writer.json('filesystem', {'root': directory_state(fs.root), 'cwd': find_path(fs.root, fs.current_dir) or [],
+                               'user': fs.current_user})
+
+def load_filesystem(snap, fs):
+    """Restore a FileSystemManager from a snapshot."""
+    state = snap.json['filesystem']
+    fs.root = build_directory(state['root'])
+    fs.current_dir = fs.root
+    for name in state['cwd']:
+        fs.current_dir = fs.current_dir.subdirs[name]
+    fs.current_user = state['user']
+
+def save(path, process_manager=None, memory_manager=None, concurrency_manager=None, fs_manager=None):
+    """Write a snapshot of the given managers to path; returns its size in bytes."""
+    if process_manager is not None and process_manager.core_threads:
+        raise ValueError("Stop the CPU cores before taking a snapshot")
+    with open(path, 'wb') as f:
+        writer = SnapshotWriter(f)
+        if process_manager is not None:
+            save_processes(writer, process_manager)
+        if memory_manager is not None:
+            save_memory(writer, memory_manager)
+        if concurrency_manager is not None:
+            save_concurrency(writer, concurrency_manager)
+        if fs_manager is not None:
+            save_filesystem(writer, fs_manager)
+        writer.close()
+        return writer.offset
+
+def load(path, process_manager=None, memory_manager=None, concurrency_manager=None, fs_manager=None):
+    """Restore the given managers in place from a snapshot; parts missing from the snapshot are left as they are.
+
+    Every section is read into copies of the managers first, so a corrupt snapshot raises ValueError and leaves
+    the managers untouched; the copies' state is swapped in only once the whole file has been read.
+    """
+    if process_manager is not None and process_manager.core_threads:
+        raise ValueError("Stop the CPU cores before loading a snapshot")
+    staged = []  # (manager, restored copy, finishing call or None)
+    collecting = gc.isenabled()
+    gc.disable()  # Restoring allocates many objects and no cycles; collections would only slow it down
+    try:
+        with Snapshot(path) as snap:
+            for manager, name, restore in ((process_manager, 'processes', load_processes),
+                                           (memory_manager, 'memory', load_memory),
+                                           (concurrency_manager, 'concurrency', load_concurrency),
+                                           (fs_manager, 'filesystem', load_filesystem)):
+                if manager is not None and name in snap.json:
+                    restored = copy.copy(manager)
+                    staged.append((manager, restored, restore(snap, restored)))
+    except (KeyError, IndexError, TypeError) as e:  # A section whose contents do not match the format
+        raise ValueError(f"Corrupt snapshot {path}: {e!r}") from e
+    finally:
+        if collecting:
+            gc.enable()
+    for manager, restored, finish in staged:
+        vars(manager).update(vars(restored))
+        if finish is not None:
+            finish(manager)
@@ -0,0 +1,84 @@
+"""
+swap.py
+-------
+Swap space for the Mini OS Simulation memory manager.
+Pages are stored in page-sized slots of a memory-mapped file, handed out by the same free-run allocator as
+physical frames. Every page written or read is counted and timed, so swap bandwidth and per-page latency can be
+compared across page sizes.
+"""
+import mmap
+import tempfile
+import time
+
+from frames import FrameAllocator
+
+class SwapSpace:
+    """A memory-mapped swap file of page-sized slots that doubles in size when it fills up."""
+    def __init__(self, page_size, slots=64, path=None, sync=False):
+        self.page_size = page_size
+        self.path = path  # None = an anonymous temporary file
+        self.sync = sync  # Flush each written page to the file, so timings include the write-back
+        self.file = open(path, 'w+b') if path else tempfile.TemporaryFile()
+        self.map = None
+        self.slots = 0
+        self.allocator = FrameAllocator(0)
+        self.grow(max(slots, 1))
+        self.pages_out = 0
+        self.pages_in = 0
+        self.time_out = 0.0
+        self.time_in = 0.0
+
+    def grow(self, slots):
+        """Enlarge the file to the given number of slots, keeping the slots in use."""
+        if self.map is not None:
+            self.map.close()
+        self.file.truncate(slots * self.page_size)
+        self.map = mmap.mmap(self.file.fileno(), slots * self.page_size)
+        self.allocator = FrameAllocator(slots, self.allocator.used + bytes(slots - self.slots))
+        self.slots = slots
+
+    def write(self, page):
+        """Store one page of data in a free slot and return the slot."""
+        start = time.perf_counter()
+        slot = self.allocator.alloc()
+        if slot is None:
+            self.grow(self.slots * 2)
+            slot = self.allocator.alloc()
+        offset = slot * self.page_size
+        self.map[offset:offset + self.page_size] = page
+        if self.sync:
+            aligned = offset - offset % mmap.ALLOCATIONGRANULARITY
+            self.map.flush(aligned, offset + self.page_size - aligned)
+        self.time_out += time.perf_counter() - start
+        self.pages_out += 1
+        return slot
+
+    def read(self, slot):
+        """Return the page stored in a slot and free the slot."""
+        start = time.perf_counter()
+        offset = slot * self.page_size
+        page = self.map[offset:offset + self.page_size]
+        self.allocator.free(slot)
+        self.time_in += time.perf_counter() - start
+        self.pages_in += 1
+        return page
+
+    def peek(self, slot):
+        """Return a copy of a slot's page without freeing it or counting a read."""
+        offset = slot * self.page_size
+        return self.map[offset:offset + self.page_size]
+
+    def stats(self):
+        """Return pages and bytes moved each way, the time spent, bandwidth (bytes/s) and latency per page (s)."""
+        stats = {'slots_used': self.slots - self.allocator.free_count, 'slots': self.slots}
+        for direction, pages, seconds in (('out', self.pages_out, self.time_out), ('in', self.pages_in, self.time_in)):
+            stats[f'pages_{direction}'] = pages
+            stats[f'bytes_{direction}'] = pages * self.page_size
+            stats[f'time_{direction}'] = seconds
+            stats[f'bandwidth_{direction}'] = pages * self.page_size / seconds if seconds else 0.0
+            stats[f'latency_{direction}'] = seconds / pages if pages else 0.0
+        return stats
+
+    def close(self):
+        self.map.close()
+        self.file.close()
@@ -0,0 +1,138 @@
+"""
+sweep.py
+--------
+Parallel scheduler parameter sweeps for Mini OS Simulation.
+Runs every configuration of a parameter grid over a workload on a process pool and collects the metrics into one table.
+
+Run from the project root: python3 sweep.py --scheduler RR MLFQ --time-quantum 1 2 4 --cores 1 4 --seeds 0 1
+"""
+import argparse
+import csv
+import functools
+import itertools
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from process import PCB, ProcessManager
+from workload import read_trace, synthetic
+
+# Parameters only some schedulers read in the simulation; other schedulers' configurations leave them out
+SCHEDULER_PARAMETERS = {
+    'time_quantum': {'RR'},
+    'mlfq_quantums': {'MLFQ'},
+    'mlfq_allotments': {'MLFQ'},
+    'mlfq_boost_interval': {'MLFQ'},
+    'cfs_latency': {'CFS'},
+    'cfs_min_granularity': {'CFS'},
+}
+
+def expand_grid(grid):
+    """Turn {parameter: [values]} into the list of every configuration, in grid order.
+
+    A scheduler's configurations vary only the parameters it reads (see SCHEDULER_PARAMETERS), so no
+    simulation is repeated under a different label.
+    """
+    keys = list(grid)
+    configs = {}
+    for values in itertools.product(*(grid[key] for key in keys)):
+        config = dict(zip(keys, values))
+        scheduler = config.get('scheduler_type')
+        if scheduler is not None:
+            config = {key: value for key, value in config.items()
+                      if scheduler in SCHEDULER_PARAMETERS.get(key, (scheduler,))}
+        configs.setdefault(repr(config), config)  # Values may be lists, so configurations are keyed by repr
+    return list(configs.values())
+
+def build_workload(workload, seed):
+    """Return the PCBs of a workload: a trace file path, a callable taking a seed,
+    or (arrival, burst, profile[, io_interval, io_duration]) tuples."""
+    if isinstance(workload, str):
+        return read_trace(workload)
+    if callable(workload):
+        return workload(seed)
+    return (PCB(pid, f"job{pid}", spec[2], spec[0], spec[1], *spec[3:]) for pid, spec in enumerate(workload, 1))
+
+def run_config(config, workload, seed):
+    """Run one configuration on its own ProcessManager and return its metrics row."""
+    pm = ProcessManager()
+    for key, value in config.items():
+        if not hasattr(pm, key):
+            raise ValueError(f"Unknown ProcessManager parameter: {key}")
+        setattr(pm, key, value)
+    sim = pm.simulate(build_workload(workload, seed), seed=seed)
+    row = dict(config)
+    row['seed'] = seed
+    row.update(sim.summary())
+    return row
+
+def sweep(grid, workload, seeds=(0,), workers=None):
+    """Run every grid configuration for every seed on a process pool; rows come back in grid order.
+
+    The workload must be picklable (a module-level function, functools.partial or a list of tuples).
+    Each run builds its own ProcessManager and seeds its own RNGs, so results do not depend on the pool.
+    """
+    runs = [(config, seed) for config in expand_grid(grid) for seed in seeds]
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=min(workers, len(runs))) as pool:
+        futures = [pool.submit(run_config, config, workload, seed) for config, seed in runs]
+        return [future.result() for future in futures]
+
+def columns(rows):
+    """Return the union of the row keys, each at the earliest position it has in a row (first seen on ties).
+
+    Rows of different schedulers carry different parameters, and this keeps every parameter ahead of the metrics.
+    """
+    keys = {}
+    for row in rows:
+        for position, key in enumerate(row):
+            keys[key] = min(keys.get(key, position), position)
+    return sorted(keys, key=keys.get)
+
+def format_table(rows):
+    """Format sweep rows as an aligned text table."""
+    keys = columns(rows)
+    cells = [[f"{row.get(key, ''):.4g}" if isinstance(row.get(key), float) else str(row.get(key, '')) for key in keys]
+             for row in rows]
+    widths = [max([len(key)] + [len(line[i]) for line in cells]) for i, key in enumerate(keys)]
+    lines = ["  ".join(key.ljust(width) for key, width in zip(keys, widths))]
+    lines += ["  ".join(cell.ljust(width) for cell, width in zip(line, widths)) for line in cells]
+    return "\n".join(lines)
+
+def write_csv(rows, file):
+    """Write sweep rows as CSV to an open file."""
+    writer = csv.DictWriter(file, fieldnames=columns(rows))
+    writer.writeheader()
+    writer.writerows(rows)
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel scheduler parameter sweep.")
+    parser.add_argument('--scheduler', nargs='+', default=['FIFO', 'RR', 'MLFQ', 'POWER', 'CFS'])
+    parser.add_argument('--time-quantum', nargs='+', type=int, default=[2])
+    parser.add_argument('--mlfq-quantums', nargs='+', default=['1,2,4'], help="comma-separated quantums per level")
+    parser.add_argument('--mlfq-boost-interval', nargs='+', type=float, default=[50],
+                        help="MLFQ priority boost interval (0 = never)")
+    parser.add_argument('--cores', nargs='+', type=int, default=[4])
+    parser.add_argument('--seeds', nargs='+', type=int, default=[0])
+    parser.add_argument('--jobs', type=int, default=10000, help="processes in the synthetic workload")
+    parser.add_argument('--rate', type=float, default=1.0, help="synthetic arrivals per time unit")
+    parser.add_argument('--trace', help="replay this CSV/JSONL trace instead of a synthetic workload")
+    parser.add_argument('--workers', type=int, default=None, help="pool size (default: all host cores)")
+    parser.add_argument('--csv', action='store_true', help="print CSV instead of a table")
+    args = parser.parse_args()
+    grid = {
+        'scheduler_type': args.scheduler,
+        'time_quantum': args.time_quantum,
+        'mlfq_quantums': [[int(q) for q in spec.split(',')] for spec in args.mlfq_quantums],
+        'mlfq_boost_interval': args.mlfq_boost_interval,
+        'num_cores': args.cores,
+    }
+    workload = args.trace or functools.partial(synthetic, jobs=args.jobs, rate=args.rate)
+    rows = sweep(grid, workload, seeds=args.seeds, workers=args.workers)
+    if args.csv:
+        write_csv(rows, sys.stdout)
+    else:
+        print(format_table(rows))
+
+if __name__ == "__main__":
+    main()
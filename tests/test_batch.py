@@ -0,0 +1,39 @@
+"""Tests for the vectorized FIFO and Round Robin batch evaluation."""
+import random
+
+import numpy as np
+import pytest
+
+from batch import count_greater_before, fifo_batch, rr_batch, simulate_batch
+
+@pytest.mark.parametrize('seed', range(5))
+def test_fifo_batch_matches_the_simulation(seed):
+    rng = random.Random(seed)
+    arrivals = sorted(rng.randrange(60) for _ in range(25))
+    bursts = [rng.randrange(1, 10) for _ in arrivals]
+    completion, waiting = fifo_batch(arrivals, bursts)
+    assert (completion.tolist(), waiting.tolist()) == simulate_batch(arrivals, bursts, 'FIFO')
+
+@pytest.mark.parametrize('seed, longest', [(0, 6), (1, 6), (2, 200), (3, 200)])
+def test_rr_batch_matches_the_simulation(seed, longest):
+    rng = random.Random(seed)
+    bursts = [rng.randrange(1, longest) for _ in range(30)]
+    arrivals = [3] * len(bursts)
+    for quantum in (1, 2, 5):
+        completion, waiting = rr_batch(arrivals, bursts, quantum)
+        assert (completion.tolist(), waiting.tolist()) == simulate_batch(arrivals, bursts, 'RR', quantum)
+
+@pytest.mark.parametrize('n, distinct', [(50, 3), (50, 50), (257, 200)])
+def test_count_greater_before_both_paths(n, distinct):
+    ranks = np.random.default_rng(n + distinct).integers(0, distinct, n)
+    _, ranks = np.unique(ranks, return_inverse=True)  # Dense ranks, as rr_batch passes them
+    expected = [sum(r > ranks[i] for r in ranks[:i]) for i in range(n)]
+    assert count_greater_before(ranks).tolist() == expected
+
+def test_unsorted_fifo_arrivals_are_rejected():
+    with pytest.raises(ValueError, match="sorted"):
+        fifo_batch([0, 5, 2], [1, 1, 1])
+
+def test_staggered_rr_arrivals_are_rejected():
+    with pytest.raises(ValueError, match="common arrival time"):
+        rr_batch([0, 0, 1], [3, 3, 3], 2)
@@ -0,0 +1,25 @@
+"""Regression tests for the memory manager."""
+from memory import MemoryManager
+
+def huge_memory():
+    mm = MemoryManager(num_frames=16, page_size=64)
+    mm.huge_page_frames = 4
+    mm.use_huge_pages = True
+    mm.create_page_table(1, 8)
+    return mm
+
+def test_negative_address_is_invalid_with_huge_pages(capsys):
+    mm = huge_memory()
+    assert mm.huge_pages[1]
+    mm.translate(1, 0)  # Caches huge page 0 in the TLB
+    assert mm.translate(1, -10) is None
+    assert "Invalid page access!" in capsys.readouterr().out
+
+def test_huge_page_tlb_entry_covers_the_huge_page():
+    mm = huge_memory()
+    first = mm.huge_pages[1][0]
+    assert mm.resolve(1, 0) == (first * 64, False, False)
+    assert mm.resolve(1, 3 * 64 + 5) == ((first + 3) * 64 + 5, True, False)
+    assert mm.tlb.reach(64, 4 * 64) == 4 * 64
+    mm.demote(1, 0)
+    assert mm.tlb.reach(64, 4 * 64) == 0
@@ -0,0 +1,38 @@
+"""Tests for the compact process table."""
+import snapshot
+from process import PCB, ProcessManager
+from proctable import ProcessTable
+
+def test_far_and_negative_pids_do_not_grow_the_index():
+    table = ProcessTable()
+    for pid in (1, 2, 10**9, -5):
+        table[pid] = PCB(pid, f"p{pid}", 'low')
+    assert len(table.row_of) < 2048
+    assert sorted(table) == [-5, 1, 2, 10**9]
+    assert table[10**9].name == "p1000000000"
+    del table[10**9]
+    del table[-5]
+    assert sorted(table) == [1, 2]
+    table[7] = PCB(7, "p7", 'high')
+    assert table[7].power_profile == 'high'
+
+def test_out_of_range_nice_and_deep_mlfq_levels_fit():
+    table = ProcessTable()
+    pcb = PCB(1, "job", 'medium', nice=500)
+    pcb.mlfq_level = 300
+    table[1] = pcb
+    assert table[1].nice == 19
+    assert table[1].mlfq_level == 300
+    assert PCB(2, "job", 'medium', nice=-99).nice == -20
+
+def test_snapshot_keeps_far_pids(tmp_path):
+    pm = ProcessManager(compact=True)
+    for pid in (1, 10**9):
+        pm.processes[pid] = PCB(pid, f"p{pid}", 'low')
+    path = str(tmp_path / "minios.snap")
+    snapshot.save(path, pm)
+    for compact in (True, False):
+        restored = ProcessManager(compact=compact)
+        snapshot.load(path, restored)
+        assert sorted(restored.processes) == [1, 10**9]
+        assert restored.processes[10**9].name == "p1000000000"
@@ -0,0 +1,48 @@
+"""Tests for the page replacement policies."""
+import random
+
+from replacement import LFUPolicy, compare
+
+def test_lfu_victim_after_removing_the_least_used_pages():
+    lfu = LFUPolicy()
+    for page in range(3):
+        lfu.add(page)
+    for _ in range(1_000_000):
+        lfu.touch(2)
+    lfu.touch(1)
+    lfu.remove(0)
+    lfu.remove(1)
+    lfu.add(3)
+    lfu.touch(3)
+    lfu.remove(3)
+    assert lfu.victim() == 2
+    assert len(lfu) == 0
+
+def test_lfu_matches_a_scan_of_the_counts():
+    rng = random.Random(2)
+    lfu = LFUPolicy()
+    counts = {}  # page -> (count, last access), like the policy's buckets
+    clock = 0
+    for _ in range(20000):
+        page = rng.randrange(50)
+        clock += 1
+        op = rng.random()
+        if op < 0.6:
+            if page in counts:
+                lfu.touch(page)
+                counts[page] = (counts[page][0] + 1, clock)
+            else:
+                lfu.add(page)
+                counts[page] = (1, clock)
+        elif op < 0.8:
+            lfu.remove(page)
+            counts.pop(page, None)
+        elif counts:
+            expected = min(counts, key=counts.get)
+            assert lfu.victim() == expected
+            del counts[expected]
+
+def test_compare_counts_the_optimum_lowest():
+    references = [1, 2, 3, 4, 1, 2, 5, 1, 2, 3, 4, 5]
+    faults = compare(references, 3)
+    assert faults['OPT'] == min(faults.values())
@@ -0,0 +1,43 @@
+"""Tests for the scheduler run queues."""
+import random
+
+from process import PCB
+from runqueue import FairQueue, RunQueue
+
+def test_run_queue_matches_a_list_per_level():
+    rng = random.Random(1)
+    queue = RunQueue(4)
+    model = [[] for _ in range(4)]
+    pcbs = [PCB(pid, f"p{pid}", rng.choice(['low', 'medium', 'high'])) for pid in range(20)]
+    for _ in range(5000):
+        pcb = rng.choice(pcbs)
+        op = rng.random()
+        if op < 0.5:
+            level = rng.randrange(4)
+            for row in model:
+                if pcb in row:
+                    row.remove(pcb)
+            model[level].append(pcb)
+            queue.append(pcb, level)
+        elif op < 0.7:
+            expected = next((row.pop(0) for row in model if row), None)
+            assert queue.popleft() is expected
+        elif op < 0.9:
+            expected = next((row.pop(row.index(pcb)) for row in model if pcb in row), None)
+            assert queue.remove(pcb.pid) is expected
+        else:
+            queue.boost()
+            model = [sum(model, [])] + [[] for _ in range(3)]
+        assert len(queue) == sum(map(len, model))
+        assert list(queue) == sum(model, [])
+        assert queue.level_of == {p.pid: i for i, row in enumerate(model) for p in row}
+
+def test_fair_queue_orders_by_vruntime_then_arrival():
+    queue = FairQueue()
+    pcbs = [PCB(pid, f"p{pid}", 'medium') for pid in (3, 1, 2, 4)]
+    pcbs[3].vruntime = -1
+    for pcb in pcbs:
+        queue.append(pcb)
+    queue.append(pcbs[0])  # Re-queued with an equal vruntime: now behind the other two
+    assert [queue.popleft().pid for _ in range(4)] == [4, 1, 2, 3]
+    assert queue.popleft() is None
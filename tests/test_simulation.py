@@ -0,0 +1,46 @@
+"""Tests for the discrete-event scheduling engine."""
+from process import PCB, ProcessManager
+from runqueue import nice_weight
+
+def manager(scheduler, cores=1):
+    pm = ProcessManager()
+    pm.scheduler_type = scheduler
+    pm.num_cores = cores
+    return pm
+
+def test_priority_boost_does_not_run_past_the_last_completion():
+    sim = manager('MLFQ').simulate([PCB(1, "job", 'medium', 0, 51)])
+    summary = sim.summary()
+    assert sim.clock == max(sim.finished_completion) == 51
+    assert summary['utilization'] == 1
+    assert summary['boosts'] == 1
+
+def test_priority_boost_with_io_ends_at_the_last_completion():
+    pm = manager('MLFQ')
+    sim = pm.simulate([PCB(1, "cpu", 'high', 0, 120), PCB(2, "io", 'low', 5, 40, 4, 25)])
+    assert sim.completed == 2
+    assert sim.clock == max(sim.finished_completion)
+
+def test_load_balancer_does_not_run_past_the_last_completion():
+    pm = manager('RR', cores=4)
+    pm.context_switch_cost = 0.1
+    sim = pm.simulate([PCB(pid, f"job{pid}", 'medium', 0, 10) for pid in range(1, 5)])
+    assert sim.clock == max(sim.finished_completion)
+    assert abs(sim.summary()['utilization'] - 1) < 1e-9
+
+def test_spaced_arrivals_on_idle_cores_are_not_stolen():
+    pm = manager('FIFO', cores=4)
+    sim = pm.simulate([PCB(pid, f"job{pid}", 'medium', 100 * pid, 5) for pid in range(8)])
+    summary = sim.summary()
+    assert summary['steals'] == 0
+    assert summary['migrations'] == 0
+    assert [core['dispatches'] for core in sim.core_stats()] == [2, 2, 2, 2]
+
+def test_cfs_shares_follow_nice_weights():
+    pcbs = [PCB(pid, f"job{pid}", 'medium', 0, None, nice=nice) for pid, nice in ((1, 0), (2, 5), (3, -5))]
+    manager('CFS').simulate(pcbs, until=1000)
+    total_cpu = sum(pcb.cpu_time for pcb in pcbs)
+    total_weight = sum(nice_weight(pcb.nice) for pcb in pcbs)
+    for pcb in pcbs:
+        assert abs(pcb.cpu_time / total_cpu - nice_weight(pcb.nice) / total_weight) < 0.005
+    assert max(pcb.vruntime for pcb in pcbs) - min(pcb.vruntime for pcb in pcbs) < 6  # Within one cfs_latency
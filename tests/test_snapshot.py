@@ -0,0 +1,65 @@
+"""Tests for snapshot files."""
+import pytest
+
+import snapshot
+from memory import MemoryManager
+from process import PCB, ProcessManager
+
+def saved(tmp_path):
+    mm = MemoryManager(num_frames=16, page_size=64)
+    mm.create_page_table(1, 4)
+    path = tmp_path / "minios.snap"
+    snapshot.save(str(path), memory_manager=mm)
+    return path
+
+@pytest.mark.parametrize('keep', [0, 4, 20, 60, -9])
+def test_truncated_snapshot_is_a_value_error(tmp_path, keep):
+    path = saved(tmp_path)
+    data = path.read_bytes()
+    path.write_bytes(data[:keep])
+    with pytest.raises(ValueError, match="Corrupt snapshot"):
+        snapshot.load(str(path), memory_manager=MemoryManager(num_frames=16, page_size=64))
+
+def test_snapshot_round_trip(tmp_path):
+    path = saved(tmp_path)
+    mm = MemoryManager(num_frames=16, page_size=64)
+    snapshot.load(str(path), memory_manager=mm)
+    assert mm.resolve(1, 3 * 64) is not None
+
+def test_swapped_pages_survive_a_round_trip(tmp_path):
+    mm = MemoryManager(num_frames=16, page_size=64)
+    mm.create_page_table(1, 4)
+    mm.write_memory(1, 70, b"swapped")
+    mm.swap_out(1)
+    path = str(tmp_path / "minios.snap")
+    snapshot.save(path, memory_manager=mm)
+    restored = MemoryManager(num_frames=16, page_size=64)
+    snapshot.load(path, memory_manager=restored)
+    restored.swap_in(1)
+    assert restored.read_memory(1, 70, 7) == b"swapped"
+
+def test_bad_section_leaves_every_manager_untouched(tmp_path):
+    pm = ProcessManager()
+    pm.scheduler_type = 'CFS'
+    pm.processes[1] = PCB(1, "job", 'low')
+    pm.ready_queue.append(pm.processes[1])
+    path = tmp_path / "minios.snap"
+    with open(path, 'wb') as f:
+        writer = snapshot.SnapshotWriter(f)
+        snapshot.save_processes(writer, pm)
+        writer.json('memory', {'num_frames': 4})  # Valid file, but the memory section is incomplete
+        writer.close()
+    target, mm = ProcessManager(), MemoryManager(num_frames=16, page_size=64)
+    mm.create_page_table(1, 4)
+    with pytest.raises(ValueError, match="Corrupt snapshot"):
+        snapshot.load(str(path), target, mm)
+    assert target.scheduler_type == 'FIFO' and not target.processes and not target.ready_queue
+    assert mm.num_frames == 16 and 1 in mm.page_tables
+
+def test_unknown_version_is_rejected(tmp_path):
+    path = saved(tmp_path)
+    data = bytearray(path.read_bytes())
+    snapshot.HEADER.pack_into(data, 0, snapshot.MAGIC, 1, data[10])
+    path.write_bytes(data)
+    with pytest.raises(ValueError, match="version 1"):
+        snapshot.load(str(path), memory_manager=MemoryManager(num_frames=16, page_size=64))
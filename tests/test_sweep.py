@@ -0,0 +1,18 @@
+"""Tests for parallel parameter sweeps."""
+import functools
+
+from sweep import expand_grid, sweep
+from workload import synthetic
+
+def test_grid_varies_scheduler_parameters_only_for_their_scheduler():
+    configs = expand_grid({'scheduler_type': ['FIFO', 'RR', 'MLFQ'], 'time_quantum': [1, 2],
+                           'mlfq_quantums': [[1, 2], [2, 4]], 'mlfq_boost_interval': [0, 50], 'num_cores': [1, 4]})
+    assert len(configs) == 2 + 2 * 2 + 4 * 2
+    assert {'scheduler_type': 'FIFO', 'num_cores': 4} in configs
+    assert all('time_quantum' not in config for config in configs if config['scheduler_type'] != 'RR')
+    assert len({repr(config) for config in configs}) == len(configs)
+
+def test_seeded_sweep_does_not_depend_on_the_worker_count():
+    grid = {'scheduler_type': ['RR', 'MLFQ', 'CFS'], 'num_cores': [1, 2]}
+    workload = functools.partial(synthetic, jobs=200, rate=1.0)
+    assert sweep(grid, workload, seeds=(0, 1), workers=1) == sweep(grid, workload, seeds=(0, 1), workers=3)
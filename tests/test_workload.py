@@ -0,0 +1,21 @@
+"""Tests for workload trace files."""
+import pytest
+
+from process import PCB
+from workload import read_trace, write_trace
+
+@pytest.mark.parametrize('suffix', ['.csv', '.jsonl', '.jsonl.gz'])
+def test_trace_round_trip_keeps_missing_bursts(tmp_path, suffix):
+    pcbs = [PCB(1, "shell", 'low'), PCB(2, "job", 'high', 1.5, 3, 2.0, 1, -5)]
+    path = str(tmp_path / f"trace{suffix}")
+    assert write_trace(path, pcbs) == 2
+    read = list(read_trace(path))
+    fields = ('pid', 'name', 'power_profile', 'arrival_time', 'burst_time', 'io_interval', 'io_duration', 'nice')
+    assert [[getattr(p, f) for f in fields] for p in read] == [[getattr(p, f) for f in fields] for p in pcbs]
+    assert read[0].burst_time is None
+
+def test_bad_record_is_a_value_error(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    path.write_text('{"arrival_time": null, "burst_time": 1}\n')
+    with pytest.raises(ValueError, match="bad record 1"):
+        list(read_trace(str(path)))
@@ -0,0 +1,104 @@
+"""
+tlb.py
+------
+Translation lookaside buffer for the Mini OS Simulation memory manager.
+A set-associative cache of page -> frame translations with LRU or random replacement. Entries are either tagged
+with the process's address-space ID, or the whole TLB is flushed on every context switch. A huge page is cached
+as one entry, huge page number -> first frame, keyed apart from base pages.
+"""
+import random
+from collections import OrderedDict
+
+class TLB:
+    """Set-associative TLB with per-process hit, miss and flush counts."""
+    def __init__(self, entries=64, ways=4, policy='lru', asid=True, latency=1, seed=0):
+        if policy not in ('lru', 'random'):
+            raise ValueError("TLB policy must be 'lru' or 'random'")
+        if ways < 1 or entries < ways or entries % ways:
+            raise ValueError("TLB entries must be a positive multiple of its associativity")
+        self.entries = entries
+        self.ways = ways  # Associativity; ways == entries is fully associative
+        self.policy = policy
+        self.asid = asid  # True: entries are tagged with the PID; False: flush on every switch
+        self.latency = latency  # Time of one TLB lookup, in the same unit as memory_access_time
+        self.rng = random.Random(seed)
+        self.sets = [OrderedDict() for _ in range(entries // ways)]  # (pid, page) -> frame, least recent first
+        self.current = None  # PID whose address space is loaded
+        self.counts = {}  # pid -> [hits, misses, flushes]
+
+    def counters(self, pid):
+        counts = self.counts.get(pid)
+        if counts is None:
+            counts = self.counts[pid] = [0, 0, 0]
+        return counts
+
+    def lookup(self, pid, page, huge=False):
+        """Return the cached frame of a page (or the first frame of huge page number page), or None on a miss."""
+        entries = self.sets[page % len(self.sets)]
+        key = (pid, page, True) if huge else (pid, page)
+        frame = entries.get(key)
+        if frame is None:
+            self.counters(pid)[1] += 1
+            return None
+        if self.policy == 'lru':
+            entries.move_to_end(key)
+        self.counters(pid)[0] += 1
+        return frame
+
+    def insert(self, pid, page, frame, huge=False):
+        """Cache a translation, evicting one from its set if the set is full."""
+        entries = self.sets[page % len(self.sets)]
+        key = (pid, page, True) if huge else (pid, page)
+        if key not in entries and len(entries) >= self.ways:
+            if self.policy == 'lru':
+                entries.popitem(last=False)
+            else:
+                del entries[list(entries)[self.rng.randrange(len(entries))]]
+        entries[key] = frame
+
+    def invalidate(self, pid, page, huge=False):
+        """Drop one translation (after the page is unmapped or moved)."""
+        self.sets[page % len(self.sets)].pop((pid, page, True) if huge else (pid, page), None)
+
+    def flush(self, pid=None):
+        """Drop every translation, or only those of one process; counts a flush against it."""
+        if pid is None:
+            for entries in self.sets:
+                entries.clear()
+            if self.current is not None:
+                self.counters(self.current)[2] += 1
+            return
+        for entries in self.sets:
+            for key in [key for key in entries if key[0] == pid]:
+                del entries[key]
+        self.counters(pid)[2] += 1
+
+    def switch(self, pid):
+        """Load another address space: untagged TLBs lose every entry, tagged ones just change ASID."""
+        if pid == self.current:
+            return
+        if not self.asid:
+            self.flush()
+        self.current = pid
+
+    def reach(self, page_size, huge_page_size):
+        """Return the bytes of memory the cached translations cover.
+
+        Huge-page entries, keyed apart from base pages, cover a whole huge page each.
+        """
+        return sum(huge_page_size if len(key) == 3 else page_size for entries in self.sets for key in entries)
+
+    def hit_rate(self, pid=None):
+        """Return the fraction of lookups that hit, overall or for one process."""
+        rows = [self.counts.get(pid, [0, 0, 0])] if pid is not None else self.counts.values()
+        hits = sum(row[0] for row in rows)
+        lookups = hits + sum(row[1] for row in rows)
+        return hits / lookups if lookups else 0.0
+
+    def effective_access_time(self, memory_access_time, walk_levels, pid=None):
+        """Return the average time of one memory access including translation.
+
+        A hit costs the TLB lookup plus the access; a miss also reads one page-table entry per level.
+        """
+        hit = self.hit_rate(pid)
+        return self.latency + memory_access_time + (1 - hit) * walk_levels * memory_access_time
@@ -0,0 +1,129 @@
+"""
+workload.py
+-----------
+Workload sources for the Mini OS Simulation scheduler.
+Streams PCBs from CSV/JSONL trace files (optionally gzipped) or from a synthetic generator, one process at a time.
+
+Trace columns: arrival_time, burst_time (empty or null: runs until terminated), and optionally pid, name,
+power_profile, io_interval, io_duration, nice.
+
+Generate a synthetic trace from the project root: python3 workload.py trace.csv.gz --jobs 1000000 --rate 0.8
+"""
+import argparse
+import csv
+import gzip
+import json
+import random
+
+from process import PCB
+
+FIELDS = ['pid', 'name', 'arrival_time', 'burst_time', 'power_profile', 'io_interval', 'io_duration', 'nice']
+
+def open_trace(path, mode='r'):
+    """Open a trace file as text, transparently handling .gz compression."""
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', newline='')
+    return open(path, mode, newline='')
+
+def trace_format(path):
+    """Return 'csv' or 'jsonl' from a trace file name."""
+    name = path[:-3] if path.endswith('.gz') else path
+    if name.endswith('.csv'):
+        return 'csv'
+    if name.endswith(('.jsonl', '.json', '.ndjson')):
+        return 'jsonl'
+    raise ValueError(f"Unknown trace format: {path} (expected .csv or .jsonl)")
+
+def number(value):
+    """Parse a trace number, keeping integers exact."""
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+def make_pcb(record, pid):
+    """Build a PCB from one trace record (a dict of column -> value)."""
+    burst_time = record['burst_time']
+    io_interval = record.get('io_interval')
+    return PCB(
+        number(record['pid']) if record.get('pid') not in (None, '') else pid,
+        record.get('name') or f"job{pid}",
+        record.get('power_profile') or 'medium',
+        number(record['arrival_time']),
+        number(burst_time) if burst_time not in (None, '') else None,  # None runs until terminated
+        number(io_interval) if io_interval not in (None, '') else None,
+        number(record.get('io_duration') or 0),
+        int(record.get('nice') or 0),
+    )
+
+def read_trace(path):
+    """Yield the PCBs of a trace file in order; the file is streamed, so memory use stays constant."""
+    fmt = trace_format(path)
+    last_arrival = None
+    with open_trace(path) as f:
+        records = csv.DictReader(f) if fmt == 'csv' else (json.loads(line) for line in f if line.strip())
+        for pid, record in enumerate(records, 1):
+            try:
+                pcb = make_pcb(record, pid)
+            except (KeyError, TypeError, ValueError) as e:
+                raise ValueError(f"{path}: bad record {pid}: {e}") from e
+            if last_arrival is not None and pcb.arrival_time < last_arrival:
+                raise ValueError(f"{path}: record {pid} arrives before the previous one; traces must be sorted by arrival_time")
+            last_arrival = pcb.arrival_time
+            yield pcb
+
+def write_trace(path, pcbs):
+    """Write PCBs to a CSV or JSONL trace file; returns the number of records written."""
+    fmt = trace_format(path)
+    count = 0
+    with open_trace(path, 'w') as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS) if fmt == 'csv' else None
+        if writer:
+            writer.writeheader()
+        for pcb in pcbs:
+            record = {field: getattr(pcb, field) for field in FIELDS}
+            if writer:
+                writer.writerow(record)
+            else:
+                f.write(json.dumps(record) + "\n")
+            count += 1
+    return count
+
+def synthetic(seed=None, jobs=None, rate=1.0, burst_min=1.0, burst_alpha=1.5, io_fraction=0.2,
+              io_interval=2.0, io_duration=5.0, profiles=(('low', 0.4), ('medium', 0.4), ('high', 0.2))):
+    """Yield a synthetic workload: Poisson arrivals and Pareto (heavy-tailed) bursts.
+
+    rate is arrivals per time unit; bursts are burst_min * Pareto(burst_alpha), so their mean is
+    burst_min * alpha / (alpha - 1). A fraction io_fraction of processes block for io_duration after every
+    io_interval of CPU time. jobs=None generates forever, so bound the run with simulate(until=...).
+    """
+    rng = random.Random(seed)
+    names = [name for name, _ in profiles]
+    weights = [weight for _, weight in profiles]
+    arrival = 0.0
+    pid = 0
+    while jobs is None or pid < jobs:
+        pid += 1
+        arrival += rng.expovariate(rate)
+        burst = burst_min * rng.paretovariate(burst_alpha)
+        io = rng.random() < io_fraction
+        yield PCB(pid, f"job{pid}", rng.choices(names, weights)[0], arrival, burst,
+                  io_interval if io else None, io_duration if io else 0)
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic workload trace.")
+    parser.add_argument('path', help="output file (.csv or .jsonl, optionally .gz)")
+    parser.add_argument('--jobs', type=int, default=100000)
+    parser.add_argument('--rate', type=float, default=1.0, help="arrivals per time unit")
+    parser.add_argument('--burst-min', type=float, default=1.0)
+    parser.add_argument('--burst-alpha', type=float, default=1.5, help="Pareto shape of the burst lengths")
+    parser.add_argument('--io-fraction', type=float, default=0.2)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    count = write_trace(args.path, synthetic(args.seed, args.jobs, args.rate, args.burst_min, args.burst_alpha, args.io_fraction))
+    print(f"Wrote {count} processes to {args.path}.")
+
+if __name__ == "__main__":
+    main()